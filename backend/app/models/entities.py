@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import cached_property
 from typing import Any
 
 from sqlalchemy import (
@@ -18,6 +19,8 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import relationship
 
+from core.dice import replay
+
 from .base import Base
 
 RoleEnum = Enum("GM", "Player", name="role_enum")
@@ -86,7 +89,12 @@ class Encounter(Base):  # type: ignore[misc]
     id: Any = Column(Integer, primary_key=True)
     session_id: Any = Column(ForeignKey("sessions.id"), nullable=False, index=True)
     round: Any = Column(Integer, default=1)
+    turn: Any = Column(Integer, default=-1)  # 현재 차례의 initiatives.order (-1: 시작 전)
+    # InitiativeTracker.delay_policy ("back" | "reinsert"). 복원 후에도 delay() 동작이 같도록
+    delay_policy: Any = Column(String(16), nullable=False, default="back")
     notes: Any = Column(Text)
+    # TrackerHistory.dumps() (연산 로그 + 스냅샷). EncounterRepository.save_history() 가 쓴다
+    oplog: Any = Column(Text)
 
     session: Any = relationship("Session", back_populates="encounters")
     initiatives: Any = relationship(
@@ -112,18 +120,43 @@ class Initiative(Base):  # type: ignore[misc]
     )
 
 
+class RngStreamRecord(Base):  # type: ignore[misc]
+    __tablename__ = "rng_streams"
+
+    id: Any = Column(Integer, primary_key=True)
+    session_id: Any = Column(ForeignKey("sessions.id"), nullable=False, index=True)
+    stream_id: Any = Column(String(64), nullable=False, unique=True)  # RngStream 키(hex)
+
+
 class DiceLog(Base):  # type: ignore[misc]
     __tablename__ = "dice_logs"
 
     id: Any = Column(Integer, primary_key=True)
     session_id: Any = Column(ForeignKey("sessions.id"), nullable=False, index=True)
     roller_id: Any = Column(ForeignKey("users.id"))
-    formula: Any = Column(String(64), nullable=False)
-    detail: Any = Column(JSON)  # 각 눈/옵션 정보
+    formula: Any = Column(String(64), nullable=False)  # compile_formula() 캐시 키
+    detail: Any = Column(JSON)  # 각 눈/옵션 정보 (compact 모드에서는 NULL)
     total: Any = Column(Integer, nullable=False)
+    # compact 모드: 눈 대신 (스트림, offset) 만 저장하고 읽을 때 재현
+    rng_stream_id: Any = Column(ForeignKey("rng_streams.id"))
+    rng_offset: Any = Column(Integer)
     created_at: Any = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     session: Any = relationship("Session", back_populates="dice_logs")
+    # 같은 SELECT 에서 스트림 키를 함께 읽어 비동기 lazy-load 를 피한다
+    rng_stream: Any = relationship("RngStreamRecord", lazy="joined")
+
+    @property
+    def is_compact(self) -> bool:
+        return self.detail is None and self.rng_stream_id is not None
+
+    @cached_property
+    def full_detail(self) -> dict[str, Any] | None:
+        """저장된 detail, 또는 compact 행이면 스트림에서 재현한 detail (첫 접근 시 1회)."""
+        if not self.is_compact:
+            return self.detail  # type: ignore[no-any-return]
+        r = replay(self.formula, self.rng_stream.stream_id, self.rng_offset)
+        return {"dice": list(r.rolls), "crit": r.crit, "fumble": r.fumble}
 
 
 class LogEntry(Base):  # type: ignore[misc]
@@ -7,6 +7,7 @@ from .entities import (
     Encounter,
     Initiative,
     LogEntry,
+    RngStreamRecord,
     Session,
     User,
 )
@@ -20,4 +21,5 @@ __all__ = [
     "Initiative",
     "DiceLog",
     "LogEntry",
+    "RngStreamRecord",
 ]
@@ -1,21 +1,32 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from collections.abc import Sequence
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.models.entities import DiceLog as DiceLog
+from backend.app.models.entities import RngStreamRecord
+from core.dice import RngStream, RollResult, replay, stream_for
+from core.dice import roll as roll_dice
 
 
 class DiceLogService:
-    """주사위 로그 관리 서비스"""
+    """주사위 로그 관리 서비스
 
-    def __init__(self, db: AsyncSession):
+    compact=True 이면 눈(detail) 대신 (RNG 스트림, offset) 만 저장하고,
+    읽을 때 DiceLog.full_detail 에서 결정적으로 재현한다. 20d6 같은 큰 풀에서
+    행 크기가 몇 배 줄고 bulk insert 도 가벼워진다.
+    """
+
+    def __init__(self, db: AsyncSession, *, compact: bool = False):
         self.db = db
+        self.compact = compact
+        self._stream_refs: dict[str, int] = {}
 
     async def add_log(
-        self, session_id: int, roll: str, result: int, roller: Optional[str] = None
+        self, session_id: int, roll: str, result: int, roller: str | None = None
     ) -> DiceLog:
         """주사위 굴림 로그 추가"""
         log = DiceLog(session_id=session_id, roll=roll, result=result, roller=roller)
@@ -24,14 +35,97 @@ class DiceLogService:
         await self.db.refresh(log)
         return log
 
-    async def get_logs(self, session_id: int) -> List[DiceLog]:
-        """특정 세션의 모든 주사위 로그 조회"""
+    async def roll(self, session_id: int, formula: str, roller_id: int | None = None) -> DiceLog:
+        """세션 RNG 스트림으로 굴리고 결과를 로그로 남긴다."""
+        stream = stream_for(session_id)
+        offset = stream.offset
+        result = roll_dice(formula, rng=stream)
+        ref = await self._stream_ref(session_id, stream)
+
+        log = DiceLog(**self._row(session_id, roller_id, result, ref, offset))
+        self.db.add(log)
+        await self.db.commit()
+        await self.db.refresh(log)
+        return log
+
+    async def add_rolls(
+        self, session_id: int, formulas: Sequence[str], roller_id: int | None = None
+    ) -> int:
+        """여러 굴림을 executemany INSERT 한 번으로 기록한다. 반환값: 행 수"""
+        stream = stream_for(session_id)
+        ref = await self._stream_ref(session_id, stream)
+
+        rows: list[dict[str, Any]] = []
+        for formula in formulas:
+            offset = stream.offset
+            result = roll_dice(formula, rng=stream)
+            rows.append(self._row(session_id, roller_id, result, ref, offset))
+        if rows:
+            await self.db.execute(insert(DiceLog), rows)
+            await self.db.commit()
+        return len(rows)
+
+    async def get_logs(self, session_id: int) -> list[DiceLog]:
+        """특정 세션의 모든 주사위 로그 조회 (compact 행은 full_detail 접근 시 재현)"""
         result = await self.db.execute(
             select(DiceLog).where(DiceLog.session_id == session_id).order_by(DiceLog.id)
         )
-        return result.scalars().all()
+        return list(result.scalars().unique().all())
 
-    async def get_log(self, log_id: int) -> Optional[DiceLog]:
+    async def get_log(self, log_id: int) -> DiceLog | None:
         """특정 로그 조회"""
         result = await self.db.execute(select(DiceLog).where(DiceLog.id == log_id))
-        return result.scalar_one_or_none()
+        return result.unique().scalar_one_or_none()
+
+    async def verify_log(self, log_id: int) -> bool:
+        """
+        저장된 로그가 RNG 스트림 재현 결과와 일치하는지 검사한다.
+        스트림 정보가 없는 행(예: add_log 로 넣은 행)은 검증할 수 없으므로 False.
+        """
+        log = await self.get_log(log_id)
+        if log is None or log.rng_stream is None or log.rng_offset is None:
+            return False
+        r = replay(log.formula, log.rng_stream.stream_id, log.rng_offset)
+        if r.total != log.total:
+            return False
+        return log.detail is None or list(log.detail.get("dice", [])) == list(r.rolls)
+
+    # ---- internal -------------------------------------------------------------
+    async def _stream_ref(self, session_id: int, stream: RngStream) -> int:
+        """stream_id 에 해당하는 rng_streams 행 id (없으면 생성)."""
+        ref = self._stream_refs.get(stream.stream_id)
+        if ref is not None:
+            return ref
+        found = await self.db.execute(
+            select(RngStreamRecord.id).where(RngStreamRecord.stream_id == stream.stream_id)
+        )
+        ref = found.scalar_one_or_none()
+        if ref is None:
+            record = RngStreamRecord(session_id=session_id, stream_id=stream.stream_id)
+            self.db.add(record)
+            await self.db.flush()
+            ref = record.id
+        self._stream_refs[stream.stream_id] = ref
+        return int(ref)
+
+    def _row(
+        self,
+        session_id: int,
+        roller_id: int | None,
+        result: RollResult,
+        stream_ref: int,
+        offset: int,
+    ) -> dict[str, Any]:
+        # 스트림 위치는 항상 남겨 검증이 가능하게 하고, compact 모드에서만 눈을 생략한다
+        detail = None
+        if not self.compact:
+            detail = {"dice": list(result.rolls), "crit": result.crit, "fumble": result.fumble}
+        return {
+            "session_id": session_id,
+            "roller_id": roller_id,
+            "formula": result.formula,
+            "total": result.total,
+            "detail": detail,
+            "rng_stream_id": stream_ref,
+            "rng_offset": offset,
+        }
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.services.encounters import EncounterRepository
+from core.initiative import InitiativeTracker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class RegistryStats:
+    """모니터링용 누적 카운터."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # LRU/유휴/메모리 상한으로 내보낸 수
+    flushes: int = 0  # 더티 인카운터를 DB 에 쓴 횟수
+    writes: int = 0  # 그때 실행된 쓰기 문장 수
+
+
+@dataclass(slots=True)
+class _Entry:
+    tracker: InitiativeTracker
+    actors: int  # 메모리 상한 계산용 (적재/저장 시점의 참가자 수)
+    last_used: float
+    dirty: bool = False
+    uses: int = 0  # get()/mark_dirty() 횟수 (축출 중 다시 쓰였는지 확인용)
+    evicting: bool = False  # 축출하며 저장하는 중 (다른 축출은 건너뛴다)
+
+
+class EncounterRegistry:
+    """살아 있는 InitiativeTracker 를 인카운터 id 로 들고 있는 프로세스 로컬 캐시
+
+    - get(): 캐시에 있으면 그대로(hit), 없으면 EncounterRepository.load() 로 적재(miss)
+    - mark_dirty(): 변경 사실만 표시하고, 쓰기는 flush()/축출/close() 때 모아서 한다 (write-behind)
+    - 축출: max_entries 초과 시 가장 오래 안 쓴 것부터(LRU), idle_seconds 동안 안 쓴 것,
+      그리고 캐시된 참가자 수 합이 max_actors(메모리 상한)를 넘으면 넘지 않을 때까지
+    - 더티 항목은 축출 전에 반드시 저장한다
+    DB 접근은 session_factory(예: async_sessionmaker) 로 만든 세션 하나를
+    잠금으로 직렬화해서 쓴다.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        *,
+        max_entries: int = 256,
+        max_actors: int = 100_000,
+        idle_seconds: float = 900.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._session_factory = session_factory
+        self.max_entries = max_entries
+        self.max_actors = max_actors
+        self.idle_seconds = idle_seconds
+        self._clock = clock
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._actors = 0
+        self._db: AsyncSession | None = None
+        self._repo: EncounterRepository | None = None
+        self._lock = asyncio.Lock()
+        self._flusher: asyncio.Task[None] | None = None
+        self.stats = RegistryStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, encounter_id: object) -> bool:
+        return encounter_id in self._entries
+
+    def snapshot(self) -> dict[str, Any]:
+        """모니터링 엔드포인트용: 카운터 + 현재 크기."""
+        data = asdict(self.stats)
+        data.update(
+            entries=len(self._entries),
+            actors=self._actors,
+            dirty=sum(1 for e in self._entries.values() if e.dirty),
+        )
+        return data
+
+    # ---- 조회/표시 -------------------------------------------------------------
+    async def get(self, encounter_id: int) -> InitiativeTracker | None:
+        entry = self._entries.get(encounter_id)
+        if entry is not None:
+            self.stats.hits += 1
+            self._touch(encounter_id, entry)
+            return entry.tracker
+
+        async with self._lock:
+            # 잠금을 기다리는 동안 다른 get() 이 먼저 적재했을 수 있다
+            entry = self._entries.get(encounter_id)
+            if entry is not None:
+                self.stats.hits += 1
+                self._touch(encounter_id, entry)
+                return entry.tracker
+            self.stats.misses += 1
+            tracker = await self._repository().load(encounter_id)
+            if tracker is None:
+                return None
+            self._entries[encounter_id] = _Entry(tracker, len(tracker), self._clock())
+            self._actors += len(tracker)
+        # 축출은 저장하면서 잠금을 다시 잡으므로 잠금 밖에서
+        await self._enforce_limits(keep=encounter_id)
+        return tracker
+
+    async def mark_dirty(self, encounter_id: int) -> None:
+        entry = self._entries.get(encounter_id)
+        if entry is None:
+            raise KeyError(f"Encounter {encounter_id} is not cached")
+        entry.dirty = True
+        self._touch(encounter_id, entry)
+        self._actors += len(entry.tracker) - entry.actors
+        entry.actors = len(entry.tracker)
+        # 참가자가 늘었으면 max_actors 를 넘지 않게 다른 항목을 내보낸다
+        await self._enforce_limits(keep=encounter_id)
+
+    # ---- write-behind ---------------------------------------------------------
+    async def flush(self, encounter_id: int | None = None) -> int:
+        """더티 인카운터를 저장한다. 반환값: 저장한 인카운터 수"""
+        ids = [encounter_id] if encounter_id is not None else list(self._entries)
+        flushed = 0
+        for eid in ids:
+            entry = self._entries.get(eid)
+            if entry is not None and entry.dirty:
+                await self._write(eid, entry)
+                flushed += 1
+        return flushed
+
+    async def evict_idle(self) -> int:
+        """idle_seconds 동안 쓰이지 않은 항목을 내보낸다. 반환값: 축출 수"""
+        deadline = self._clock() - self.idle_seconds
+        idle = [eid for eid, e in self._entries.items() if e.last_used <= deadline]
+        evicted = 0
+        for eid in idle:
+            evicted += await self._evict(eid)
+        return evicted
+
+    def start(self, interval: float = 5.0) -> None:
+        """interval 초마다 flush() + evict_idle() 를 도는 백그라운드 작업을 띄운다."""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run(interval))
+
+    async def close(self) -> None:
+        """백그라운드 작업을 멈추고 더티 항목을 모두 저장한 뒤 세션을 닫는다."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+        if self._db is not None:
+            await self._db.close()
+            self._db = self._repo = None
+
+    # ---- internal -------------------------------------------------------------
+    def _repository(self) -> EncounterRepository:
+        if self._repo is None:
+            self._db = self._session_factory()
+            self._repo = EncounterRepository(self._db)
+        return self._repo
+
+    def _touch(self, encounter_id: int, entry: _Entry) -> None:
+        entry.uses += 1
+        entry.last_used = self._clock()
+        self._entries.move_to_end(encounter_id)
+
+    async def _run(self, interval: float) -> None:
+        # 저장 실패(DB 일시 장애 등)로 루프가 멈추면 변경이 쌓이기만 하므로 기록하고 계속 돈다
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+                await self.evict_idle()
+            except Exception:
+                logger.exception("encounter write-behind failed; retrying in %.1fs", interval)
+
+    async def _write(self, encounter_id: int, entry: _Entry) -> None:
+        # 저장 중에 다시 mark_dirty() 되면 다음 flush 에서 또 쓰도록 먼저 내려둔다
+        entry.dirty = False
+        try:
+            async with self._lock:
+                self.stats.writes += await self._repository().save(encounter_id, entry.tracker)
+        except Exception:
+            entry.dirty = True
+            raise
+        self.stats.flushes += 1
+
+    async def _evict(self, encounter_id: int) -> bool:
+        """항목을 (더티면 저장한 뒤) 내보낸다. 반환값: 실제로 내보냈는지"""
+        entry = self._entries.get(encounter_id)
+        if entry is None or entry.evicting:
+            return False  # 이미 없거나 다른 축출이 저장 중
+        uses = entry.uses
+        if entry.dirty:
+            entry.evicting = True
+            try:
+                await self._write(encounter_id, entry)
+            finally:
+                entry.evicting = False
+            # 저장을 기다리는 사이 get()/mark_dirty() 로 다시 쓰였으면 남겨 둔다
+            # (다시 더티면 다음 flush 가 저장한다)
+            if self._entries.get(encounter_id) is not entry or entry.uses != uses:
+                return False
+        del self._entries[encounter_id]
+        self._actors -= entry.actors
+        if self._repo is not None:
+            self._repo.forget(encounter_id)
+        self.stats.evictions += 1
+        return True
+
+    async def _enforce_limits(self, keep: int) -> None:
+        # 가장 오래 안 쓴 것부터 내보내되, 방금 적재한 항목은 남긴다
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._actors > self.max_actors
+        ):
+            # 다른 축출이 저장 중인 항목은 건너뛴다
+            oldest = next((eid for eid, e in self._entries.items() if not e.evicting), keep)
+            if oldest == keep:
+                break
+            await self._evict(oldest)
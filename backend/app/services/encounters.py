@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import weakref
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.models.entities import Encounter, Initiative
+from core.initiative import ActorGroup, InitiativeTracker
+from core.initiative.history import TrackerHistory
+
+
+@dataclass(slots=True)
+class _Persisted:
+    """마지막으로 DB 에 쓴(또는 읽은) 인카운터 상태."""
+
+    # 같은 추적기 객체인지 (id() 는 GC 뒤 재사용될 수 있어 weakref; version 은 객체마다 센다)
+    tracker: weakref.ref[InitiativeTracker]
+    version: int  # 그때의 tracker.version
+    round: int
+    turn: int
+    # 이름 -> (행 id, order, is_delayed)
+    rows: dict[str, tuple[int, int, bool]] = field(default_factory=dict)
+    positions: dict[str, int] = field(default_factory=dict)  # 이름 -> 순서 위치
+    oplog: str | None = None  # 마지막으로 쓴(읽은) encounters.oplog
+    delay_policy: str = "back"
+
+
+class EncounterRepository:
+    """인카운터 <-> InitiativeTracker 저장소
+
+    load() 는 encounters + initiatives 를 조인 한 번으로 읽어 추적기를 만들고,
+    save() 는 마지막으로 저장한 상태와 비교해 바뀐 행만 쓴다.
+    - 순서가 그대로면(tracker.version 동일) initiatives 는 비교조차 하지 않는다
+    - 바뀐 행은 order/is_delayed 만 담아 executemany UPDATE 한 번으로
+    - 턴 진행만 있었다면 encounters 의 round/turn UPDATE 한 문장으로 끝난다
+    - save_history()/load_history(): TrackerHistory.dumps() 를 encounters.oplog 에 함께 두어
+      undo/redo 기록까지 복원한다 (oplog 는 round/turn 과 같은 UPDATE 에 실린다)
+    묶음(ActorGroup) 은 initiatives 한 행으로 표현할 수 없으므로 저장하지 않는다.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._persisted: dict[int, _Persisted] = {}
+
+    async def create(self, session_id: int, tracker: InitiativeTracker) -> int:
+        """새 인카운터로 저장하고 id 를 돌려준다."""
+        round_, turn = tracker.round, _turn(tracker)
+        policy = tracker.delay_policy
+        encounter = Encounter(session_id=session_id, round=round_, turn=turn, delay_policy=policy)
+        self.db.add(encounter)
+        await self.db.flush()
+        state = _Persisted(weakref.ref(tracker), -1, round_, turn, delay_policy=policy)
+        self._persisted[encounter.id] = state
+        await self._write_rows(encounter.id, tracker, state)
+        await self.db.commit()
+        return int(encounter.id)
+
+    async def load(self, encounter_id: int) -> InitiativeTracker | None:
+        """initiatives 행으로 추적기를 복원한다 (쿼리 한 번). 없는 인카운터면 None."""
+        result = await self.db.execute(
+            select(
+                Encounter.round,
+                Encounter.turn,
+                Encounter.delay_policy,
+                Initiative.id,
+                Initiative.actor_name,
+                Initiative.value,
+                Initiative.is_delayed,
+            )
+            .outerjoin(Initiative, Initiative.encounter_id == Encounter.id)
+            .where(Encounter.id == encounter_id)
+            .order_by(Initiative.order)
+        )
+        rows = result.all()
+        if not rows:
+            return None
+        round_, turn, policy = rows[0].round or 0, rows[0].turn, rows[0].delay_policy or "back"
+        actors = [r for r in rows if r.id is not None]
+        current = actors[turn].actor_name if turn is not None and 0 <= turn < len(actors) else None
+        tracker = InitiativeTracker.from_state(
+            ((r.actor_name, r.value, bool(r.is_delayed)) for r in actors), current, round_, policy
+        )
+        state = _Persisted(
+            weakref.ref(tracker), tracker.version, round_, _turn_or(turn), delay_policy=policy
+        )
+        for pos, r in enumerate(actors):
+            state.rows[r.actor_name] = (r.id, pos, bool(r.is_delayed))
+            state.positions[r.actor_name] = pos
+        self._persisted[encounter_id] = state
+        return tracker
+
+    async def save(self, encounter_id: int, tracker: InitiativeTracker) -> int:
+        """
+        바뀐 부분만 기록한다. 반환값: 실행한 쓰기 문장 수 (0 이면 변경 없음).
+        처음 보는 추적기 객체면 load() 없이도 현재 DB 상태와 비교해 맞춘다.
+        """
+        return await self._save(encounter_id, tracker, None)
+
+    async def load_history(self, encounter_id: int) -> TrackerHistory | None:
+        """
+        encounters.oplog 에서 TrackerHistory 를 복원한다.
+        없는 인카운터이거나 연산 로그가 없으면(save() 로만 저장) None.
+        """
+        oplog = await self.db.scalar(select(Encounter.oplog).where(Encounter.id == encounter_id))
+        if oplog is None:
+            return None
+        history = TrackerHistory.loads(oplog)
+        if await self.load(encounter_id) is not None:
+            # 행 상태는 그대로 두고 비교 대상만 복원한 추적기로 바꾼다
+            state = self._persisted[encounter_id]
+            state.tracker, state.version = weakref.ref(history.tracker), -1
+            state.oplog = oplog
+        return history
+
+    async def save_history(self, encounter_id: int, history: TrackerHistory) -> int:
+        """save() 와 같되 연산 로그(dumps())도 바뀌었으면 encounters.oplog 에 쓴다."""
+        return await self._save(encounter_id, history.tracker, history.dumps())
+
+    def forget(self, encounter_id: int) -> None:
+        """캐시된 저장 상태를 버린다 (다음 save() 는 DB 와 전체 비교)."""
+        self._persisted.pop(encounter_id, None)
+
+    # ---- internal -------------------------------------------------------------
+    async def _save(self, encounter_id: int, tracker: InitiativeTracker, oplog: str | None) -> int:
+        state = self._persisted.get(encounter_id)
+        if state is None or state.tracker() is not tracker:
+            loaded = await self.load(encounter_id)
+            if loaded is None:
+                raise ValueError(f"Encounter {encounter_id} not found")
+            state = self._persisted[encounter_id]
+            state.tracker, state.version = weakref.ref(tracker), -1
+
+        statements = 0
+        if tracker.version != state.version:
+            statements += await self._write_rows(encounter_id, tracker, state)
+
+        values: dict[str, Any] = {}
+        round_, turn = tracker.round, _turn(tracker, state.positions)
+        if (round_, turn) != (state.round, state.turn):
+            values.update(round=round_, turn=turn)
+        if oplog is not None and oplog != state.oplog:
+            values["oplog"] = oplog
+        if tracker.delay_policy != state.delay_policy:
+            values["delay_policy"] = tracker.delay_policy
+        if values:
+            await self.db.execute(
+                update(Encounter).where(Encounter.id == encounter_id).values(**values)
+            )
+            state.round, state.turn = round_, turn
+            state.delay_policy = tracker.delay_policy
+            if oplog is not None:
+                state.oplog = oplog
+            statements += 1
+
+        if statements:
+            await self.db.commit()
+        return statements
+
+    async def _write_rows(
+        self, encounter_id: int, tracker: InitiativeTracker, state: _Persisted
+    ) -> int:
+        # 현재 순서와 마지막 저장 상태를 비교해 INSERT/UPDATE/DELETE 를 각각 최대 한 문장으로
+        order = tracker.order
+        added: list[dict[str, Any]] = []
+        changed: list[dict[str, Any]] = []
+        seen: set[str] = set()
+        positions: dict[str, int] = {}
+        for pos, actor in enumerate(order):
+            if isinstance(actor, ActorGroup):
+                raise TypeError(f"Actor groups cannot be persisted: {actor.name}")
+            name = actor.name
+            seen.add(name)
+            positions[name] = pos
+            old = state.rows.get(name)
+            if old is None:
+                added.append(
+                    {
+                        "encounter_id": encounter_id,
+                        "actor_name": name,
+                        "value": actor.init,
+                        "order": pos,
+                        "is_delayed": actor.delayed,
+                    }
+                )
+            elif old[1:] != (pos, actor.delayed):
+                changed.append({"id": old[0], "order": pos, "is_delayed": actor.delayed})
+                state.rows[name] = (old[0], pos, actor.delayed)
+        gone = [state.rows.pop(name)[0] for name in list(state.rows) if name not in seen]
+
+        statements = 0
+        if gone:
+            await self.db.execute(delete(Initiative).where(Initiative.id.in_(gone)))
+            statements += 1
+        if changed:
+            await self.db.execute(update(Initiative), changed)
+            statements += 1
+        if added:
+            result = await self.db.execute(
+                insert(Initiative).returning(Initiative.id, Initiative.actor_name), added
+            )
+            ids = {name: row_id for row_id, name in result.all()}
+            for row in added:
+                name = row["actor_name"]
+                state.rows[name] = (ids[name], row["order"], row["is_delayed"])
+            statements += 1
+
+        state.positions = positions
+        state.version = tracker.version
+        return statements
+
+
+def _turn(tracker: InitiativeTracker, positions: dict[str, int] | None = None) -> int:
+    """현재 차례의 순서 위치 (시작 전이면 -1)."""
+    try:
+        name = tracker.current().name
+    except RuntimeError:
+        return -1
+    if positions is not None:
+        return positions[name]
+    return next(i for i, a in enumerate(tracker.order) if a.name == name)
+
+
+def _turn_or(turn: int | None) -> int:
+    return -1 if turn is None else int(turn)
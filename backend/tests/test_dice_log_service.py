@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.app.models.base import Base
+from backend.app.models.entities import DiceLog, RngStreamRecord
+from backend.app.services.dice_log import DiceLogService
+from core.dice import drop_stream
+
+
+@pytest_asyncio.fixture
+async def db() -> AsyncIterator[AsyncSession]:
+    # 메모리 SQLite 에 엔티티 테이블만 만든다 (세션/유저 FK 는 SQLite 가 검사하지 않음)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_compact_roll_replays_and_verifies(db: AsyncSession) -> None:
+    drop_stream(101)
+    svc = DiceLogService(db, compact=True)
+    log = await svc.roll(101, "20d6")
+    assert log.detail is None and log.is_compact  # 눈은 저장하지 않는다
+
+    db.expunge_all()  # 다시 읽어 재현 경로를 탄다
+    (loaded,) = await svc.get_logs(101)
+    detail = loaded.full_detail
+    assert detail is not None
+    dice = detail["dice"]
+    assert len(dice) == 20 and sum(dice) == loaded.total
+    assert await svc.verify_log(loaded.id)
+
+    loaded.total += 1  # 변조된 행은 검증에 실패한다
+    await db.commit()
+    assert not await svc.verify_log(loaded.id)
+    drop_stream(101)
+
+
+@pytest.mark.asyncio
+async def test_add_rolls_bulk_inserts_on_one_stream(db: AsyncSession) -> None:
+    drop_stream(102)
+    full = DiceLogService(db)
+    assert await full.add_rolls(102, ["1d20", "2d6+1", "4d6kh3"]) == 3
+    assert await full.add_rolls(102, []) == 0
+
+    logs = await full.get_logs(102)
+    assert [log.formula for log in logs] == ["1d20", "2d6+1", "4d6kh3"]
+    assert all(log.detail is not None and not log.is_compact for log in logs)
+    offsets = [log.rng_offset for log in logs]
+    assert offsets == sorted(offsets) and len(set(offsets)) == 3
+    assert all([await full.verify_log(log.id) for log in logs])
+
+    # 같은 세션 스트림은 rng_streams 행 하나를 공유한다
+    streams = await db.execute(select(func.count()).select_from(RngStreamRecord))
+    assert streams.scalar_one() == 1
+
+    legacy = DiceLog(session_id=102, formula="1d4", total=3)  # 스트림 정보 없음
+    db.add(legacy)
+    await db.commit()
+    assert not await full.verify_log(legacy.id)
+    assert not await full.verify_log(10_000)
+    assert await db.scalar(select(func.count()).select_from(DiceLog)) == 4
+    drop_stream(102)
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.app.models.base import Base
+from backend.app.services.encounter_registry import EncounterRegistry
+from backend.app.services.encounters import EncounterRepository
+from core.initiative import InitiativeTracker
+
+
+@pytest_asyncio.fixture
+async def sessions(tmp_path: Path) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    # 레지스트리는 자기 세션을 따로 열므로 연결 간에 공유되는 파일 DB 를 쓴다
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'encounters.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _create(sessions: async_sessionmaker[AsyncSession], *names: str) -> int:
+    t = InitiativeTracker()
+    for i, name in enumerate(names):
+        t.add(name, 20 - i)
+    t.start_encounter()
+    async with sessions() as db:
+        return await EncounterRepository(db).create(1, t)
+
+
+@pytest.mark.asyncio
+async def test_hit_and_miss(sessions: async_sessionmaker[AsyncSession]) -> None:
+    eid = await _create(sessions, "A", "B", "C")
+    reg = EncounterRegistry(sessions)
+    first = await reg.get(eid)
+    assert first is not None and await reg.get(eid) is first
+    assert await reg.get(10_000) is None
+    assert (reg.stats.hits, reg.stats.misses) == (1, 2)
+    assert reg.snapshot()["actors"] == 3 and eid in reg and len(reg) == 1
+    await reg.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_miss_loads_once(sessions: async_sessionmaker[AsyncSession]) -> None:
+    eid = await _create(sessions, "A", "B", "C")
+    reg = EncounterRegistry(sessions)
+    trackers = await asyncio.gather(*(reg.get(eid) for _ in range(4)))
+    assert all(t is trackers[0] for t in trackers)
+    assert (reg.stats.hits, reg.stats.misses) == (3, 1)
+    assert reg.snapshot()["actors"] == 3
+    await reg.close()
+
+
+@pytest.mark.asyncio
+async def test_lru_and_actor_limit_eviction(sessions: async_sessionmaker[AsyncSession]) -> None:
+    a, b, c = [await _create(sessions, "X", "Y", "Z") for _ in range(3)]
+    reg = EncounterRegistry(sessions, max_entries=2, max_actors=6)
+    await reg.get(a)
+    await reg.get(b)
+    await reg.get(a)  # b 가 가장 오래 안 쓴 항목이 된다
+    await reg.get(c)
+    assert a in reg and c in reg and b not in reg
+    assert reg.stats.evictions == 1
+
+    tracker = await reg.get(c)
+    assert tracker is not None
+    tracker.add("W", 1)
+    await reg.mark_dirty(c)  # 7 명 > max_actors: a 를 내보낸다
+    assert a not in reg and c in reg
+    assert reg.snapshot()["actors"] == 4
+    with pytest.raises(KeyError):
+        await reg.mark_dirty(b)
+    await reg.close()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flush(sessions: async_sessionmaker[AsyncSession]) -> None:
+    eid = await _create(sessions, "A", "B", "C")
+    reg = EncounterRegistry(sessions)
+    tracker = await reg.get(eid)
+    assert tracker is not None
+    tracker.next_turn()
+    await reg.mark_dirty(eid)
+    assert reg.snapshot()["dirty"] == 1
+    assert await reg.flush() == 1 and await reg.flush() == 0
+    assert (reg.stats.flushes, reg.stats.writes) == (1, 1)
+
+    async with sessions() as db:
+        loaded = await EncounterRepository(db).load(eid)
+    assert loaded is not None and loaded.current().name == "B"
+    await reg.close()
+
+
+@pytest.mark.asyncio
+async def test_background_flush_survives_errors(
+    sessions: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    eid = await _create(sessions, "A", "B", "C")
+    reg = EncounterRegistry(sessions)
+    tracker = await reg.get(eid)
+    assert tracker is not None
+    save = EncounterRepository.save
+    failures = [RuntimeError("db down")]
+
+    async def flaky(self: EncounterRepository, *args: object) -> int:
+        if failures:
+            raise failures.pop()
+        return await save(self, *args)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(EncounterRepository, "save", flaky)
+    tracker.next_turn()
+    await reg.mark_dirty(eid)
+    reg.start(interval=0.01)
+    for _ in range(100):
+        if reg.stats.flushes:
+            break
+        await asyncio.sleep(0.01)
+    assert reg.stats.flushes == 1 and reg.snapshot()["dirty"] == 0
+    assert "write-behind failed" in caplog.text
+    await reg.close()
+
+
+def _slow_save(monkeypatch: pytest.MonkeyPatch) -> tuple[asyncio.Event, asyncio.Event]:
+    # save() 가 시작되면 started 를 올리고 release 까지 기다린다
+    started, release = asyncio.Event(), asyncio.Event()
+    save = EncounterRepository.save
+
+    async def slow(self: EncounterRepository, *args: object) -> int:
+        started.set()
+        await release.wait()
+        return await save(self, *args)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(EncounterRepository, "save", slow)
+    return started, release
+
+
+@pytest.mark.asyncio
+async def test_eviction_keeps_entry_reused_during_write(
+    sessions: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    eid = await _create(sessions, "A", "B", "C")
+    reg = EncounterRegistry(sessions, idle_seconds=0)
+    tracker = await reg.get(eid)
+    assert tracker is not None
+    tracker.next_turn()
+    await reg.mark_dirty(eid)
+    started, release = _slow_save(monkeypatch)
+
+    evicting = asyncio.create_task(reg.evict_idle())
+    await started.wait()
+    again = await reg.get(eid)  # 저장을 기다리는 사이 hit
+    assert again is tracker
+    tracker.next_turn()  # -> C
+    await reg.mark_dirty(eid)
+    release.set()
+    assert await evicting == 0
+    assert eid in reg and reg.snapshot()["actors"] == 3 and reg.stats.evictions == 0
+
+    await reg.close()  # 남은 변경을 저장
+    async with sessions() as db:
+        loaded = await EncounterRepository(db).load(eid)
+    assert loaded is not None and loaded.current().name == "C"
+
+
+@pytest.mark.asyncio
+async def test_overlapping_evictions_evict_once(
+    sessions: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    eid = await _create(sessions, "A", "B", "C")
+    reg = EncounterRegistry(sessions, idle_seconds=0)
+    tracker = await reg.get(eid)
+    assert tracker is not None
+    tracker.next_turn()
+    await reg.mark_dirty(eid)
+    started, release = _slow_save(monkeypatch)
+
+    first = asyncio.create_task(reg.evict_idle())
+    await started.wait()
+    assert await reg.evict_idle() == 0  # 저장 중인 항목은 건너뛴다
+    release.set()
+    assert await first == 1
+    assert len(reg) == 0 and reg.snapshot()["actors"] == 0
+    assert (reg.stats.evictions, reg.stats.flushes) == (1, 1)
+    await reg.close()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import gc
+from collections.abc import AsyncIterator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from backend.app.models.base import Base
+from backend.app.services.encounters import EncounterRepository
+from core.initiative import DelayPolicy, InitiativeTracker
+from core.initiative.history import TrackerHistory
+
+
+@pytest_asyncio.fixture
+async def engine() -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(engine: AsyncEngine) -> AsyncIterator[AsyncSession]:
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+
+
+def _record(engine: AsyncEngine) -> list[str]:
+    # 실행된 SQL 문장 (executemany 는 한 번으로 센다)
+    statements: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _on_execute(conn, cursor, statement, params, context, executemany):  # type: ignore[no-untyped-def]
+        statements.append(statement.split(None, 1)[0].upper())
+
+    return statements
+
+
+def _tracker(delay_policy: DelayPolicy = "back") -> InitiativeTracker:
+    t = InitiativeTracker(delay_policy=delay_policy)
+    for name, init in (("A", 20), ("B", 15), ("C", 10), ("D", 5)):
+        t.add(name, init)
+    t.start_encounter()
+    return t
+
+
+@pytest.mark.asyncio
+async def test_load_save_round_trip(db: AsyncSession) -> None:
+    repo = EncounterRepository(db)
+    t = _tracker()
+    t.next_turn()
+    t.delay("B")
+    eid = await repo.create(1, t)
+
+    loaded = await EncounterRepository(db).load(eid)
+    assert loaded is not None
+    assert [(a.name, a.init, a.delayed) for a in loaded.order] == [
+        (a.name, a.init, a.delayed) for a in t.order
+    ]
+    assert loaded.current().name == "C" and loaded.round == t.round
+    assert await repo.load(10_000) is None
+    assert await repo.save(eid, t) == 0  # 방금 쓴 상태 그대로
+
+
+@pytest.mark.asyncio
+async def test_delay_policy_survives_reload(db: AsyncSession) -> None:
+    repo = EncounterRepository(db)
+    eid = await repo.create(1, _tracker("reinsert"))
+    loaded = await EncounterRepository(db).load(eid)
+    assert loaded is not None and loaded.delay_policy == "reinsert"
+    loaded.delay("A")  # reinsert: 표시만, 현재 차례도 그대로
+    assert [a.name for a in loaded.order] == ["A", "B", "C", "D"]
+    assert loaded.current().name == "A"
+
+    back = _tracker()
+    assert await repo.save(eid, back) == 1  # 정책만 바뀜: encounters UPDATE 하나
+    again = await EncounterRepository(db).load(eid)
+    assert again is not None and again.delay_policy == "back"
+
+
+@pytest.mark.asyncio
+async def test_turn_advance_is_a_single_update(engine: AsyncEngine, db: AsyncSession) -> None:
+    repo = EncounterRepository(db)
+    t = _tracker()
+    eid = await repo.create(1, t)
+    statements = _record(engine)
+
+    t.next_turn()
+    assert await repo.save(eid, t) == 1
+    assert [s for s in statements if s != "COMMIT"] == ["UPDATE"]
+
+
+@pytest.mark.asyncio
+async def test_delay_writes_only_changed_rows(engine: AsyncEngine, db: AsyncSession) -> None:
+    repo = EncounterRepository(db)
+    t = _tracker()
+    eid = await repo.create(1, t)
+    statements = _record(engine)
+    changed: list[list[dict[str, object]]] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _params(conn, cursor, statement, params, context, executemany):  # type: ignore[no-untyped-def]
+        if statement.startswith("UPDATE initiatives"):
+            changed.append(list(params) if executemany else [params])
+
+    t.delay("B")  # A 차례에 B 를 맨 뒤로: B, C, D 의 order 만 바뀐다
+    assert await repo.save(eid, t) == 1
+    assert [s for s in statements if s != "COMMIT"] == ["UPDATE"]
+    assert len(changed) == 1 and len(changed[0]) == 3
+
+    loaded = await EncounterRepository(db).load(eid)
+    assert loaded is not None
+    assert [a.name for a in loaded.order] == ["A", "C", "D", "B"] and loaded.order[-1].delayed
+
+
+@pytest.mark.asyncio
+async def test_new_tracker_object_is_diffed_against_db(db: AsyncSession) -> None:
+    repo = EncounterRepository(db)
+    eid = await repo.create(1, _tracker())
+    gc.collect()  # 첫 추적기가 사라져 id() 가 재사용되어도 다른 객체로 본다
+
+    t = _tracker()
+    t.remove("D")
+    assert await repo.save(eid, t) == 1  # DELETE 한 문장
+    loaded = await repo.load(eid)
+    assert loaded is not None and [a.name for a in loaded.order] == ["A", "B", "C"]
+
+    t.add_group("Goblin", 12, 3)
+    with pytest.raises(TypeError):
+        await repo.save(eid, t)
+
+
+@pytest.mark.asyncio
+async def test_history_round_trips_through_oplog(engine: AsyncEngine, db: AsyncSession) -> None:
+    h = TrackerHistory()
+    for name, init in (("A", 20), ("B", 15), ("C", 10)):
+        h.add(name, init)
+    h.start_encounter()
+    repo = EncounterRepository(db)
+    eid = await repo.create(1, h.tracker)
+    assert await repo.load_history(eid) is None  # 아직 연산 로그 없음
+    assert await repo.save_history(eid, h) == 1  # oplog 만
+
+    statements = _record(engine)
+    h.next_turn()
+    assert await repo.save_history(eid, h) == 1  # round/turn 과 oplog 가 한 UPDATE
+    assert [s for s in statements if s != "COMMIT"] == ["UPDATE"]
+
+    restored = await EncounterRepository(db).load_history(eid)
+    assert restored is not None and restored.tracker.current().name == "B"
+    assert restored.undo() and restored.tracker.current().name == "A"
@@ -0,0 +1 @@
+"""코어 엔진 마이크로 벤치마크 모음 (python -m benchmarks.<module> 로 실행)."""
@@ -0,0 +1,89 @@
+"""
+core.dice.roll 1회당 비용 측정.
+
+    python -m benchmarks.bench_dice [--number 200000]
+
+- before : 매 호출마다 정규식 매칭/그룹 파싱을 다시 하는 이전 구현
+- after  : compile_formula() 캐시를 거치는 현재 roll()
+- grammar: 확장 문법 기능별 roll() 비용 (단일항 빠른 경로 대비)
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import timeit
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from core.dice import RollResult, compile_formula, roll
+
+FORMULAS: tuple[str, ...] = ("1d20+5", "2d6+3", "1d8", "4d6-1")
+
+# 기능별 대표 공식 (첫 줄이 기준선)
+GRAMMAR: tuple[tuple[str, str], ...] = (
+    ("single term", "2d6+3"),
+    ("multi term", "2d6+1d4+3"),
+    ("keep highest", "4d6kh3"),
+    ("drop lowest", "4d6dl1"),
+    ("advantage", "2d20kh1+5"),
+    ("exploding", "3d6!"),
+    ("reroll", "2d6r2"),
+)
+
+# 캐시 도입 이전의 단일항 파서
+_LEGACY_RE = re.compile(r"^\s*(\d+)d(\d+)\s*([+-]\s*\d+)?\s*$", re.IGNORECASE)
+
+
+def _roll_uncached(formula: str) -> RollResult:
+    # 캐시 도입 이전 roll() 을 그대로 재현 (결과 객체 생성까지 포함)
+    m = _LEGACY_RE.match(formula)
+    if not m:
+        raise ValueError(f"Invalid dice formula: {formula!r}")
+    n = int(m.group(1))
+    sides = int(m.group(2))
+    mod = int(m.group(3).replace(" ", "")) if m.group(3) else 0
+    detail = [random.randint(1, sides) for _ in range(n)]
+    total = sum(detail) + mod
+    crit = fumble = False
+    if n == 1 and sides == 20:
+        crit = detail[0] == 20
+        fumble = detail[0] == 1
+    return RollResult(
+        formula=formula, total=total, detail=detail, rolls=detail, crit=crit, fumble=fumble
+    )
+
+
+def _per_call_ns(fn: Callable[[str], Any], formulas: Sequence[str], number: int) -> float:
+    timer = timeit.Timer("for f in F: fn(f)", globals={"F": formulas, "fn": fn})
+    loops = max(1, number // len(formulas))
+    best = min(timer.repeat(repeat=5, number=loops))
+    return best / (loops * len(formulas)) * 1e9
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    compile_formula.cache_clear()
+    before = _per_call_ns(_roll_uncached, FORMULAS, args.number)
+    after = _per_call_ns(roll, FORMULAS, args.number)
+    info = compile_formula.cache_info()
+
+    print(f"formulas : {', '.join(FORMULAS)}")
+    print(f"before   : {before:8.1f} ns/roll (uncached parse)")
+    print(f"after    : {after:8.1f} ns/roll (compiled plan)")
+    print(f"speedup  : {before / after:8.2f}x  (cache hits={info.hits}, misses={info.misses})")
+
+    print()
+    base = 0.0
+    for label, formula in GRAMMAR:
+        ns = _per_call_ns(roll, (formula,), args.number // 4)
+        base = base or ns
+        print(f"{label:<13}: {ns:8.1f} ns/roll  {ns / base:5.2f}x  {formula}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+통합 이니시 엔진 vs 예전 두 구현 비교.
+
+    python -m benchmarks.bench_initiative [--sizes 10,100,1000,10000] [--tolerance 0.15]
+
+- list   : 예전 core/initiative/__init__.py (리스트 + 선형 탐색, delay 는 맨 뒤로)
+- frozen : 예전 core/initiative/init.py (frozen Actor 를 매번 새로 만듦, return 은 현재 뒤로)
+- back / reinsert : 통합 엔진의 두 보류 정책 (각각 list / frozen 과 비교)
+- compat : core.initiative.init 호환 계층 (frozen 과 비교)
+연산마다 1회당 us 를 출력하고, 통합 쪽이 대응 구현보다 tolerance 넘게 느린 칸이 있으면 exit 1.
+(n=10 은 같은 코드 경로끼리도 10% 안팎 흔들리므로 기본 tolerance 는 15%)
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from benchmarks.suite import Case, measure
+from core.initiative import InitiativeTracker
+from core.initiative import init as compat
+
+
+# ---- 예전 구현 (비교용으로 그대로 옮김) --------------------------------------
+@dataclass(eq=True, frozen=False)
+class _ListActor:
+    name: str
+    init: int
+    delayed: bool = False
+
+
+class _ListTracker:
+    def __init__(self) -> None:
+        self._actors: list[_ListActor] = []
+        self._idx: int = -1
+        self._round: int = 0
+
+    def add(self, name: str, init: int) -> None:
+        self._actors.append(_ListActor(name=name, init=init))
+
+    def start_encounter(self) -> None:
+        self._actors.sort(key=lambda a: (-a.init, a.name))
+        self._round = 1 if self._actors else 0
+        self._idx = 0 if self._actors else -1
+
+    @property
+    def order(self) -> list[_ListActor]:
+        return list(self._actors)
+
+    def current(self) -> _ListActor:
+        return self._actors[self._idx]
+
+    def next_turn(self) -> _ListActor:
+        self._idx += 1
+        if self._idx >= len(self._actors):
+            self._idx = 0
+            self._round += 1
+        return self.current()
+
+    def delay(self, name: str) -> None:
+        idx = next((i for i, a in enumerate(self._actors) if a.name == name), None)
+        if idx is None:
+            raise ValueError(f"Actor not found: {name}")
+        actor = self._actors[idx]
+        actor.delayed = True
+        remove_affects_current = idx <= self._idx
+        self._actors.pop(idx)
+        self._actors.append(actor)
+        if remove_affects_current:
+            self._idx = max(0, self._idx - 1)
+
+    def return_from_delay(self, name: str) -> None:
+        actor = next((a for a in self._actors if a.name == name), None)
+        if actor is None:
+            raise ValueError(f"Actor not found: {name}")
+        actor.delayed = False
+
+
+@dataclass(frozen=True)
+class _FrozenActor:
+    name: str
+    init: int
+    delayed: bool = False
+
+
+class _FrozenTracker:
+    def __init__(self) -> None:
+        self._actors: list[_FrozenActor] = []
+        self._idx: int = -1
+        self.round: int = 0
+        self._started: bool = False
+
+    def add(self, name: str, value: int) -> None:
+        self._actors.append(_FrozenActor(name=name, init=value, delayed=False))
+
+    def start_encounter(self) -> None:
+        self._actors.sort(key=lambda a: (-a.init, a.name))
+        self._idx = 0 if self._actors else -1
+        self.round = 1 if self._actors else 0
+        self._started = True
+
+    @property
+    def order(self) -> list[_FrozenActor]:
+        return list(self._actors)
+
+    def next_turn(self) -> None:
+        if not self._started or not self._actors:
+            return
+        self._idx += 1
+        if self._idx >= len(self._actors):
+            self._idx = 0
+            self.round += 1
+
+    def delay(self, name: str) -> None:
+        for i, a in enumerate(self._actors):
+            if a.name == name:
+                self._actors[i] = _FrozenActor(a.name, a.init, True)
+                break
+
+    def return_from_delay(self, name: str) -> None:
+        for i, a in enumerate(self._actors):
+            if a.name == name and a.delayed:
+                self._actors[i] = _FrozenActor(a.name, a.init, False)
+                actor = self._actors.pop(i)
+                insert_at = min(self._idx + 1, len(self._actors))
+                self._actors.insert(insert_at, actor)
+                break
+
+
+# ---- 케이스 ------------------------------------------------------------------
+IMPLS: dict[str, Callable[[], Any]] = {
+    "list": _ListTracker,
+    "back": InitiativeTracker,
+    "frozen": _FrozenTracker,
+    "reinsert": lambda: InitiativeTracker(delay_policy="reinsert"),
+    "compat": compat.InitiativeTracker,
+}
+# 통합 쪽 -> 비교 대상
+PAIRS = (("back", "list"), ("reinsert", "frozen"), ("compat", "frozen"))
+REPEAT = 9  # 구현별 측정 라운드 수
+OPS = ("add", "start_encounter", "next_turn", "delay", "return_from_delay", "order")
+
+
+def _cases(impl: str, n: int) -> Iterator[tuple[str, Case]]:
+    make = IMPLS[impl]
+    k = min(n, 1_000)
+    reps = max(1, 1_000 // n)  # 작은 n 은 여러 추적기를 돌려 측정 잡음을 줄인다
+    rng = random.Random(n)
+    inits = [rng.randint(1, 30) for _ in range(n)]
+    picks = random.Random(0).sample(range(n), k)
+    names = [f"A{i}" for i in picks]
+    labels = [f"A{i}" for i in range(n)]
+
+    def fresh() -> Any:
+        t = make()
+        for name, init in zip(labels, inits, strict=True):
+            t.add(name, init)
+        return t
+
+    def started() -> Any:
+        t = fresh()
+        t.start_encounter()
+        return t
+
+    def delayed() -> Any:
+        t = started()
+        for name in names:
+            t.delay(name)
+        return t
+
+    def many(build: Callable[[], Any]) -> Callable[[], list[Any]]:
+        return lambda: [build() for _ in range(reps)]
+
+    def add(ts: list[Any]) -> None:
+        for t in ts:
+            for name, init in zip(labels, inits, strict=True):
+                t.add(name, init)
+
+    def start(ts: list[Any]) -> None:
+        for t in ts:
+            t.start_encounter()
+
+    def turns(ts: list[Any]) -> None:
+        for t in ts:
+            for _ in range(k):
+                t.next_turn()
+
+    def delay(ts: list[Any]) -> None:
+        for t in ts:
+            for name in names:
+                t.delay(name)
+
+    def back(ts: list[Any]) -> None:
+        for t in ts:
+            for name in names:
+                t.return_from_delay(name)
+
+    def reads(ts: list[Any]) -> None:
+        for t in ts:
+            for _ in range(k):
+                len(t.order)
+
+    yield "add", Case("add", many(make), add, n * reps, 1)
+    yield "start_encounter", Case("start", many(fresh), start, n * reps, 1)
+    yield "next_turn", Case("next", many(started), turns, k * reps, 1)
+    yield "delay", Case("delay", many(started), delay, k * reps, 1)
+    yield "return_from_delay", Case("return", many(delayed), back, k * reps, 1)
+    yield "order", Case("order", many(started), reads, k * reps, 1)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--sizes", default="10,100,1000,10000")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    slower: list[str] = []
+    print(f"{'n':>6} {'op':<18}" + "".join(f"{impl:>11}" for impl in IMPLS) + "  (us/op)")
+    for n in (int(x) for x in args.sizes.split(",")):
+        cases = {impl: dict(_cases(impl, n)) for impl in IMPLS}
+        table: dict[str, dict[str, float]] = {op: {} for op in OPS}
+        for op in OPS:
+            # 구현을 번갈아 돌리며 best 를 갱신한다 (머신 잡음이 한쪽에 몰리지 않게)
+            for _ in range(REPEAT):
+                for impl in IMPLS:
+                    us = measure(cases[impl][op]) * 1e6
+                    table[op][impl] = min(us, table[op].get(impl, us))
+        for op in OPS:
+            row = table[op]
+            print(f"{n:>6} {op:<18}" + "".join(f"{row[impl]:11.3f}" for impl in IMPLS))
+            for new, old in PAIRS:
+                if row[new] > row[old] * (1 + args.tolerance):
+                    slower.append(f"{op}[{n}] {new} {row[new]:.3f} > {old} {row[old]:.3f}")
+
+    if slower:
+        print("\nslower than the version it replaces:")
+        print("\n".join(f"  {s}" for s in slower))
+        return 1
+    print("\nunified engine is no slower than either previous tracker on every operation")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
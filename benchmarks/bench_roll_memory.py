@@ -0,0 +1,83 @@
+"""
+RollResult 메모리 사용량 비교 (기본 1M 개).
+
+    python -m benchmarks.bench_roll_memory [--count 1000000] [--formula 2d6+3]
+
+- old: dict 서브클래스 + 인스턴스 __dict__ + list 눈 저장 (이전 구현)
+- new: __slots__ + tuple 저장 (현재 core.dice.RollResult)
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from core.dice import RollResult, compile_formula
+
+
+class _LegacyRollResult(dict[str, Any]):
+    # 비교용: 이전 dict 기반 구현을 그대로 옮겨 둔 것
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.setdefault("formula", "")
+        self.setdefault("total", 0)
+        self.setdefault("rolls", [])
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError as e:
+            raise AttributeError(name) from e
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in {"formula", "total", "rolls"}:
+            self[name] = value
+        super().__setattr__(name, value)
+
+
+def _make_old(formula: str, detail: list[int], total: int) -> object:
+    return _LegacyRollResult(
+        formula=formula, total=total, detail=detail, rolls=detail, crit=False, fumble=False
+    )
+
+
+def _make_new(formula: str, detail: list[int], total: int) -> object:
+    return RollResult(formula, total, tuple(detail), False, False)
+
+
+def _measure(make: Callable[[str, list[int], int], object], formula: str, count: int) -> int:
+    plan = compile_formula(formula)
+    rng = random.Random(0)
+    gc.collect()
+    tracemalloc.start()
+    keep = []
+    for _ in range(count):
+        detail = [rng.randint(1, plan.sides) for _ in range(plan.n)]
+        keep.append(make(formula, detail, sum(detail) + plan.modifier))
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return current
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--formula", default="2d6+3")
+    args = parser.parse_args(argv)
+
+    old = _measure(_make_old, args.formula, args.count)
+    new = _measure(_make_new, args.formula, args.count)
+    mib = 1024 * 1024
+    print(f"results  : {args.count:,} x {args.formula}")
+    print(f"old dict : {old / mib:8.1f} MiB ({old / args.count:6.1f} B/result)")
+    print(f"slots    : {new / mib:8.1f} MiB ({new / args.count:6.1f} B/result)")
+    print(f"ratio    : {old / new:8.2f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
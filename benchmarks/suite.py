@@ -0,0 +1,337 @@
+"""
+핫패스 벤치마크 스위트 + 회귀 비교.
+
+    python -m benchmarks.suite run [--quick|--full] [--out benchmarks/baseline.json]
+    python -m benchmarks.suite compare BASELINE CURRENT [--threshold 0.25]
+    python -m benchmarks.suite check [--baseline benchmarks/baseline.json] [--threshold 0.25]
+
+- run    : 모든 케이스를 측정해 JSON(케이스 이름 -> 1회당 초)으로 저장
+- compare: 두 JSON 을 비교해 threshold 를 넘게 느려진 케이스가 있으면 exit 1
+- check  : run 후 곧바로 baseline 과 compare (CI 용)
+측정값은 반복 중 최솟값(best-of-N)을 쓴다. 기계마다 다르므로 baseline 은 같은 기계에서 만든다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from core.dice import compile_formula, roll
+from core.initiative import InitiativeTracker
+from core.log import LogManager
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+ACTOR_SIZES = {"quick": (10, 100, 1_000), "default": (10, 100, 1_000, 10_000)}
+ACTOR_SIZES["full"] = ACTOR_SIZES["default"]
+LOG_SIZES = {
+    "quick": (1_000, 10_000),
+    "default": (1_000, 10_000, 100_000),
+    "full": (1_000, 10_000, 100_000, 1_000_000),
+}
+ROLL_FORMULAS = ("1d20+5", "2d6+3", "4d6kh3", "2d6+1d4+3")
+
+
+@dataclass(frozen=True, slots=True)
+class Case:
+    """
+    벤치마크 케이스 하나.
+    - setup(): 반복마다 새 상태를 만든다 (측정 시간에 포함되지 않음)
+    - run(state): 측정 대상. ops 번의 연산을 수행한다
+    """
+
+    name: str
+    setup: Callable[[], Any]
+    run: Callable[[Any], object]
+    ops: int
+    repeat: int = 5
+
+
+def measure(case: Case) -> float:
+    """연산 1회당 초 (best-of-repeat)."""
+    best = float("inf")
+    for _ in range(case.repeat):
+        state = case.setup()
+        t0 = time.perf_counter()
+        case.run(state)
+        best = min(best, time.perf_counter() - t0)
+    return best / case.ops
+
+
+# ---- cases -------------------------------------------------------------------
+def _dice_cases() -> Iterator[Case]:
+    parse = compile_formula.__wrapped__  # 캐시를 우회한 순수 파싱 비용
+    for formula in ROLL_FORMULAS:
+        yield Case(f"dice.parse[{formula}]", lambda: None, _loop(parse, formula, 2_000), 2_000)
+        yield Case(f"dice.roll[{formula}]", lambda: None, _loop(roll, formula, 5_000), 5_000)
+
+
+def _loop(fn: Callable[[str], object], arg: str, times: int) -> Callable[[Any], None]:
+    def run(_: Any) -> None:
+        for _ in range(times):
+            fn(arg)
+
+    return run
+
+
+def _tracker(n: int, *, started: bool) -> tuple[InitiativeTracker, list[str]]:
+    rng = random.Random(n)
+    t = InitiativeTracker()
+    names = [f"A{i}" for i in range(n)]
+    for name in names:
+        t.add(name, rng.randint(1, 30))
+    if started:
+        t.start_encounter()
+    return t, names
+
+
+def _initiative_cases(sizes: tuple[int, ...]) -> Iterator[Case]:
+    for n in sizes:
+        k = min(n, 1_000)
+
+        def inits(n: int = n) -> list[int]:
+            rng = random.Random(n)
+            return [rng.randint(1, 30) for _ in range(n)]
+
+        def add(state: list[int]) -> None:
+            t = InitiativeTracker()
+            for i, init in enumerate(state):
+                t.add(f"A{i}", init)
+
+        yield Case(f"initiative.add[{n}]", inits, add, n)
+
+        def fresh(n: int = n) -> InitiativeTracker:
+            return _tracker(n, started=False)[0]
+
+        def started(n: int = n) -> InitiativeTracker:
+            return _tracker(n, started=True)[0]
+
+        def start(t: InitiativeTracker) -> None:
+            t.start_encounter()
+
+        def turns(t: InitiativeTracker, k: int = k) -> None:
+            for _ in range(k):
+                t.next_turn()
+
+        def turns_and_reads(t: InitiativeTracker, k: int = k) -> None:
+            # CLI/API 처럼 매 턴 순서를 다시 읽는 패턴
+            for _ in range(k):
+                t.next_turn()
+                len(t.order)
+
+        def specs(n: int = n) -> list[tuple[str, int]]:
+            return [(f"A{i}", i % 5) for i in range(n)]
+
+        def roll_add_start(state: list[tuple[str, int]]) -> None:
+            # roll_all() 이전의 패턴: 굴림/등록을 한 명씩 한 뒤 정렬
+            t = InitiativeTracker()
+            for name, mod in state:
+                t.add(name, roll(f"1d20+{mod}").total)
+            t.start_encounter()
+
+        def roll_all(state: list[tuple[str, int]]) -> None:
+            InitiativeTracker().roll_all(state)
+
+        yield Case(f"initiative.start_encounter[{n}]", fresh, start, 1)
+        yield Case(f"initiative.roll_add_start[{n}]", specs, roll_add_start, n)
+        yield Case(f"initiative.roll_all[{n}]", specs, roll_all, n)
+        yield Case(f"initiative.next_turn[{n}]", started, turns, k)
+        yield Case(f"initiative.next_turn+order[{n}]", started, turns_and_reads, k)
+
+        def delay(state: tuple[InitiativeTracker, list[str]], k: int = k) -> None:
+            t, names = state
+            for name in names[:k]:
+                t.delay(name)
+
+        def shuffled(n: int = n) -> tuple[InitiativeTracker, list[str]]:
+            t, names = _tracker(n, started=True)
+            random.Random(0).shuffle(names)
+            return t, names
+
+        yield Case(f"initiative.delay[{n}]", shuffled, delay, k)
+
+
+def _log_cases(sizes: tuple[int, ...], home: Path) -> Iterator[Case]:
+    # 저널은 세션마다 이어 쓰므로, 반복마다 새 세션 id 를 쓴다
+    sessions = itertools.count()
+
+    def fresh(n: int, background: bool = False) -> LogManager:
+        sid = f"bench{n}-{next(sessions)}"
+        return LogManager(base=home, session_id=sid, background=background)
+
+    def fill(lm: LogManager, n: int) -> LogManager:
+        for i in range(n):
+            if i % 2:
+                lm.append_narrative(f"narrative line {i}")
+            else:
+                data = {"actor": f"A{i % 7}", "formula": "1d20+5", "total": i % 25}
+                lm.append_system("dice", data)
+        lm.close()
+        return lm
+
+    for n in sizes:
+
+        def empty(n: int = n) -> LogManager:
+            return fresh(n)
+
+        def empty_bg(n: int = n) -> LogManager:
+            return fresh(n, background=True)
+
+        def append(lm: LogManager, n: int = n) -> LogManager:
+            return fill(lm, n)
+
+        def filled(n: int = n) -> LogManager:
+            return fill(fresh(n), n)
+
+        def exported(n: int = n) -> LogManager:
+            # 이미 한 번 incremental export 한 세션에 엔트리 100개가 더 붙은 상태
+            lm = fill(fresh(n), n)
+            lm.export("md", incremental=True)
+            return fill(lm, 100)
+
+        def reopen(lm: LogManager) -> None:
+            # 사이드카 인덱스로 재개: 저널 길이와 무관해야 한다
+            LogManager(base=home, session_id=lm.session_id).close()
+
+        def export_each(lm: LogManager) -> None:
+            lm.export_file("md")
+            lm.export_file("json")
+
+        def export_many(lm: LogManager) -> None:
+            lm.export_many(["md", "json"])
+
+        repeat = 3 if n < 1_000_000 else 1
+        yield Case(f"log.append[{n}]", empty, append, n, repeat)
+        # writer 스레드 모드: close() 로 전부 쓸 때까지 포함
+        yield Case(f"log.append_background[{n}]", empty_bg, append, n, repeat)
+        yield Case(f"log.export[md,{n}]", filled, lambda lm: lm.export("md"), n, repeat)
+        yield Case(f"log.export_file[md,{n}]", filled, lambda lm: lm.export_file("md"), n, repeat)
+        yield Case(
+            f"log.export_incremental[md,{n}]",
+            exported,
+            lambda lm: lm.export("md", incremental=True),
+            100,
+            repeat,
+        )
+        yield Case(f"log.reopen[{n}]", filled, reopen, 1, repeat)
+        # 두 형식: 따로 두 번 vs export_many 한 번 (엔트리 한 번 훑기 + 병렬 쓰기)
+        yield Case(f"log.export_each[md+json,{n}]", filled, export_each, n, repeat)
+        yield Case(f"log.export_many[md+json,{n}]", filled, export_many, n, repeat)
+
+
+def build_cases(mode: str, home: Path) -> list[Case]:
+    cases = list(_dice_cases())
+    cases += _initiative_cases(ACTOR_SIZES[mode])
+    cases += _log_cases(LOG_SIZES[mode], home)
+    return cases
+
+
+# ---- run / compare -----------------------------------------------------------
+def run(mode: str = "default", only: str | None = None) -> dict[str, Any]:
+    results: dict[str, float] = {}
+    saved = os.environ.get("TRPG_HOME")
+    with tempfile.TemporaryDirectory(prefix="trpg_bench_") as tmp:
+        os.environ["TRPG_HOME"] = tmp
+        try:
+            for case in build_cases(mode, Path(tmp)):
+                if only and only not in case.name:
+                    continue
+                results[case.name] = measure(case)
+                print(f"{case.name:<40} {results[case.name] * 1e6:12.3f} us/op", flush=True)
+        finally:
+            # 호출한 쪽(테스트, 다른 도구)의 TRPG_HOME 을 되돌린다
+            if saved is None:
+                os.environ.pop("TRPG_HOME", None)
+            else:
+                os.environ["TRPG_HOME"] = saved
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "mode": mode,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> list[str]:
+    """threshold(0.25 = 25%) 이상 느려진 케이스 이름 목록. 한쪽에만 있는 케이스는 무시한다."""
+    regressions: list[str] = []
+    base, cur = baseline["results"], current["results"]
+    for name in sorted(base.keys() & cur.keys()):
+        ratio = cur[name] / base[name] if base[name] else 1.0
+        flag = "REGRESSED" if ratio > 1 + threshold else ""
+        before, after = base[name] * 1e6, cur[name] * 1e6
+        print(f"{name:<40} {before:12.3f} -> {after:12.3f} us  x{ratio:5.2f} {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def _load(path: Path) -> dict[str, Any]:
+    data: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    return data
+
+
+def _save(path: Path, data: dict[str, Any]) -> None:
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_run_options(p: argparse.ArgumentParser) -> None:
+        size = p.add_mutually_exclusive_group()
+        size.add_argument("--quick", dest="mode", action="store_const", const="quick")
+        size.add_argument("--full", dest="mode", action="store_const", const="full")
+        p.set_defaults(mode="default")
+        p.add_argument("--only", default=None, help="이름에 이 문자열이 든 케이스만")
+
+    p_run = sub.add_parser("run")
+    add_run_options(p_run)
+    p_run.add_argument("--out", type=Path, default=DEFAULT_BASELINE)
+
+    p_cmp = sub.add_parser("compare")
+    p_cmp.add_argument("baseline", type=Path)
+    p_cmp.add_argument("current", type=Path)
+    p_cmp.add_argument("--threshold", type=float, default=0.25)
+
+    p_chk = sub.add_parser("check")
+    add_run_options(p_chk)
+    p_chk.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    p_chk.add_argument("--threshold", type=float, default=0.25)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        _save(args.out, run(args.mode, args.only))
+        print(f"saved: {args.out}")
+        return 0
+
+    if args.command == "compare":
+        current = _load(args.current)
+    else:
+        current = run(args.mode, args.only)
+    regressions = compare(_load(args.baseline), current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed beyond {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,11 +2,19 @@ from __future__ import annotations
 
 import asyncio
 import inspect
+import json
+import os
+from pathlib import Path
 from typing import Any, Callable, Mapping, Sequence
 
 import click
 from rich import print
 
+from core.dice import RngStream, roll
+from core.initiative import InitiativeTracker
+from core.log import LogManager
+from core.sim import Combatant, simulate
+
 # 세션은 "필요한 경우에만" 주입
 try:
     from backend.app.db.session import AsyncSessionLocal  # type: ignore[import]
@@ -180,6 +188,133 @@ def ls_cmd() -> None:
     asyncio.run(_run())
 
 
+# ---- 주사위 ------------------------------------------------------------------
+def _rng_state_path(session_id: str) -> Path:
+    raw = os.environ.get("TRPG_HOME")
+    home = Path(raw) if raw else Path.home() / ".trpg"
+    return home / "rng" / f"{session_id}.json"
+
+
+def _load_stream(session_id: str, seed: str | None) -> RngStream:
+    """
+    세션 스트림 복원. CLI 는 호출마다 프로세스가 새로 뜨므로
+    stream_id/offset 을 TRPG_HOME/rng/ 에 저장해 두고 이어서 굴린다.
+    seed 를 주면 해당 시드로 스트림을 새로 시작한다.
+    """
+    path = _rng_state_path(session_id)
+    if seed is not None:
+        return RngStream(seed, session_id)
+    if path.exists():
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return RngStream.from_id(data["stream_id"], int(data["offset"]))
+    return RngStream(os.urandom(32), session_id)
+
+
+def _save_stream(session_id: str, stream: RngStream) -> None:
+    path = _rng_state_path(session_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"stream_id": stream.stream_id, "offset": stream.offset}
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+@cli.command("roll")
+@click.argument("formula")
+@click.option("--as", "actor", default=None, help="굴린 캐릭터 이름")
+@click.option("--session", "session_id", default="default", show_default=True)
+@click.option("--seed", default=None, help="세션 스트림을 이 시드로 (재)시작 — 재현용")
+def roll_cmd(formula: str, actor: str | None, session_id: str, seed: str | None) -> None:
+    """Roll dice from the session's RNG stream and log it (예: "2d6+1", "1d20+5")."""
+    stream = _load_stream(session_id, seed)
+    offset = stream.offset
+    try:
+        result = roll(formula, rng=stream)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="FORMULA") from e
+    _save_stream(session_id, stream)
+
+    out = result.to_dict()
+    out.pop("detail")
+    if actor:
+        out["actor"] = actor
+    # 세션 저널에 dice 이벤트로 남긴다 (스트림 위치도 함께 두어 나중에 replay 로 검증 가능)
+    with LogManager(session_id=session_id) as lm:
+        lm.append_system("dice", {**out, "stream_id": stream.stream_id, "offset": offset})
+    print(out)
+
+
+# ---- 이니시어티브 ------------------------------------------------------------
+@cli.group("init")
+def init_group() -> None:
+    """Initiative tracking."""
+
+
+def _load_init_specs(path: Path) -> list[tuple[str, int]]:
+    """
+    JSON 스펙: {"combatants": [{"name": "Goblin", "init": 2, "count": 6}, ...]}
+    sim 스펙과 같은 형식이며 name/init/count 외의 키는 무시한다.
+    """
+    data = json.loads(path.read_text(encoding="utf-8"))
+    out: list[tuple[str, int]] = []
+    for raw in data.get("combatants", []):
+        count = int(raw.get("count", 1))
+        mod = int(raw.get("init", 0))
+        for i in range(count):
+            out.append((raw["name"] if count == 1 else f"{raw['name']} {i + 1}", mod))
+    return out
+
+
+@init_group.command("roll-all")
+@click.argument("spec", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--session", "session_id", default="default", show_default=True)
+@click.option("--seed", default=None, help="세션 스트림을 이 시드로 (재)시작 — 재현용")
+def init_roll_all_cmd(spec: Path, session_id: str, seed: str | None) -> None:
+    """Roll initiative for everyone in SPEC at once and print the turn order."""
+    stream = _load_stream(session_id, seed)
+    tracker = InitiativeTracker()
+    try:
+        tracker.roll_all(_load_init_specs(spec), rng=stream)
+    except (KeyError, TypeError, ValueError) as e:
+        raise click.ClickException(f"invalid initiative spec: {e}") from e
+    _save_stream(session_id, stream)
+    print([{"name": a.name, "init": a.init} for a in tracker.order])
+
+
+# ---- 시뮬레이션 --------------------------------------------------------------
+def _load_combatants(path: Path) -> list[Combatant]:
+    """
+    JSON 스펙: {"combatants": [{"name": "Goblin", "side": "monsters", "hp": 7, "ac": 15,
+               "attack": 4, "damage": "1d6+2", "init": 2, "count": 6}, ...]}
+    count 가 있으면 "Goblin 1".."Goblin 6" 으로 복제한다.
+    """
+    data = json.loads(path.read_text(encoding="utf-8"))
+    out: list[Combatant] = []
+    for raw in data.get("combatants", []):
+        spec = dict(raw)
+        count = int(spec.pop("count", 1))
+        for i in range(count):
+            name = spec["name"] if count == 1 else f"{spec['name']} {i + 1}"
+            out.append(Combatant(**{**spec, "name": name}))
+    return out
+
+
+@cli.command("sim")
+@click.argument("spec", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--fights", default=1000, show_default=True, type=click.IntRange(min=0))
+@click.option("--workers", default=None, type=int, help="프로세스 수 (기본: CPU 수)")
+@click.option("--seed", default=None, help="재현용 시드")
+@click.option("--max-rounds", default=50, show_default=True, type=int)
+def sim_cmd(
+    spec: Path, fights: int, workers: int | None, seed: str | None, max_rounds: int
+) -> None:
+    """Monte Carlo encounter simulation (승률/라운드/피해 분포 요약)."""
+    try:
+        combatants = _load_combatants(spec)
+        result = simulate(combatants, fights, workers=workers, seed=seed, max_rounds=max_rounds)
+    except (KeyError, TypeError, ValueError) as e:
+        raise click.ClickException(f"invalid simulation spec: {e}") from e
+    print(result.summary())
+
+
 __all__ = ["cli"]
 
 
@@ -1,72 +1,152 @@
 from __future__ import annotations
 
 import random
-import re
-from typing import Any
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, ClassVar
 
-__all__ = ["roll"]
+from .batch import RollBatch, roll_many
+from .formula import DiceTerm, RollPlan, compile_formula
+from .rng import RngStream, drop_stream, stream_for
+from .stats import Distribution, distribution
 
-# NdM(+/-K) 형태만 지원하는 최소 파서
-_DICE_RE = re.compile(r"^\s*(\d+)d(\d+)\s*([+-]\s*\d+)?\s*$", re.IGNORECASE)
+__all__ = [
+    "DiceTerm",
+    "Distribution",
+    "RngStream",
+    "RollBatch",
+    "RollPlan",
+    "RollResult",
+    "compile_formula",
+    "distribution",
+    "drop_stream",
+    "replay",
+    "roll",
+    "roll_many",
+    "stream_for",
+]
 
 
-class RollResult(dict[str, Any]):
-    """dict처럼도, 속성처럼도 접근 가능한 결과 객체
+class RollResult(Mapping[str, Any]):
+    """dict처럼도, 속성처럼도 접근 가능한 불변 결과 객체
 
     - 키/속성 동시 접근 지원: r["total"] 및 r.total 모두 가능
-    - 기본 키 보장: formula, total, rolls
+    - 키: formula, total, detail, rolls, crit, fumble (detail 은 rolls 의 별칭)
+    - __slots__ + tuple 저장이라 굴림 수십만 개를 들고 있어도 가볍다
     """
 
-    def __init__(self, **kwargs: Any) -> None:
-        super().__init__(**kwargs)
-        # 테스트/타입 안정성을 위해 기본 키를 보장
-        self.setdefault("formula", "")
-        self.setdefault("total", 0)
-        self.setdefault("rolls", [])
+    __slots__ = ("crit", "formula", "fumble", "rolls", "total")
+    _KEYS: ClassVar[tuple[str, ...]] = ("formula", "total", "detail", "rolls", "crit", "fumble")
 
-    def __getattr__(self, name: str) -> Any:
-        try:
-            return self[name]
-        except KeyError as e:
-            raise AttributeError(name) from e
+    formula: str
+    total: int
+    rolls: tuple[int, ...]
+    crit: bool
+    fumble: bool
 
+    def __init__(
+        self,
+        formula: str = "",
+        total: int = 0,
+        rolls: Iterable[int] = (),
+        crit: bool = False,
+        fumble: bool = False,
+        *,
+        detail: Iterable[int] | None = None,
+    ) -> None:
+        init = object.__setattr__
+        init(self, "formula", formula)
+        init(self, "total", total)
+        init(self, "rolls", tuple(detail if detail is not None and not rolls else rolls))
+        init(self, "crit", crit)
+        init(self, "fumble", fumble)
+
+    @property
+    def detail(self) -> tuple[int, ...]:
+        return self.rolls
+
+    # --- Mapping 프로토콜 (이전 dict 기반 API 호환) --------------------------
+    def __getitem__(self, key: str) -> Any:
+        if key in self._KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        예전 dict 기반 결과와 같은 모양의 새 dict (rolls/detail 은 list).
+        RollResult 는 dict 가 아니므로 json.dumps 나 수정이 필요하면 이것을 쓴다.
+        """
+        rolls = list(self.rolls)
+        return {
+            "formula": self.formula,
+            "total": self.total,
+            "detail": rolls,
+            "rolls": list(rolls),
+            "crit": self.crit,
+            "fumble": self.fumble,
+        }
+
+    # --- 불변 ----------------------------------------------------------------
     def __setattr__(self, name: str, value: Any) -> None:
-        # 핵심 필드는 dict 키와 동기화
-        if name in {"formula", "total", "rolls"}:
-            self[name] = value
-        # 기본 객체 속성 설정도 유지
-        super().__setattr__(name, value)
+        raise AttributeError(f"RollResult is immutable (cannot set {name!r})")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"RollResult is immutable (cannot delete {name!r})")
+
+    def __repr__(self) -> str:
+        return (
+            f"RollResult(formula={self.formula!r}, total={self.total}, rolls={self.rolls}, "
+            f"crit={self.crit}, fumble={self.fumble})"
+        )
 
 
-def roll(formula: str) -> RollResult:
+def _randint_faces(sides: int, k: int) -> list[int]:
+    randint = random.randint
+    return [randint(1, sides) for _ in range(k)]
+
+
+def roll(formula: str, *, rng: RngStream | None = None) -> RollResult:
     """
     예:
-      roll("2d6+3") -> {"formula":"2d6+3","total":13,"detail":[4,6],"rolls":[4,6],"crit":False,"fumble":False}
+      roll("2d6+3") -> RollResult(formula="2d6+3", total=13, rolls=(4, 6), crit=False, ...)
       roll("1d20")  -> 20/1에 대해 crit/fumble 플래그 설정
+      roll("1d20", rng=stream_for("S1", seed=42))  -> 세션 스트림에서 재현 가능하게 굴림
+      roll("4d6kh3+1d4") -> 확장 문법: rolls 에는 합계에 들어간 눈만 담긴다
     """
-    m = _DICE_RE.match(formula)
-    if not m:
-        raise ValueError(f"Invalid dice formula: {formula!r}")
+    plan = compile_formula(formula)
 
-    n = int(m.group(1))
-    sides = int(m.group(2))
-    mod = int(m.group(3).replace(" ", "")) if m.group(3) else 0
-
-    detail: list[int] = [random.randint(1, sides) for _ in range(n)]
-    total = sum(detail) + mod
+    if plan.evaluate is not None:
+        total, detail = plan.evaluate(rng.faces if rng is not None else _randint_faces)
+    else:
+        sides = plan.sides
+        if rng is not None:
+            detail = tuple(rng.faces(sides, plan.n))
+        else:
+            randint = random.randint
+            detail = tuple([randint(1, sides) for _ in range(plan.n)])
+        total = sum(detail) + plan.modifier
 
     crit = False
     fumble = False
-    if n == 1 and sides == 20:
-        crit = detail[0] == 20
-        fumble = detail[0] == 1
-
-    # rolls = detail 별칭(같은 리스트 객체)로 노출 (테스트 호환)
-    return RollResult(
-        formula=formula,
-        total=total,
-        detail=detail,
-        rolls=detail,
-        crit=crit,
-        fumble=fumble,
-    )
+    if plan.crit is not None and detail:
+        crit = detail[0] == plan.crit
+        fumble = detail[0] == plan.fumble
+
+    # detail 은 rolls 의 별칭 프로퍼티로 노출 (테스트 호환)
+    return RollResult(formula, total, detail, crit, fumble)
+
+
+def replay(formula: str, stream: RngStream | str, offset: int) -> RollResult:
+    """
+    (공식, 스트림, offset) 만으로 과거 굴림을 그대로 재현한다.
+    stream 은 RngStream 또는 stream_id 문자열. 같은 스트림을 여러 번 재현할 때는
+    RngStream 을 넘기면 이미 채워진 버퍼를 재사용한다.
+    """
+    rng = RngStream.from_id(stream, readahead=1) if isinstance(stream, str) else stream
+    rng.seek(offset)
+    return roll(formula, rng=rng)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import random
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from .formula import RollPlan, compile_formula
+from .rng import RngStream
+
+try:  # NumPy 는 선택 의존성: 있으면 벡터 경로, 없으면 stdlib array 경로
+    import numpy as _np
+except ImportError:  # pragma: no cover - 환경에 따라 다름
+    _np = None
+
+__all__ = ["RollBatch", "roll_many"]
+
+
+@dataclass(frozen=True, slots=True)
+class RollBatch:
+    """
+    roll_many() 의 컬럼형 결과.
+    - totals: 굴림별 합계 (길이 count)
+    - dice: 모든 눈을 행 우선(row-major)으로 편 배열 (길이 count * n)
+    - crit_mask/fumble_mask: i 번째 굴림이 crit/fumble 이면 bit i 가 1 (little-endian)
+    totals/dice 는 NumPy 가 있으면 ndarray, 없으면 array.array 이다.
+    """
+
+    formula: str
+    count: int
+    n: int
+    totals: Sequence[int]
+    dice: Sequence[int]
+    crit_mask: bytes
+    fumble_mask: bytes
+
+    def __len__(self) -> int:
+        return self.count
+
+    def detail(self, i: int) -> list[int]:
+        """i 번째 굴림의 개별 눈 (roll() 의 detail 과 같은 형태)."""
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return [int(v) for v in self.dice[i * self.n : (i + 1) * self.n]]
+
+    def is_crit(self, i: int) -> bool:
+        return bool(self.crit_mask[i >> 3] >> (i & 7) & 1)
+
+    def is_fumble(self, i: int) -> bool:
+        return bool(self.fumble_mask[i >> 3] >> (i & 7) & 1)
+
+
+def roll_many(
+    formula: str, count: int, *, seed: int | None = None, rng: RngStream | None = None
+) -> RollBatch:
+    """
+    같은 공식을 count 번 굴린다. 모든 눈을 한 번에 생성하므로 roll() 루프보다 훨씬 싸다.
+      roll_many("1d20+5", 1000).totals  -> 1000개 합계
+    seed 를 주면 재현 가능하다. (NumPy/stdlib 경로는 서로 다른 수열을 낸다)
+    rng 스트림을 주면 백엔드와 무관하게 그 스트림에서 워드를 꺼내 쓴다.
+    """
+    if count < 0:
+        raise ValueError(f"count must be >= 0: {count}")
+    plan = compile_formula(formula)
+    if not plan.simple:
+        # 확장 문법(여러 항/유지/폭발/재굴림)은 굴림마다 눈 개수가 달라 행렬로 담을 수 없다
+        raise ValueError(f"roll_many supports single NdM+K formulas only: {formula!r}")
+    if rng is not None:
+        return _roll_many_words(plan, count, rng.words(count * plan.n))
+    if _np is not None:
+        return _roll_many_numpy(plan, count, seed)
+    source: Any = random.Random(seed) if seed is not None else random
+    return _roll_many_words(plan, count, array("Q", source.randbytes(8 * count * plan.n)))
+
+
+# ---- backends ----------------------------------------------------------------
+def _empty_mask(count: int) -> bytes:
+    return bytes((count + 7) >> 3)
+
+
+def _roll_many_numpy(plan: RollPlan, count: int, seed: int | None) -> RollBatch:
+    assert _np is not None
+    rng = _np.random.default_rng(seed)
+    dice = rng.integers(1, plan.sides + 1, size=(count, plan.n), dtype=_np.int64)
+    totals = dice.sum(axis=1) + plan.modifier
+
+    crit_mask = fumble_mask = _empty_mask(count)
+    if plan.crit is not None and count:
+        first = dice[:, 0]
+        crit_mask = _np.packbits(first == plan.crit, bitorder="little").tobytes()
+        fumble_mask = _np.packbits(first == plan.fumble, bitorder="little").tobytes()
+
+    return RollBatch(
+        formula=plan.formula,
+        count=count,
+        n=plan.n,
+        totals=totals,
+        dice=dice.reshape(-1),
+        crit_mask=crit_mask,
+        fumble_mask=fumble_mask,
+    )
+
+
+def _roll_many_words(plan: RollPlan, count: int, words: array[int]) -> RollBatch:
+    n, sides, mod = plan.n, plan.sides, plan.modifier
+
+    # 64bit 워드를 면 수로 나눈 나머지를 쓴다 (편향 < sides / 2**64)
+    dice = array("q", [w % sides + 1 for w in words])
+
+    if n == 1:
+        totals = array("q", [d + mod for d in dice])
+    else:
+        rows = zip(*[iter(dice)] * n, strict=False)
+        totals = array("q", [sum(r) + mod for r in rows])
+
+    crit_mask = fumble_mask = _empty_mask(count)
+    if plan.crit is not None and count:
+        crits = bytearray(crit_mask)
+        fumbles = bytearray(fumble_mask)
+        for i, d in enumerate(dice):
+            if d == plan.crit:
+                crits[i >> 3] |= 1 << (i & 7)
+            elif d == plan.fumble:
+                fumbles[i >> 3] |= 1 << (i & 7)
+        crit_mask, fumble_mask = bytes(crits), bytes(fumbles)
+
+    return RollBatch(
+        formula=plan.formula,
+        count=count,
+        n=n,
+        totals=totals,
+        dice=dice,
+        crit_mask=crit_mask,
+        fumble_mask=fumble_mask,
+    )
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+__all__ = ["DiceTerm", "RollPlan", "compile_formula"]
+
+# 항 하나: [부호] NdM[수식어...] 또는 [부호] 정수
+#   수식어: khK/kK(높은 K개 유지), klK(낮은 K개 유지), dhK/dlK(높은/낮은 K개 버림),
+#           !(최대 눈이면 추가로 굴려 더함), rV(V 이하 눈을 한 번 다시 굴림)
+_TERM_RE = re.compile(
+    r"\s*([+-])?\s*(?:(\d+)d(\d+)((?:kh\d+|kl\d+|dh\d+|dl\d+|k\d+|!|r\d+)*)|(\d+))\s*",
+    re.IGNORECASE,
+)
+_MOD_RE = re.compile(r"(kh|kl|dh|dl|k|r)(\d+)|(!)", re.IGNORECASE)
+
+# 한 세션에서 쓰이는 공식은 수십 개 수준이므로 넉넉한 상한만 둔다
+_PLAN_CACHE_SIZE = 1024
+# 폭발 주사위가 끝없이 이어지지 않도록 추가 굴림 라운드 상한
+_MAX_EXPLODE = 100
+
+# draw(sides, k) -> 1..sides 눈 k 개 (random 모듈 또는 RngStream.faces)
+Draw = Callable[[int, int], list[int]]
+Evaluate = Callable[[Draw], tuple[int, tuple[int, ...]]]
+
+
+@dataclass(frozen=True, slots=True)
+class DiceTerm:
+    """
+    주사위 항 하나 (예: "4d6kh3" -> n=4, sides=6, keep=3, keep_high=True).
+    sign 이 -1 이면 합계에서 뺀다.
+    """
+
+    n: int
+    sides: int
+    sign: int = 1
+    keep: int | None = None
+    keep_high: bool = True
+    explode: bool = False
+    reroll: int | None = None  # 이 값 이하의 눈을 한 번 다시 굴림
+
+    @property
+    def plain(self) -> bool:
+        return self.keep is None and not self.explode and self.reroll is None
+
+
+@dataclass(frozen=True, slots=True)
+class RollPlan:
+    """
+    파싱이 끝난 주사위 공식 (불변).
+    - terms: 주사위 항들, modifier: 상수항의 합
+    - simple: 단일 NdM±K 항이면 True. 이때만 n, sides 가 공식 전체를 설명하며
+      roll()/roll_many()/distribution() 의 빠른 경로가 이 필드를 쓴다.
+    - crit/fumble: 판정 대상 눈. 첫 주사위 항이 d20 한 개를 남길 때(1d20, 2d20kh1 등)만 20/1
+    - evaluate: 확장 문법용으로 컴파일된 평가 함수 (draw -> (합계, 굴린 눈))
+    """
+
+    formula: str
+    n: int
+    sides: int
+    modifier: int
+    crit: int | None = None
+    fumble: int | None = None
+    terms: tuple[DiceTerm, ...] = ()
+    simple: bool = True
+    evaluate: Evaluate | None = field(default=None, repr=False, compare=False)
+
+
+@lru_cache(maxsize=_PLAN_CACHE_SIZE)
+def compile_formula(formula: str) -> RollPlan:
+    """
+    공식 문자열을 RollPlan 으로 컴파일한다. 같은 문자열은 LRU 캐시에서 재사용.
+      compile_formula("2d6+3")        -> 단일항 빠른 경로 (n=2, sides=6, modifier=3)
+      compile_formula("2d6+1d4+3")    -> 여러 항
+      compile_formula("4d6kh3")       -> 높은 3개 유지 (dl1 과 같음)
+      compile_formula("1d6!+2d8r1")   -> 폭발 / 1 이하 한 번 다시 굴림
+    """
+    terms, modifier = _parse(formula)
+    if not terms:
+        raise ValueError(f"Invalid dice formula: {formula!r}")
+
+    first = terms[0]
+    crit = fumble = None
+    kept = first.n if first.keep is None else first.keep
+    if first.sides == 20 and kept == 1 and first.sign > 0:
+        crit, fumble = 20, 1
+
+    if len(terms) == 1 and first.plain and first.sign > 0:
+        return RollPlan(formula, first.n, first.sides, modifier, crit, fumble, terms)
+    return RollPlan(
+        formula,
+        first.n,
+        first.sides,
+        modifier,
+        crit,
+        fumble,
+        terms,
+        simple=False,
+        evaluate=_compile_evaluate(terms, modifier),
+    )
+
+
+# ---- parsing -----------------------------------------------------------------
+def _parse(formula: str) -> tuple[tuple[DiceTerm, ...], int]:
+    terms: list[DiceTerm] = []
+    modifier = 0
+    pos = 0
+    end = len(formula)
+    while pos < end or not terms and not modifier:
+        m = _TERM_RE.match(formula, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Invalid dice formula: {formula!r}")
+        sign_txt, n_txt, sides_txt, mods, const = m.groups()
+        # 첫 항이 아닌데 부호가 없으면 ("2d6 3") 잘못된 공식
+        if pos and not sign_txt:
+            raise ValueError(f"Invalid dice formula: {formula!r}")
+        sign = -1 if sign_txt == "-" else 1
+        pos = m.end()
+        if const is not None:
+            modifier += sign * int(const)
+            continue
+        terms.append(_make_term(formula, sign, int(n_txt), int(sides_txt), mods or ""))
+    return tuple(terms), modifier
+
+
+def _make_term(formula: str, sign: int, n: int, sides: int, mods: str) -> DiceTerm:
+    if sides < 1:
+        raise ValueError(f"Invalid dice formula: {formula!r}")
+    keep: int | None = None
+    keep_high = True
+    explode = False
+    reroll: int | None = None
+    for m in _MOD_RE.finditer(mods):
+        op, num, bang = m.groups()
+        if bang:
+            explode = True
+            continue
+        op = op.lower()
+        k = int(num)
+        if op in ("k", "kh", "kl"):
+            keep, keep_high = min(k, n), op != "kl"
+        elif op in ("dh", "dl"):
+            keep, keep_high = max(n - k, 0), op == "dl"
+        else:
+            reroll = k
+    if explode and sides == 1:
+        raise ValueError(f"Exploding d1 never stops: {formula!r}")
+    if reroll is not None and reroll >= sides:
+        raise ValueError(f"Reroll threshold must be below the die size: {formula!r}")
+    return DiceTerm(n, sides, sign, keep, keep_high, explode, reroll)
+
+
+# ---- evaluation (closure tree) -----------------------------------------------
+def _compile_term(t: DiceTerm) -> Callable[[Draw], list[int]]:
+    n, sides = t.n, t.sides
+    if t.plain:
+        return lambda draw: draw(sides, n)
+
+    keep, keep_high, explode, reroll = t.keep, t.keep_high, t.explode, t.reroll
+
+    def run(draw: Draw) -> list[int]:
+        dice = draw(sides, n)
+        if reroll is not None:
+            dice = [draw(sides, 1)[0] if d <= reroll else d for d in dice]
+        if explode:
+            pending = dice.count(sides)
+            rounds = 0
+            while pending and rounds < _MAX_EXPLODE:
+                extra = draw(sides, pending)
+                dice.extend(extra)
+                pending = extra.count(sides)
+                rounds += 1
+        if keep is not None:
+            dice = sorted(dice, reverse=keep_high)[:keep]
+        return dice
+
+    return run
+
+
+def _compile_evaluate(terms: tuple[DiceTerm, ...], modifier: int) -> Evaluate:
+    steps = tuple((t.sign, _compile_term(t)) for t in terms)
+
+    def evaluate(draw: Draw) -> tuple[int, tuple[int, ...]]:
+        total = modifier
+        rolls: list[int] = []
+        for sign, step in steps:
+            dice = step(draw)
+            rolls.extend(dice)
+            total += sign * sum(dice)
+        return total, tuple(rolls)
+
+    return evaluate
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import threading
+from array import array
+
+__all__ = ["RngStream", "drop_stream", "stream_for"]
+
+# blake2b 64바이트 다이제스트 하나 = 64bit 워드 8개
+_BLOCK_WORDS = 8
+# 한 번 채울 때 만드는 블록 수 (1024 워드)
+_FILL_BLOCKS = 128
+
+
+def _derive_key(seed: int | str | bytes, name: str) -> bytes:
+    raw = seed if isinstance(seed, bytes) else str(seed).encode("utf-8")
+    h = hashlib.blake2b(digest_size=32, person=b"trpg-rng")
+    h.update(raw)
+    h.update(b"\x00")
+    h.update(name.encode("utf-8"))
+    return h.digest()
+
+
+class RngStream:
+    """
+    세션 단위의 독립 난수 스트림 (카운터 기반, Philox 와 같은 방식).
+    - i 번째 64bit 워드 = blake2b(key, counter=i // 8) 의 i % 8 번째 워드
+    - 같은 seed/name 이면 어느 프로세스·플랫폼에서도 같은 수열
+    - offset(지금까지 소비한 워드 수)만 알면 seek() 으로 O(1) 재현 가능
+    워드는 블록 단위로 미리 채워 두고, 눈 변환은 리스트 컴프리헨션 한 번으로 끝낸다.
+    """
+
+    __slots__ = ("_buf", "_buf_start", "_fill", "_lock", "_pos", "_proto", "stream_id")
+
+    def __init__(
+        self,
+        seed: int | str | bytes,
+        name: str = "",
+        *,
+        key: bytes | None = None,
+        readahead: int = _FILL_BLOCKS,
+    ) -> None:
+        key = key if key is not None else _derive_key(seed, name)
+        self.stream_id: str = key.hex()
+        self._proto = hashlib.blake2b(key=key, digest_size=64)
+        self._fill = max(1, readahead)  # 한 번에 미리 채울 블록 수
+        self._lock = threading.Lock()
+        self._buf: array[int] = array("Q")
+        self._buf_start = 0  # _buf[0] 의 전역 오프셋
+        self._pos = 0  # 다음에 줄 워드의 전역 오프셋
+
+    @classmethod
+    def from_id(
+        cls, stream_id: str, offset: int = 0, *, readahead: int = _FILL_BLOCKS
+    ) -> RngStream:
+        """
+        stream_id(키의 hex) 로 스트림을 복원하고 offset 으로 이동한다.
+        한 번만 재현할 때는 readahead=1 로 필요한 블록만 만든다.
+        """
+        stream = cls(b"", key=bytes.fromhex(stream_id), readahead=readahead)
+        stream.seek(offset)
+        return stream
+
+    # ---- 위치 ----------------------------------------------------------------
+    @property
+    def offset(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int) -> None:
+        if offset < 0:
+            raise ValueError(f"offset must be >= 0: {offset}")
+        with self._lock:
+            self._pos = offset
+
+    # ---- 생성 ----------------------------------------------------------------
+    def _blocks(self, first: int, count: int) -> array[int]:
+        proto = self._proto
+        chunks = []
+        for counter in range(first, first + count):
+            h = proto.copy()
+            h.update(counter.to_bytes(8, "little"))
+            chunks.append(h.digest())
+        words = array("Q", b"".join(chunks))
+        if sys.byteorder != "little":  # pragma: no cover - 빅엔디언 플랫폼
+            words.byteswap()
+        return words
+
+    def _take(self, k: int) -> array[int]:
+        # 호출자가 락을 잡고 있다
+        start = self._pos - self._buf_start
+        if start < 0 or start + k > len(self._buf):
+            first_block = self._pos // _BLOCK_WORDS
+            nblocks = max(self._fill, (self._pos % _BLOCK_WORDS + k) // _BLOCK_WORDS + 1)
+            self._buf = self._blocks(first_block, nblocks)
+            self._buf_start = first_block * _BLOCK_WORDS
+            start = self._pos - self._buf_start
+        self._pos += k
+        return self._buf[start : start + k]
+
+    def words(self, k: int) -> array[int]:
+        """64bit 원시 워드 k 개."""
+        with self._lock:
+            return self._take(k)
+
+    def faces(self, sides: int, k: int) -> list[int]:
+        """1..sides 눈 k 개 (편향 < sides / 2**64)."""
+        with self._lock:
+            words = self._take(k)
+        return [w % sides + 1 for w in words]
+
+
+# ---- 세션별 스트림 레지스트리 ------------------------------------------------
+_STREAMS: dict[str, RngStream] = {}
+_STREAMS_LOCK = threading.Lock()
+
+
+def stream_for(session_id: str | int, seed: int | str | bytes | None = None) -> RngStream:
+    """
+    세션 id 별로 하나의 스트림을 돌려준다 (없으면 생성).
+    seed 를 생략하면 OS 엔트로피로 새 스트림을 만든다. 이미 있으면 seed 는 무시된다.
+    """
+    sid = str(session_id)
+    with _STREAMS_LOCK:
+        stream = _STREAMS.get(sid)
+        if stream is None:
+            stream = RngStream(seed if seed is not None else os.urandom(32), sid)
+            _STREAMS[sid] = stream
+        return stream
+
+
+def drop_stream(session_id: str | int) -> None:
+    """세션 종료 시 레지스트리에서 스트림을 제거한다."""
+    with _STREAMS_LOCK:
+        _STREAMS.pop(str(session_id), None)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from fractions import Fraction
+from functools import lru_cache
+from itertools import accumulate, product
+
+from .formula import DiceTerm, RollPlan, compile_formula
+
+__all__ = ["Distribution", "distribution"]
+
+# 정확 계산 상한: 인코딩된 다항식이 이 비트 수를 넘으면 거부 (대략 1MB)
+_MAX_BITS = 1 << 23
+# 유지/버림(kh/kl) 항은 전수 열거하므로 경우의 수 상한
+_MAX_ENUM = 1 << 18
+
+
+@dataclass(frozen=True, slots=True)
+class Distribution:
+    """
+    주사위 공식의 정확한 확률분포.
+    - counts[k]: 합계가 low + k 가 되는 경우의 수
+    - outcomes: 전체 경우의 수 (단일항이면 sides ** n)
+    모든 질의는 미리 계산된 누적합으로 O(1) 또는 O(log n) 이다.
+    """
+
+    formula: str
+    low: int
+    counts: tuple[int, ...]
+    outcomes: int
+    mean: float
+    variance: float
+    _cumulative: tuple[int, ...] = field(repr=False, compare=False)
+
+    @property
+    def high(self) -> int:
+        return self.low + len(self.counts) - 1
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def pmf(self) -> dict[int, float]:
+        """합계 -> 확률."""
+        o = self.outcomes
+        return {self.low + k: c / o for k, c in enumerate(self.counts) if c}
+
+    def probability(self, total: int) -> float:
+        """P(합계 == total)"""
+        k = total - self.low
+        if 0 <= k < len(self.counts):
+            return self.counts[k] / self.outcomes
+        return 0.0
+
+    def prob_at_most(self, target: int) -> float:
+        """P(합계 <= target)"""
+        k = target - self.low
+        if k < 0:
+            return 0.0
+        if k >= len(self.counts):
+            return 1.0
+        return self._cumulative[k] / self.outcomes
+
+    def prob_at_least(self, target: int) -> float:
+        """P(합계 >= target) — "3d6+4 로 15 이상" 같은 질문용."""
+        return 1.0 - self.prob_at_most(target - 1)
+
+    def percentile(self, p: float) -> int:
+        """P(합계 <= t) >= p 를 만족하는 가장 작은 t (p 는 0~1)."""
+        if not 0.0 <= p <= 1.0:
+            raise ValueError(f"percentile must be within [0, 1]: {p}")
+        need = math.ceil(Fraction(p) * self.outcomes)
+        return self.low + bisect_left(self._cumulative, need)
+
+
+def distribution(formula: str) -> Distribution:
+    """
+    공식의 정확한 분포를 반환한다. 컴파일된 공식 단위로 캐시되므로 반복 질의가 싸다.
+      distribution("3d6+4").prob_at_least(15)  -> 0.5
+    """
+    return _distribution(compile_formula(formula))
+
+
+@lru_cache(maxsize=256)
+def _distribution(plan: RollPlan) -> Distribution:
+    # 항별 분포를 구해 차례로 컨볼루션한다 (뺄셈 항은 좌우를 뒤집어 더한다)
+    low = plan.modifier
+    counts: tuple[int, ...] = (1,)
+    outcomes = 1
+    for term in plan.terms:
+        t_low, t_counts, t_outcomes = _term_counts(plan.formula, term)
+        if term.sign < 0:
+            t_low = -(t_low + len(t_counts) - 1)
+            t_counts = t_counts[::-1]
+        counts = _convolve(counts, outcomes, t_counts, t_outcomes)
+        low += t_low
+        outcomes *= t_outcomes
+
+    # 경우의 수가 float 범위를 넘을 수 있으므로 모멘트는 정수로 모은 뒤 나눈다
+    s1 = s2 = 0
+    for k, c in enumerate(counts):
+        s1 += k * c
+        s2 += k * k * c
+    mean = low + s1 / outcomes
+    variance = float(Fraction(s2 * outcomes - s1 * s1, outcomes * outcomes))
+
+    return Distribution(
+        formula=plan.formula,
+        low=low,
+        counts=counts,
+        outcomes=outcomes,
+        mean=mean,
+        variance=variance,
+        _cumulative=tuple(accumulate(counts)),
+    )
+
+
+def _term_counts(formula: str, t: DiceTerm) -> tuple[int, tuple[int, ...], int]:
+    """항 하나의 (최소 합, 계수, 전체 경우의 수)."""
+    if t.explode:
+        raise ValueError(f"Exploding dice have no finite exact distribution: {formula!r}")
+
+    # 눈별 가중치: rV 는 V 이하 눈을 한 번 다시 굴리므로 sides**2 경우로 센다
+    if t.reroll is None:
+        face = (1,) * t.sides
+    else:
+        face = tuple(t.reroll + (t.sides if f > t.reroll else 0) for f in range(1, t.sides + 1))
+    per_die = sum(face)
+
+    if t.keep is None:
+        return t.n, _power_counts(formula, face, t.n), per_die**t.n
+    return _keep_counts(formula, t, face) + (per_die**t.n,)
+
+
+def _keep_counts(formula: str, t: DiceTerm, face: tuple[int, ...]) -> tuple[int, tuple[int, ...]]:
+    # 유지/버림은 순서 통계라 닫힌 형태가 없어, 작은 풀만 전수 열거한다
+    if t.sides**t.n > _MAX_ENUM:
+        raise ValueError(f"Keep/drop pool too large for an exact distribution: {formula!r}")
+    keep = t.keep or 0
+    sums: dict[int, int] = {}
+    for combo in product(range(1, t.sides + 1), repeat=t.n):
+        weight = 1
+        for f in combo:
+            weight *= face[f - 1]
+        kept = sorted(combo, reverse=t.keep_high)[:keep]
+        total = sum(kept)
+        sums[total] = sums.get(total, 0) + weight
+    low = min(sums)
+    return low, tuple(sums.get(v, 0) for v in range(low, max(sums) + 1))
+
+
+def _convolve(
+    a: tuple[int, ...], a_total: int, b: tuple[int, ...], b_total: int
+) -> tuple[int, ...]:
+    """두 계수열의 곱 (Kronecker substitution, 계수 상한은 a_total * b_total)."""
+    if len(a) == 1 and a[0] == 1:
+        return b
+    width = _width(a_total * b_total, len(a) + len(b) - 1)
+    return _decode(_encode(a, width) * _encode(b, width), len(a) + len(b) - 1, width)
+
+
+def _power_counts(formula: str, face: tuple[int, ...], n: int) -> tuple[int, ...]:
+    """
+    (face[0] x^0 + ... + face[s-1] x^(s-1))^n 의 계수.
+    다항식을 큰 정수 하나로 인코딩(Kronecker substitution)한 뒤 pow() 로 거듭제곱한다.
+    곱셈은 CPython 의 Karatsuba 가, 거듭제곱은 repeated squaring 이 처리하므로
+    100d6 같은 큰 풀도 순수 파이썬 컨볼루션보다 훨씬 빠르다.
+    """
+    if n == 0:
+        return (1,)
+    if len(face) == 1:
+        return (face[0] ** n,)
+
+    length = n * (len(face) - 1) + 1
+    try:
+        width = _width(sum(face) ** n, length)
+    except ValueError:
+        raise ValueError(f"Formula too large for an exact distribution: {formula!r}") from None
+    return _decode(pow(_encode(face, width), n), length, width)
+
+
+def _width(max_coeff: int, length: int) -> int:
+    # 계수 최대값이 칸을 넘치지 않도록 바이트 단위 폭을 잡는다
+    width = (max_coeff.bit_length() + 8) // 8
+    if length * width * 8 > _MAX_BITS:
+        raise ValueError("Formula too large for an exact distribution")
+    return width
+
+
+def _encode(coeffs: tuple[int, ...], width: int) -> int:
+    return int.from_bytes(b"".join(c.to_bytes(width, "little") for c in coeffs), "little")
+
+
+def _decode(value: int, length: int, width: int) -> tuple[int, ...]:
+    raw = value.to_bytes(length * width, "little")
+    return tuple(
+        int.from_bytes(raw[i : i + width], "little") for i in range(0, length * width, width)
+    )
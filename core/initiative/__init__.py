@@ -1,45 +1,249 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Literal
 
-__all__ = ["InitiativeTracker", "Tracker", "Actor"]
+from core.dice import RngStream, roll_many
 
+__all__ = [
+    "InitiativeTracker",
+    "Tracker",
+    "Actor",
+    "ActorGroup",
+    "DelayPolicy",
+    "TrackerHistory",
+]
 
-@dataclass(eq=True, frozen=False)
-class Actor:
+# 보류 정책
+# - "back"    : delay 가 맨 뒤로 보낸다 (현재 차례였다면 다음 액터로), return 은 표시만 해제
+# - "reinsert": delay 는 표시만, return 이 현재 차례 바로 뒤로 다시 끼워 넣는다
+DelayPolicy = Literal["back", "reinsert"]
+
+# start_encounter() 정렬 키 (C 수준 attrgetter 로 두 번의 안정 정렬)
+_BY_NAME = attrgetter("name")
+_BY_INIT = attrgetter("init")
+
+
+class _Node:
+    """
+    순서 연결 리스트 링크. Actor 가 직접 노드 역할을 하므로 등록 때 노드 객체를 따로 만들지 않는다.
+    데이터클래스 필드가 아닌 슬롯이라 asdict()/pickle/deepcopy/eq/repr 에는 나타나지 않는다
+    (추적기에 들어갈 때 채워지며 그 전에는 비어 있다).
+    """
+
+    __slots__ = ("_next", "_prev")
+
+    _prev: Actor
+    _next: Actor
+
+    if TYPE_CHECKING:
+        # mypy 의 dataclass(slots=True) 는 상속한 슬롯을 빼고 계산해 링크 대입을 오류로 본다.
+        # 런타임에는 정의하지 않는다 (대입 경로를 느리게 하지 않도록)
+        def __setattr__(self, name: str, value: Any) -> None: ...
+
+    # pickle/copy 는 필드만 담는다 (링크를 따라가면 인카운터 전체를 복사하게 된다)
+    def __getstate__(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, f.name) for f in fields(self))  # type: ignore[arg-type]
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        for f, value in zip(fields(self), state, strict=True):  # type: ignore[arg-type]
+            object.__setattr__(self, f.name, value)
+
+
+@dataclass(eq=True, frozen=False, slots=True)
+class Actor(_Node):
     name: str
     init: int
     delayed: bool = False
+    hp: int | None = None
+
+
+@dataclass(eq=False, slots=True)
+class ActorGroup(Actor):
+    """
+    같은 이니시로 한 턴 슬롯을 공유하는 하수인 묶음 (order/current() 에는 Actor 하나로 보임).
+    - 멤버 이름은 "<name> <번호>" (번호는 1부터, 분리/제거 후에도 바뀌지 않음)
+    - member_ids/member_hp: 멤버 번호(오름차순)와 HP 를 담은 compact array (멤버당 8 bytes)
+    """
+
+    member_ids: array[int] = field(default_factory=lambda: array("I"))
+    member_hp: array[int] = field(default_factory=lambda: array("i"))
+
+    @property
+    def count(self) -> int:
+        return len(self.member_ids)
+
+    @property
+    def members(self) -> list[str]:
+        return [f"{self.name} {i}" for i in self.member_ids]
+
+    def index_of(self, number: int) -> int:
+        """멤버 번호 -> 배열 위치 (없으면 ValueError). 번호가 정렬돼 있으므로 O(log n)."""
+        i = bisect_left(self.member_ids, number)
+        if i == len(self.member_ids) or self.member_ids[i] != number:
+            raise ValueError(f"No member {number} in group {self.name}")
+        return i
+
+    def split(self, number: int) -> Actor:
+        """멤버 하나를 묶음에서 떼어 개별 Actor 로 만든다."""
+        i = self.index_of(number)
+        hp = self.member_hp[i]
+        del self.member_ids[i]
+        del self.member_hp[i]
+        return Actor(f"{self.name} {number}", self.init, False, hp)
 
 
 class InitiativeTracker:
     """
     간단한 이니시 추적기:
-    - add(name, init): 참가자 추가
+    - InitiativeTracker(delay_policy="back"|"reinsert"): 보류 정책 선택 (DelayPolicy 참고)
+    - add(name, init): 참가자 추가 (이름은 고유해야 함)
+    - add_group(name, init, count, hp): 하수인 묶음 추가 (한 턴 슬롯, 멤버는 "name 1".."name N")
     - start_encounter(): 정렬하고 라운드 1 시작
+    - roll_all(specs): (이름, 보정) 전원을 한 번에 굴려 등록하고 시작
     - current: 현재 차례의 Actor (항상 Actor 반환)
-    - order: 현재 라운드의 순서(리스트) 프로퍼티
+    - order: 현재 라운드의 순서 (읽기 전용 튜플 스냅샷, 다음 변경 전까지 같은 객체를 재사용)
+    - version: 순서/보류 상태가 바뀔 때마다 증가 (턴 진행은 round/current 로 확인)
     - next_turn(): 다음 차례로 진행 (리턴값: 진행 후의 current)
     - next(): 테스트 호환용 별칭 (next_turn() 래핑)
-    - delay(name): 해당 액터를 지연 상태로 표시하고 턴 순서의 맨 뒤로 보냄
-    - return_from_delay(name): 지연 해제 (현 순서 유지)
+    - delay(name): 해당 액터를 지연 상태로 표시 (묶음 멤버면 개별 Actor 로 분리 후 보류)
+      "back" 정책이면 턴 순서의 맨 뒤로 보냄 (현재 차례였다면 바로 다음 액터가 현재가 됨)
+    - return_from_delay(name): 지연 해제
+      "back" 정책이면 현 순서 유지, "reinsert" 정책이면 현재 차례 바로 뒤로 재삽입
+    - remove(name): 참가자 제거 (묶음 멤버면 그 멤버만 빠지고, 빈 묶음은 순서에서 제거)
     - round: 현재 라운드 번호 프로퍼티
+
+    순서는 센티널을 둔 원형 이중 연결 리스트(Actor 가 곧 노드) + 이름 색인으로 관리하므로
+    add/delay/return_from_delay/remove/next_turn 은 모두 O(1) 이고,
+    start_encounter() 의 정렬만 O(n log n) 이다.
     """
 
-    def __init__(self) -> None:
-        self._actors: list[Actor] = []
-        self._idx: int = -1  # current index
+    def __init__(self, *, delay_policy: DelayPolicy = "back") -> None:
+        if delay_policy not in ("back", "reinsert"):
+            raise ValueError(f"Unknown delay policy: {delay_policy!r}")
+        self.delay_policy: DelayPolicy = delay_policy
+        # 센티널: head._next 가 첫 액터, head._prev 가 마지막 액터
+        head = self._head = Actor("", 0)
+        head._prev = head._next = head
+        self._nodes: dict[str, Actor] = {}
+        self._cur: Actor | None = None  # 현재 차례
         self._round: int = 0
+        self._version: int = 0
+        self._order: tuple[Actor, ...] = ()  # order 스냅샷 캐시
+        self._order_at: int = 0  # 캐시를 만든 시점의 version
+
+    @classmethod
+    def from_state(
+        cls,
+        order: Iterable[tuple[str, int, bool]],
+        current: str | None = None,
+        round_: int = 0,
+        delay_policy: DelayPolicy = "back",
+    ) -> InitiativeTracker:
+        """
+        저장된 상태에서 복원한다 (정렬은 다시 하지 않음).
+        - order: 순서대로 (이름, 이니시, 보류 여부)
+        - current: 현재 차례 이름 (None 이면 시작 전)
+        - delay_policy: 저장 당시의 보류 정책 (to_state() 가 함께 돌려준다)
+        """
+        t = cls(delay_policy=delay_policy)
+        for name, init, delayed in order:
+            t.add(name, init)
+            t._nodes[name].delayed = delayed
+        t._set_cursor(current, round_)
+        return t
+
+    def to_state(self) -> tuple[list[tuple[str, int, bool]], str | None, int, DelayPolicy]:
+        """
+        from_state(*state) 로 되돌릴 수 있는 (순서, 현재 차례 이름, 라운드, 보류 정책).
+        묶음(ActorGroup) 은 (이름, 이니시, 보류 여부) 로 표현할 수 없어 TypeError.
+        """
+        order: list[tuple[str, int, bool]] = []
+        for actor in self.order:
+            if isinstance(actor, ActorGroup):
+                raise TypeError(f"Actor groups cannot be saved as state: {actor.name}")
+            order.append((actor.name, actor.init, actor.delayed))
+        current, round_ = self._cursor()
+        return order, current, round_, self.delay_policy
 
     # ---- 등록/시작 ---------------------------------------------------------
     def add(self, name: str, init: int) -> None:
-        self._actors.append(Actor(name=name, init=init))
+        # 대량 등록 핫패스라 위치 인자로 만들고, 중복 검사와 등록을 dict 연산 한 번으로,
+        # _link_last() 는 인라인한다
+        actor = Actor(name, init)
+        if self._nodes.setdefault(name, actor) is not actor:
+            raise ValueError(f"Actor already exists: {name}")
+        head = self._head
+        last = actor._prev = head._prev
+        last._next = head._prev = actor
+        actor._next = head
+        self._version += 1
+
+    def add_group(
+        self, name: str, init: int, count: int, hp: int | Sequence[int] = 0
+    ) -> ActorGroup:
+        if name in self._nodes:
+            raise ValueError(f"Actor already exists: {name}")
+        if count < 1:
+            raise ValueError(f"Group needs at least one member: {name}")
+        hps = array("i", [hp]) * count if isinstance(hp, int) else array("i", hp)
+        if len(hps) != count:
+            raise ValueError(f"Expected {count} HP values for group {name}, got {len(hps)}")
+        ids = array("I", range(1, count + 1))
+        group = ActorGroup(name=name, init=init, member_ids=ids, member_hp=hps)
+        self._nodes[name] = group
+        self._link_last(group)
+        return group
+
+    def roll_all(
+        self,
+        specs: Iterable[tuple[str, int]],
+        *,
+        rng: RngStream | None = None,
+        seed: int | None = None,
+    ) -> dict[str, int]:
+        """
+        (이름, 이니시 보정) 목록을 한 번에 굴려 등록하고 인카운터를 시작한다.
+        - d20 은 roll_many() 한 번으로 전원 분을 뽑는다 (rng/seed 는 roll_many 와 같음)
+        - 기존 참가자와 합쳐 한 번 정렬해 순서를 만든다 (start_encounter 와 같은 규칙)
+        반환값: 이름 -> 굴린 이니시 값 (d20 + 보정)
+        """
+        specs = list(specs)
+        names = [name for name, _ in specs]
+        dup = next((n for n in names if n in self._nodes), None)
+        if dup is None and len(set(names)) != len(names):
+            dup = next(n for n in names if names.count(n) > 1)
+        if dup is not None:
+            raise ValueError(f"Actor already exists: {dup}")
+
+        batch = roll_many("1d20", len(specs), seed=seed, rng=rng)
+        rolled: dict[str, int] = {}
+        for (name, mod), d20 in zip(specs, batch.totals, strict=True):
+            init = rolled[name] = int(d20) + mod
+            self._nodes[name] = Actor(name, init)  # 링크는 start_encounter() 가 건다
+        self.start_encounter()
+        return rolled
 
     def start_encounter(self) -> None:
         # 높은 이니시어티브 우선, 동률은 이름 사전순
-        self._actors.sort(key=lambda a: (-a.init, a.name))
-        self._round = 1 if self._actors else 0
-        self._idx = 0 if self._actors else -1
+        # (이름순 정렬 뒤 이니시 내림차순 안정 정렬 == (-init, name) 정렬)
+        actors = sorted(self._nodes.values(), key=_BY_NAME)
+        actors.sort(key=_BY_INIT, reverse=True)
+        # _relink() 인라인 (작은 인카운터에선 호출 비용도 눈에 띈다)
+        head = prev = self._head
+        for actor in actors:
+            prev._next = actor
+            actor._prev = prev
+            prev = actor
+        prev._next = head
+        head._prev = prev
+        self._version += 1
+        self._round = 1 if actors else 0
+        self._cur = actors[0] if actors else None
 
     # ---- 조회 프로퍼티 ------------------------------------------------------
     @property
@@ -47,56 +251,205 @@ class InitiativeTracker:
         return self._round
 
     @property
-    def order(self) -> list[Actor]:
-        # 외부에서 변경 못 하도록 복사 반환
-        return list(self._actors)
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def order(self) -> tuple[Actor, ...]:
+        # 변경이 없으면 같은 튜플을 돌려준다 (매 턴 읽어도 복사 비용 없음)
+        if self._order_at != self._version:
+            self._order = tuple(self._iter_actors())
+            self._order_at = self._version
+        return self._order
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, name: object) -> bool:
+        if name in self._nodes:
+            return True
+        return isinstance(name, str) and self._member(name) is not None
 
     def current(self) -> Actor:
-        if not self._actors or self._idx < 0:
+        if self._cur is None:
             # 테스트 기대치에 맞게 Optional이 아닌 Actor를 반환해야 하므로
             # 빈 상태는 논리 오류로 처리
             raise RuntimeError("No active actor; call start_encounter() after adding actors.")
-        return self._actors[self._idx]
+        return self._cur
 
     # ---- 진행/지연 ----------------------------------------------------------
     def next_turn(self) -> Actor:
-        if not self._actors:
-            raise RuntimeError("No actors to advance.")
-        self._idx += 1
-        if self._idx >= len(self._actors):
-            self._idx = 0
+        cur = self._cur
+        if cur is None:
+            if not self._nodes:
+                raise RuntimeError("No actors to advance.")
+            # 시작 전 진행은 첫 액터를 가리키기만 한다 (라운드는 그대로)
+            cur = self._cur = self._head._next
+            return cur
+        nxt = cur._next
+        if nxt is self._head:
+            nxt = nxt._next
             self._round += 1
-        return self.current()
+        self._cur = nxt
+        return nxt
 
     # 테스트 호환용 별칭
     def next(self) -> Actor:
         return self.next_turn()
 
     def delay(self, name: str) -> None:
-        # name으로 액터 찾기
-        idx = next((i for i, a in enumerate(self._actors) if a.name == name), None)
-        if idx is None:
-            raise ValueError(f"Actor not found: {name}")
+        actor = self._nodes.get(name) or self._node(name, split=True)
+        actor.delayed = True
+        self._version += 1
+        head = self._head
+        nxt = actor._next
+        if self.delay_policy == "reinsert":
+            return  # 표시만
+        if nxt is head:
+            # 이미 맨 뒤: 자리는 그대로, 현재 차례였다면 다음 라운드 첫 액터로 넘긴다
+            if actor is self._cur:
+                self._cur = head._next
+                self._round += 1
+            return
+        if actor is self._cur:
+            # 현재 차례가 보류되면 바로 다음 액터가 현재가 된다
+            self._cur = nxt
+        # 순서 맨 뒤로 보냄 (_unlink + _link_last 인라인)
+        prev = actor._prev
+        prev._next = nxt
+        nxt._prev = prev
+        last = actor._prev = head._prev
+        last._next = head._prev = actor
+        actor._next = head
+
+    def return_from_delay(self, name: str) -> None:
+        actor = self._node(name)
+        if self.delay_policy == "reinsert":
+            if not actor.delayed:
+                return
+            if actor is not self._cur:
+                # 현재 차례 바로 뒤로 (시작 전이면 맨 앞으로)
+                self._unlink(actor)
+                self._link_after(actor, self._cur or self._head)
+        actor.delayed = False
+        self._touch()
 
-        actor = self._actors[idx]
-        actor.delayed = True  # 플래그 설정
+    def remove(self, name: str) -> None:
+        member = None if name in self._nodes else self._member(name)
+        if member is not None:
+            group, number = member
+            group.split(number)
+            self._touch()
+            if group.count:
+                return
+            name = group.name  # 마지막 멤버가 빠지면 묶음 자체를 제거
+        actor = self._node(name)
+        if actor is self._cur:
+            if actor._next is actor._prev:  # 센티널만 남는다: 진행할 턴이 없다
+                self._cur = None
+            else:
+                # 현재 차례가 빠지면 다음 액터로 넘긴다 (마지막이었다면 다음 라운드)
+                self.next_turn()
+        self._unlink(actor)
+        del self._nodes[name]
 
-        # 현재 인덱스 이전의 항목이 빠지면 인덱스 보정
-        remove_affects_current = idx <= self._idx
-        # 순서 맨 뒤로 보냄
-        self._actors.pop(idx)
-        self._actors.append(actor)
+    # ---- 히스토리 지원 (core.initiative.history 전용) ------------------------
+    def _cursor(self) -> tuple[str | None, int]:
+        return (None if self._cur is None else self._cur.name), self._round
 
-        if remove_affects_current:
-            # 현재 포인터가 한 칸 앞당겨진 효과이므로 보정
-            self._idx = max(0, self._idx - 1)
+    def _set_cursor(self, name: str | None, round_: int) -> None:
+        self._cur = None if name is None else self._nodes[name]
+        self._round = round_
 
-    def return_from_delay(self, name: str) -> None:
-        actor = next((a for a in self._actors if a.name == name), None)
-        if actor is None:
+    def _prev_name(self, name: str) -> str | None:
+        prev = self._node(name)._prev
+        return None if prev is self._head else prev.name
+
+    def _place(self, actor: Actor, after: str | None) -> None:
+        """actor 를 after 바로 뒤(None 이면 맨 앞)에 둔다. 이미 있으면 옮긴다."""
+        node = self._nodes.get(actor.name)
+        if node is None:
+            node = self._nodes[actor.name] = actor
+        else:
+            self._unlink(node)
+        self._link_after(node, self._head if after is None else self._nodes[after])
+
+    def _detach(self, name: str) -> None:
+        self._unlink(self._nodes.pop(name))
+
+    def _set_delayed(self, name: str, delayed: bool) -> None:
+        self._node(name).delayed = delayed
+        self._touch()
+
+    def _restore_order(self, names: Sequence[str]) -> None:
+        self._relink([self._nodes[n] for n in names])
+
+    # ---- 내부 --------------------------------------------------------------
+    def _relink(self, actors: Sequence[Actor]) -> None:
+        head = prev = self._head
+        for actor in actors:
+            prev._next = actor
+            actor._prev = prev
+            prev = actor
+        prev._next = head
+        head._prev = prev
+        self._touch()
+
+    def _node(self, name: str, *, split: bool = False) -> Actor:
+        actor = self._nodes.get(name)
+        if actor is not None:
+            return actor
+        member = self._member(name) if split else None
+        if member is None:
             raise ValueError(f"Actor not found: {name}")
-        actor.delayed = False
+        # 묶음 멤버는 개별 Actor 로 떼어 묶음 바로 뒤에 둔다
+        group, number = member
+        actor = self._nodes[name] = group.split(number)
+        self._link_after(actor, group)
+        if not group.count:
+            self.remove(group.name)
+        return actor
+
+    def _member(self, name: str) -> tuple[ActorGroup, int] | None:
+        # "Goblin 3" -> (Goblin 묶음, 3)
+        base, _, number = name.rpartition(" ")
+        group = self._nodes.get(base)
+        if not isinstance(group, ActorGroup) or not number.isdigit():
+            return None
+        try:
+            group.index_of(int(number))
+        except ValueError:
+            return None
+        return group, int(number)
+
+    def _touch(self) -> None:
+        self._version += 1  # order 캐시도 이걸로 무효화된다
+
+    def _link_last(self, actor: Actor) -> None:
+        self._link_after(actor, self._head._prev)
+
+    def _link_after(self, actor: Actor, anchor: Actor) -> None:
+        actor._prev, actor._next = anchor, anchor._next
+        anchor._next._prev = actor
+        anchor._next = actor
+        self._touch()
+
+    def _unlink(self, actor: Actor) -> None:
+        actor._prev._next = actor._next
+        actor._next._prev = actor._prev
+        actor._prev = actor._next = actor
+        self._touch()
+
+    def _iter_actors(self) -> Iterator[Actor]:
+        head = self._head
+        actor = head._next
+        while actor is not head:
+            yield actor
+            actor = actor._next
 
 
 # 테스트에서 Tracker 심볼을 임포트하므로 별칭 제공
 Tracker = InitiativeTracker
+
+# history 는 위 클래스들을 임포트하므로 정의 뒤에서 재노출한다
+from .history import TrackerHistory
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from . import Actor, InitiativeTracker
+
+__all__ = ["TrackerHistory"]
+
+# 이 연산 수마다 상태 스냅샷을 남긴다 (loads() 가 재생할 꼬리 길이의 상한)
+_SNAPSHOT_EVERY = 64
+
+# 연산 코드 (직렬화 형식의 일부이므로 바꾸지 말 것)
+ADD, START, DELAY, RETURN, NEXT, REMOVE = "a", "s", "d", "r", "n", "x"
+
+Op = tuple[Any, ...]  # (코드, *인자)
+
+
+@dataclass(frozen=True, slots=True)
+class _Snapshot:
+    at: int  # 스냅샷 시점까지 적용된 연산 수
+    round: int
+    cur: str | None
+    order: tuple[tuple[str, int, bool], ...]  # (이름, 이니시, 보류 여부)
+
+
+class TrackerHistory:
+    """
+    이니시 추적기 변경을 연산 로그로 기록한다 (event sourcing).
+    - add/start_encounter/delay/return_from_delay/next_turn/remove 를 이 객체로 호출하면
+      연산 (코드, 인자) 와 되돌리기 정보가 함께 쌓인다
+    - undo()/redo(): 역연산/재적용이라 O(1) (start_encounter 취소만 O(n))
+    - snapshot_every 연산마다 상태 스냅샷을 남기고, loads() 는 마지막 스냅샷 + 꼬리 연산만 재생한다
+    - dumps(): 연속된 next 를 묶은 compact JSON (encounters 테이블 저장용)
+    묶음(add_group) 멤버는 기록 대상이 아니다.
+    """
+
+    def __init__(self, *, snapshot_every: int = _SNAPSHOT_EVERY) -> None:
+        if snapshot_every < 1:
+            raise ValueError(f"snapshot_every must be positive: {snapshot_every}")
+        self._tracker = InitiativeTracker()
+        self._ops: list[Op] = []
+        self._undo: list[Op | None] = []  # None: 스냅샷 이전 연산이라 되돌릴 수 없음
+        self._pos = 0  # 적용된 연산 수 (그 뒤는 redo 대상)
+        self._snapshots: list[_Snapshot] = []
+        self._every = snapshot_every
+
+    # ---- 조회 ----------------------------------------------------------------
+    @property
+    def tracker(self) -> InitiativeTracker:
+        """현재 상태의 추적기 (변경은 반드시 이 객체의 메서드로)."""
+        return self._tracker
+
+    @property
+    def position(self) -> int:
+        return self._pos
+
+    @property
+    def can_undo(self) -> bool:
+        return self._pos > 0 and self._undo[self._pos - 1] is not None
+
+    @property
+    def can_redo(self) -> bool:
+        return self._pos < len(self._ops)
+
+    # ---- 기록되는 연산 -------------------------------------------------------
+    def add(self, name: str, init: int) -> None:
+        self._apply((ADD, name, init))
+
+    def start_encounter(self) -> None:
+        self._apply((START,))
+
+    def delay(self, name: str) -> None:
+        self._apply((DELAY, name))
+
+    def return_from_delay(self, name: str) -> None:
+        self._apply((RETURN, name))
+
+    def next_turn(self) -> Actor:
+        self._apply((NEXT,))
+        return self._tracker.current()
+
+    def remove(self, name: str) -> None:
+        self._apply((REMOVE, name))
+
+    # ---- undo / redo ---------------------------------------------------------
+    def undo(self) -> bool:
+        if not self.can_undo:
+            return False
+        self._pos -= 1
+        op, rec = self._ops[self._pos], self._undo[self._pos]
+        assert rec is not None
+        t = self._tracker
+        code = op[0]
+        if code == ADD:
+            t._detach(op[1])
+        elif code == START:
+            t._restore_order(rec[1])
+        elif code == DELAY:
+            t._place(_actor(t, op[1]), rec[1])  # 보류 전 자리로 되돌림
+            t._set_delayed(op[1], rec[2])
+        elif code == RETURN:
+            t._set_delayed(op[1], rec[1])
+        elif code == REMOVE:
+            t._place(rec[2], rec[1])
+        t._set_cursor(*rec[0])
+        return True
+
+    def redo(self) -> bool:
+        if not self.can_redo:
+            return False
+        self._undo[self._pos] = self._execute(self._ops[self._pos])
+        self._pos += 1
+        return True
+
+    # ---- 직렬화 --------------------------------------------------------------
+    def dumps(self) -> str:
+        """적용된 연산 로그 + 마지막 스냅샷을 compact JSON 으로."""
+        doc: dict[str, Any] = {"v": 1, "ops": _pack(self._ops[: self._pos])}
+        snap = next((s for s in reversed(self._snapshots) if s.at <= self._pos), None)
+        if snap is not None:
+            order = [[name, init, int(delayed)] for name, init, delayed in snap.order]
+            doc["snap"] = [snap.at, snap.round, snap.cur, order]
+        return json.dumps(doc, separators=(",", ":"), ensure_ascii=False)
+
+    @classmethod
+    def loads(cls, text: str, *, snapshot_every: int = _SNAPSHOT_EVERY) -> TrackerHistory:
+        """
+        dumps() 결과에서 추적기를 재구성한다.
+        스냅샷이 있으면 그 상태에서 시작해 이후 연산만 재생하므로,
+        스냅샷 이전 연산은 로그에는 남지만 undo 할 수 없다.
+        """
+        doc = json.loads(text)
+        ops = _unpack(doc["ops"])
+        h = cls(snapshot_every=snapshot_every)
+        start = 0
+        if "snap" in doc:
+            at, round_, cur, order = doc["snap"]
+            snap = _Snapshot(at, round_, cur, tuple((n, i, bool(d)) for n, i, d in order))
+            h._restore(snap)
+            h._snapshots.append(snap)
+            start = at
+        h._ops = ops[:start]
+        h._undo = [None] * start
+        h._pos = start
+        for op in ops[start:]:
+            h._apply(op)
+        return h
+
+    # ---- 내부 ----------------------------------------------------------------
+    def _apply(self, op: Op) -> None:
+        undo = self._execute(op)  # 실패하면 로그를 건드리지 않는다
+        del self._ops[self._pos :]
+        del self._undo[self._pos :]
+        while self._snapshots and self._snapshots[-1].at > self._pos:
+            self._snapshots.pop()
+        self._ops.append(op)
+        self._undo.append(undo)
+        self._pos += 1
+        if self._pos % self._every == 0:
+            self._snapshots.append(self._snapshot())
+
+    def _execute(self, op: Op) -> Op:
+        """op 를 적용하고 되돌리기 정보 (직전 커서, 연산별 데이터) 를 돌려준다."""
+        t = self._tracker
+        code = op[0]
+        cursor = t._cursor()
+        if code == ADD:
+            t.add(op[1], op[2])
+            return (cursor,)
+        if code == START:
+            names = tuple(a.name for a in t.order)
+            t.start_encounter()
+            return (cursor, names)
+        if code == DELAY:
+            prev, delayed = t._prev_name(op[1]), _actor(t, op[1]).delayed
+            t.delay(op[1])
+            return (cursor, prev, delayed)
+        if code == RETURN:
+            delayed = _actor(t, op[1]).delayed
+            t.return_from_delay(op[1])
+            return (cursor, delayed)
+        if code == NEXT:
+            t.next_turn()
+            return (cursor,)
+        if code == REMOVE:
+            prev, actor = t._prev_name(op[1]), _actor(t, op[1])
+            t.remove(op[1])
+            return (cursor, prev, actor)
+        raise ValueError(f"Unknown initiative op: {code!r}")
+
+    def _snapshot(self) -> _Snapshot:
+        cur, round_ = self._tracker._cursor()
+        order = tuple((a.name, a.init, a.delayed) for a in self._tracker.order)
+        return _Snapshot(self._pos, round_, cur, order)
+
+    def _restore(self, snap: _Snapshot) -> None:
+        self._tracker = InitiativeTracker.from_state(
+            snap.order, snap.cur, snap.round, self._tracker.delay_policy
+        )
+
+
+def _actor(t: InitiativeTracker, name: str) -> Actor:
+    return t._node(name)
+
+
+def _pack(ops: list[Op]) -> list[list[Any]]:
+    # 연속된 next 는 ["n", 횟수] 하나로 묶는다 (로그 대부분이 턴 진행이므로)
+    out: list[list[Any]] = []
+    for op in ops:
+        if op[0] == NEXT and out and out[-1][0] == NEXT:
+            out[-1][1] += 1
+        elif op[0] == NEXT:
+            out.append([NEXT, 1])
+        else:
+            out.append(list(op))
+    return out
+
+
+def _unpack(packed: list[list[Any]]) -> list[Op]:
+    ops: list[Op] = []
+    for item in packed:
+        if item[0] == NEXT:
+            ops.extend([(NEXT,)] * item[1])
+        else:
+            ops.append(tuple(item))
+    return ops
@@ -1,87 +1,59 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from . import Actor
+from . import InitiativeTracker as _Engine
 
 __all__ = ["InitiativeTracker", "Actor", "Tracker"]
 
 
-@dataclass(frozen=True)
-class Actor:
-    name: str
-    init: int
-    delayed: bool = False
-
-
-class InitiativeTracker:
+class InitiativeTracker(_Engine):
     """
-    테스트들이 기대하는 간단한 이니시 추적기 API:
-      - add(name, value)
+    예전 core.initiative.init API 를 통합 엔진 위에 얹은 호환 계층:
+      - add(name, init)
       - start_encounter()
-      - current() -> Actor
-      - order (property) -> list[Actor]
-      - next_turn()
-      - next()  # next_turn 별칭
-      - delay(name)
-      - return_from_delay(name)
-      - round (int)
+      - current() -> Actor  (시작 전이면 RuntimeError)
+      - order (property)
+      - next_turn() / next()  # 반환값 없음, 시작 전이면 무시
+      - delay(name)           # 표시만 ("reinsert" 정책)
+      - return_from_delay(name)  # 현재 차례 바로 뒤로 재삽입
+      - round (int, 대입 가능)
+    없는 이름의 delay/return_from_delay 는 조용히 무시한다.
+    Actor 는 엔진과 같은 가변 객체이며, 상태가 바뀌어도 새로 만들지 않는다.
     """
 
     def __init__(self) -> None:
-        self._actors: list[Actor] = []
-        self._idx: int = -1
-        self.round: int = 0
-        self._started: bool = False
-
-    # --- 구성 ---
-    def add(self, name: str, value: int) -> None:
-        self._actors.append(Actor(name=name, init=value, delayed=False))
-
-    def start_encounter(self) -> None:
-        self._actors.sort(key=lambda a: (-a.init, a.name))
-        self._idx = 0 if self._actors else -1
-        self.round = 1 if self._actors else 0
-        self._started = True
-
-    # --- 조회 ---
-    def current(self) -> Actor:
-        # 테스트는 current()가 None을 반환하지 않는다고 가정
-        if not self._started or self._idx < 0 or self._idx >= len(self._actors):
-            raise RuntimeError("Encounter not started or no actors.")
-        return self._actors[self._idx]
+        super().__init__(delay_policy="reinsert")
 
     @property
-    def order(self) -> list[Actor]:
-        return list(self._actors)
+    def round(self) -> int:
+        return self._round
+
+    @round.setter
+    def round(self, value: int) -> None:
+        self._round = value
 
-    # --- 진행 ---
-    def next_turn(self) -> None:
-        if not self._started or not self._actors:
+    def next_turn(self) -> None:  # type: ignore[override]
+        # 매 턴 호출되므로 super() 를 거치지 않고 커서만 옮긴다
+        cur = self._cur
+        if cur is None:
             return
-        self._idx += 1
-        if self._idx >= len(self._actors):
-            self._idx = 0
-            self.round += 1
+        nxt = cur._next
+        if nxt is self._head:
+            nxt = nxt._next
+            self._round += 1
+        self._cur = nxt
 
-    def next(self) -> None:
+    def next(self) -> None:  # type: ignore[override]
         """Alias of next_turn()."""
         self.next_turn()
 
-    # --- 지연 ---
     def delay(self, name: str) -> None:
-        for i, a in enumerate(self._actors):
-            if a.name == name:
-                self._actors[i] = Actor(a.name, a.init, True)
-                break
+        if name in self._nodes:
+            super().delay(name)
 
     def return_from_delay(self, name: str) -> None:
-        for i, a in enumerate(self._actors):
-            if a.name == name and a.delayed:
-                self._actors[i] = Actor(a.name, a.init, False)
-                actor = self._actors.pop(i)
-                # 현재 인덱스 다음 자리로 복귀
-                insert_at = min(self._idx + 1, len(self._actors))
-                self._actors.insert(insert_at, actor)
-                break
+        if name in self._nodes:
+            super().return_from_delay(name)
 
 
 # tests/test_smoke.py 에서 Tracker 이름을 임포트하므로 별칭 제공
@@ -1,12 +1,50 @@
 from __future__ import annotations
 
+import json
 import os
+import queue
+import shutil
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any, Literal
+from typing import IO, Any, Literal, Self
 
-__all__ = ["LogManager", "append_markdown"]
+from .reader import _EPOCH, _MICRO, JournalReader, _micros
+from .store import EntryStore, Row
+from .writer import JournalWriter
+
+__all__ = ["FsyncPolicy", "LogManager", "append_markdown"]
+
+# 저널 fsync 정책
+# - "always": 엔트리마다 flush + fsync (가장 안전, 가장 느림)
+# - "batch" : batch_size 엔트리마다, 그리고 flush()/close() 때 flush + fsync
+# - "never" : 쓰기 버퍼가 찰 때만 OS 로 넘기고 fsync 는 하지 않음 (프로세스 크래시까지만 안전)
+FsyncPolicy = Literal["always", "batch", "never"]
+
+ExportFormat = Literal["md", "json"]
+_EXT: dict[str, str] = {"md": "md", "json": "json"}
+
+# 전체 export 에서 렌더러 -> 파일 writer 스레드로 넘기는 조각 묶음 크기와 형식별 큐 길이
+_BATCH = 256
+_QUEUE_BATCHES = 4
+
+# 전체 마크다운 export 의 섹션 (이 순서로 나온다). 엔트리 -> 섹션은 _section() 참고
+_SECTIONS = ("Rolls", "Narrative", "System")
+
+# 롤링 JSON export 의 끝부분. 새 항목은 이걸 잘라내고 덧붙인 뒤 다시 닫는다
+_JSON_TRAILER = "\n  ]\n}\n"
+
+# 저널 줄 인코더/디코더 (json.dumps/loads 의 인자 처리 비용을 매번 치르지 않도록 한 번만 만든다)
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+_decode = json.JSONDecoder().decode
+# 저널 한 줄. to_doc() 를 compact JSON 으로 인코딩한 것과 같은 바이트 (kind/ts 는 이스케이프 불필요)
+_LINE = b'{"kind":"%s","payload":%s,"ts":"%s"}\n'
+_PAYLOAD_AT = len(b'{"kind":"')
 
 
 # ---- helpers -----------------------------------------------------------------
@@ -32,31 +70,103 @@ def append_markdown(path: Path, line: str) -> None:
 
 
 # ---- core --------------------------------------------------------------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class _Entry:
+    """tail 에서 꺼낸 엔트리 한 개 (EntryStore 의 한 행을 펼친 것)."""
+
     kind: Literal["system", "narrative"]
     payload: dict[str, Any]
     ts: datetime
 
+    @classmethod
+    def from_row(cls, row: Row) -> _Entry:
+        kind, _, payload, micros = row
+        doc = _decode(payload.decode("utf-8"))
+        return cls(kind, doc, _EPOCH + micros * _MICRO)  # type: ignore[arg-type]
+
+    def to_doc(self) -> dict[str, Any]:
+        """저널 줄/JSON export 한 항목의 형태."""
+        return {"kind": self.kind, "payload": self.payload, "ts": self.ts.isoformat()}
+
 
 class LogManager:
     """
-    - 메모리 상에 엔트리를 쌓고
+    - 엔트리를 세션 저널(TRPG_HOME/journal/<session_id>.jsonl)에 한 줄씩 덧붙이고
+      메모리에는 최근 tail 개만 남긴다 (세션 길이와 무관하게 메모리 일정)
+    - 같은 세션으로 다시 만들면 기존 저널을 이어 쓴다 (크래시로 잘린 마지막 줄은 버림)
     - export("md") 시 마크다운 파일을 exports/ 아래에 저장하며,
-      동시에 마크다운/JSON 문자열을 반환한다.
+      동시에 마크다운/JSON 문자열을 반환한다. 저널 전체가 대상이다.
     - 생성자 인자는 두 가지 패턴 모두 지원:
         LogManager(session_id="S1")
         LogManager(base=TRPG_HOME, session_id="S1")
+    - 저널 쓰기 옵션 (키워드 전용):
+        fsync: FsyncPolicy 참고 (기본 "batch")
+        batch_size: "batch" 정책의 fsync 간격 / background 모드의 배치 크기 (엔트리 수,
+          기본 256 / background 4096)
+        buffer_size: 파일 쓰기 버퍼 크기 (bytes)
+        tail: 메모리에 남길 최근 엔트리 수
+        background: True 면 인코딩/쓰기/fsync 를 writer 스레드(JournalWriter)가 맡는다.
+          append 는 큐에 넣기만 하고, 배치가 차거나 flush_interval 초가 지나면 한꺼번에 쓰며,
+          큐가 queue_size 에 차면 자리가 날 때까지 기다린다. close() 는 남은 것을 모두 쓴다
     """
 
-    def __init__(self, base: str | Path | None = None, session_id: str | None = None) -> None:
+    def __init__(
+        self,
+        base: str | Path | None = None,
+        session_id: str | None = None,
+        *,
+        fsync: FsyncPolicy = "batch",
+        batch_size: int | None = None,
+        buffer_size: int = 64 * 1024,
+        tail: int = 1024,
+        background: bool = False,
+        flush_interval: float = 0.05,
+        queue_size: int = 65_536,
+    ) -> None:
+        if fsync not in ("always", "batch", "never"):
+            raise ValueError(f"Unknown fsync policy: {fsync!r}")
+        if batch_size is None:
+            batch_size = 4096 if background else 256
+        if batch_size < 1 or tail < 1:
+            raise ValueError("batch_size and tail must be positive")
         base_path = Path(base) if base is not None else _trpg_home()
         self.base: Path = base_path
         # base 가 파일 경로여도 안전하게 디렉토리 만들기
         self.base.mkdir(parents=True, exist_ok=True)
 
         self.session_id: str = session_id or "default"
-        self._entries: list[_Entry] = []
+        self.fsync: FsyncPolicy = fsync
+        self.batch_size = batch_size
+        self._buffer_size = buffer_size
+        self._entries = EntryStore(tail)  # 최근 엔트리만 (열 단위, payload 는 인코딩된 채로)
+        self._count = 0  # 저널 전체 엔트리 수
+        self._unsynced = 0  # 마지막 fsync 이후 쓴 엔트리 수
+        self._fh: IO[bytes] | None = None
+        self.background = background
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self._writer: JournalWriter | None = None
+        # 형식별 렌더링 조각 캐시 (엔트리 번호 -> 조각). tail 범위 안의 엔트리만 담는다
+        self._fragments: dict[str, dict[int, str]] = {"md": {}, "json": {}}
+        self._hwm: dict[str, int] | None = None  # 형식별 롤링 export 에 반영된 엔트리 수
+        self._index: JournalReader | None = None  # 저널 offset 인덱스 (열린 mmap 뷰)
+        self._recover()
+
+    @property
+    def journal_path(self) -> Path:
+        return self.base / "journal" / f"{self.session_id}.jsonl"
+
+    @property
+    def _hwm_path(self) -> Path:
+        return self.base / "journal" / f"{self.session_id}.exports.json"
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def tail(self) -> list[_Entry]:
+        """메모리에 남아 있는 최근 엔트리 (오래된 것부터)."""
+        return [_Entry.from_row(row) for row in self._entries.rows()]
 
     # --- append APIs (위치/키워드 모두 허용) -----------------------------------
     def append_system(
@@ -69,7 +179,7 @@ class LogManager:
         """
         e = event or ""
         d = data or {}
-        self._entries.append(_Entry(kind="system", payload={"event": e, "data": d}, ts=_utcnow()))
+        self._append("system", e, {"event": e, "data": d})
 
     def append_narrative(self, text: str | None = None, **_: Any) -> None:
         """
@@ -78,23 +188,138 @@ class LogManager:
         - 키워드 인자: append_narrative(text="전투 개시")
         """
         t = text or ""
-        self._entries.append(_Entry(kind="narrative", payload={"text": t}, ts=_utcnow()))
+        self._append("narrative", "", {"text": t})
+
+    # --- journal ---------------------------------------------------------------
+    def flush(self) -> None:
+        """버퍼를 저널 파일로 내보낸다 ("never" 가 아니면 fsync 까지)."""
+        if self._writer is not None:
+            self._writer.flush()
+        if self._fh is None:
+            return
+        self._fh.flush()
+        if self.fsync != "never" and self._unsynced:
+            os.fsync(self._fh.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        """flush() 후 저널 파일을 닫고 offset 인덱스를 저장한다. 이후 append 하면 다시 연다."""
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            writer.close()  # 큐에 남은 것을 모두 쓴 뒤 돌아온다
+        if self._fh is not None:
+            self.flush()
+            self._fh.close()
+            self._fh = None
+        if self._index is not None or self.journal_path.exists():
+            # 이번에 덧붙인 부분만 색인해 두면 다음에 열 때 저널을 다시 스캔하지 않는다
+            self._sync_index().save()
+            assert self._index is not None
+            self._index.close()
+            self._index = None
+
+    def reader(self) -> JournalReader:
+        """
+        저널을 번호/시간 범위로 바로 찾아 읽는 JournalReader 를 연다 (호출 쪽에서 close).
+        - 지금까지 append 한 것을 먼저 flush 하고 사이드카 인덱스를 갱신해 둔다
+        """
+        self._sync_index().save()
+        return JournalReader(self.journal_path)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
 
     # --- export ----------------------------------------------------------------
     def export(
         self,
-        fmt: Literal["md", "json"] = "md",
+        fmt: ExportFormat = "md",
         *,
         display_title: str | None = None,
+        incremental: bool = False,
         **_: Any,  # CLI 가 예기치 않은 추가 키워드를 넘겨도 무시
     ) -> str:
         """
         - md/json 내보내기 지원
         - 파일을 exports/ 아래에 저장
         - 마크다운/JSON 문자열을 반환 (tests 가 문자열의 내용을 검사)
+        - incremental=True: 지난 incremental export 이후 추가된 엔트리만 렌더링해
+          롤링 파일 exports/<session_id>.<md|json> 에 덧붙이고, 덧붙인 부분만 반환한다
+          (형식별 high-water mark 는 저널 옆 <session_id>.exports.json 에 보관)
+        - incremental=False(기본): 전체를 새 타임스탬프 파일로 다시 내보낸다 (export_file())
+        - 전체 md 는 ## Rolls / ## Narrative / ## System 섹션으로 나뉜다
+          (incremental 롤링 md 는 덧붙이기만 하므로 시간순 목록 그대로)
+        반환 문자열이 필요 없으면 export_file() 을 쓰는 편이 메모리에 유리하다.
+        """
+        if incremental:
+            if fmt not in _EXT:
+                raise ValueError("unsupported format")
+            title = display_title or f"Session {self.session_id}"
+            return self._export_incremental(fmt, title, self._export_dirs())
+        path = self.export_file(fmt, display_title=display_title)
+        # 텍스트 모드로 읽으면 본문 안의 \r 이 바뀌므로 bytes 그대로 디코드
+        return path.read_bytes().decode("utf-8")
+
+    def export_file(self, fmt: ExportFormat = "md", *, display_title: str | None = None) -> Path:
+        """
+        전체를 새 타임스탬프 파일로 내보내고 (메인) 경로를 돌려준다.
+        - 렌더러가 엔트리 조각을 하나씩 내주고 파일에 바로 쓰므로 세션 길이와 무관하게 메모리 일정
+        - TRPG_HOME 미러는 다시 렌더링하지 않고 하드링크 (안 되면 파일 복사 한 번)
+        """
+        return self.export_many((fmt,), display_title=display_title)[fmt]
+
+    def export_many(
+        self, fmts: Iterable[ExportFormat] = ("md", "json"), *, display_title: str | None = None
+    ) -> dict[str, Path]:
+        """
+        여러 형식을 한 번에 전체 export 하고 형식 -> (메인) 경로를 돌려준다.
+        - 엔트리는 한 번만 훑고 (디코드도 한 번) 그 엔트리를 요청한 렌더러 모두에 넘긴다
+        - 모든 파일이 같은 타임스탬프 이름을 쓴다 (<session_id>-<ts>.md / .json)
+        - 형식이 둘 이상이면 파일 쓰기(+ 미러)는 형식별 스레드가 병렬로 맡는다.
+          렌더러와 writer 사이 큐는 몇 묶음으로 제한되므로 메모리는 여전히 일정
         """
+        fmts = list(dict.fromkeys(fmts))
+        if not fmts or any(fmt not in _EXT for fmt in fmts):
+            raise ValueError("unsupported format")
         ts = _utcnow().strftime("%Y%m%d-%H%M%S")
+        outdirs = self._export_dirs()
+        title = display_title or f"Session {self.session_id}"
+        names = [f"{self.session_id}-{ts}.{_EXT[fmt]}" for fmt in fmts]
+        paths: dict[str, Path] = {
+            fmt: outdirs[0] / name for fmt, name in zip(fmts, names, strict=True)
+        }
+        heads = [self._export_head(fmt, title) for fmt in fmts]
+        mirrors = [[outdir / name for outdir in outdirs[1:]] for name in names]
+
+        if len(fmts) == 1:
+            # 형식이 하나면 스레드 없이 바로 쓴다
+            only = ((sections, frags[0]) for sections, frags in self._iter_batches(fmts))
+            _write_export(paths[fmts[0]], fmts[0], heads[0], only, mirrors[0])
+            return paths
 
+        queues: list[queue.Queue[_Batch | None]] = [
+            queue.Queue(maxsize=_QUEUE_BATCHES) for _ in fmts
+        ]
+        with ThreadPoolExecutor(max_workers=len(fmts), thread_name_prefix="export") as pool:
+            futures = [
+                pool.submit(_export_worker, paths[fmt], fmt, head, q, mirror)
+                for fmt, head, q, mirror in zip(fmts, heads, queues, mirrors, strict=True)
+            ]
+            try:
+                for sections, batch in self._iter_batches(fmts):
+                    for q, chunk in zip(queues, batch, strict=True):
+                        q.put((sections, chunk))
+            finally:
+                for q in queues:
+                    q.put(None)
+            for future in futures:
+                future.result()  # writer 쪽 예외를 여기서 다시 올린다
+        return paths
+
+    def _export_dirs(self) -> list[Path]:
+        """[주 저장 위치, (다르면) TRPG_HOME 미러]. 둘 다 만들어 둔다."""
         # 주 저장 위치(인스턴스 기준)
         outdir_main = self.base / "exports"
         outdir_main.mkdir(parents=True, exist_ok=True)
@@ -103,55 +328,358 @@ class LogManager:
         env_home = _trpg_home()
         outdir_env = env_home / "exports"
         outdir_env.mkdir(parents=True, exist_ok=True)
+        return [outdir_main] if outdir_env == outdir_main else [outdir_main, outdir_env]
 
+    # --- internal renderers ----------------------------------------------------
+    def _export_head(self, fmt: str, title: str) -> str:
+        """전체 export 파일의 머리 (md 는 제목, json 은 entries 배열 여는 부분까지)."""
         if fmt == "md":
-            title = display_title or f"Session {self.session_id}"
-            content = self._render_md(title)
-
-            filename = f"{self.session_id}-{ts}.md"
-            # 메인 경로에 저장
-            (outdir_main / filename).write_text(content, encoding="utf-8", newline="\n")
-            # 환경변수 경로가 다르면 미러링 저장
-            if outdir_env != outdir_main:
-                (outdir_env / filename).write_text(content, encoding="utf-8", newline="\n")
-            return content
-
-        if fmt == "json":
-            import json
-
-            payload = [
-                {"kind": e.kind, "payload": e.payload, "ts": e.ts.isoformat()}
-                for e in self._entries
-            ]
-            content = json.dumps(
-                {"session_id": self.session_id, "entries": payload},
-                ensure_ascii=False,
-                indent=2,
-            )
+            return title
+        # json.dumps(..., indent=2) 와 같은 결과를 항목 조각으로 조립한다
+        head = json.dumps(self.session_id, ensure_ascii=False)
+        return f'{{\n  "session_id": {head},\n  "entries": ['
 
-            filename = f"{self.session_id}-{ts}.json"
-            (outdir_main / filename).write_text(content, encoding="utf-8", newline="\n")
-            if outdir_env != outdir_main:
-                (outdir_env / filename).write_text(content, encoding="utf-8", newline="\n")
-            return content
+    def _iter_batches(self, fmts: Sequence[str]) -> Iterator[tuple[list[int], list[list[str]]]]:
+        """
+        _BATCH 엔트리씩 (섹션 번호 목록, 형식별 조각 목록).
+        묶음[k] 는 fmts[k] 의 조각들이고, 섹션 번호는 모든 형식이 함께 쓴다.
+        """
+        rows = self._iter_fragment_rows(fmts)
+        while chunk := list(islice(rows, _BATCH)):
+            sections = [section for section, _ in chunk]
+            yield sections, [[frags[k] for _, frags in chunk] for k in range(len(fmts))]
 
-        raise ValueError("unsupported format")
+    def _iter_fragments(self, fmt: str, start: int = 0) -> Iterator[str]:
+        """start 번째 엔트리부터 끝까지 fmt 조각을 순서대로."""
+        for _, frags in self._iter_fragment_rows([fmt], start):
+            yield frags[0]
 
-    # --- internal renderers ----------------------------------------------------
-    def _render_md(self, title: str) -> str:
-        lines: list[str] = [f"# {title}"]
-        for e in self._entries:
-            if e.kind == "system":
-                event = e.payload.get("event", "")
-                data = e.payload.get("data", {})
-                if event == "dice":
-                    actor = data.get("actor", "-")
-                    formula = data.get("formula", "-")
-                    total = data.get("total", "-")
-                    lines.append(f"- 🎲 **{actor}** rolled `{formula}` → **{total}**")
-                else:
-                    lines.append(f"- system: {event} {data}")
+    def _iter_fragment_rows(
+        self, fmts: Sequence[str], start: int = 0
+    ) -> Iterator[tuple[int, list[str]]]:
+        """
+        start 번째 엔트리부터 끝까지, 엔트리마다 (섹션 번호, fmts 각각의 조각 목록).
+        - 엔트리는 한 번만 읽고 디코드해 모든 렌더러가 함께 쓴다
+        - tail 범위의 엔트리는 조각을 캐시해 다음 export 에서 다시 렌더링하지 않는다
+          (섹션은 tail 의 kind/event 열에서 바로 얻는다)
+        """
+        renders = [_RENDER[fmt] for fmt in fmts]
+        caches = [self._fragments[fmt] for fmt in fmts]
+        with_ts = "json" in fmts
+        first = self._count - len(self._entries)  # tail 첫 엔트리의 번호
+        for cache in caches:
+            while cache and next(iter(cache)) < first:  # tail 밖으로 밀려난 조각 정리
+                del cache[next(iter(cache))]
+        for doc in self._iter_disk_docs(start, first):
+            # _section() 을 인라인 (엔트리마다 도는 경로)
+            if doc["kind"] == "narrative":
+                section = 1
             else:
-                text = e.payload.get("text", "")
-                lines.append(f"- {text}")
-        return "\n".join(lines)
+                section = 0 if doc["payload"].get("event") == "dice" else 2
+            yield section, [render(doc) for render in renders]
+        skip = max(start - first, 0)
+        for i, row in enumerate(self._entries.rows(skip), first + skip):
+            frags = [cache.get(i) for cache in caches]
+            if None in frags:
+                doc = _row_doc(row, with_ts=with_ts)
+                for k, frag in enumerate(frags):
+                    if frag is None:
+                        frags[k] = caches[k][i] = renders[k](doc)
+            yield _section(row[0], row[1]), frags  # type: ignore[misc]
+
+    def _export_incremental(self, fmt: str, title: str, outdirs: list[Path]) -> str:
+        hwm = self._load_hwm()
+        name = f"{self.session_id}.{_EXT[fmt]}"
+        # 롤링 파일이 없으면 처음부터 다시 만든다 (미러는 쓰고 나서 맞춘다)
+        start = hwm.get(fmt, 0) if (outdirs[0] / name).exists() else 0
+        frags = list(self._iter_fragments(fmt, start))
+        path = outdirs[0] / name
+        if fmt == "md":
+            chunk = "".join(f"{frag}\n" for frag in frags)
+            prefix = "" if start else f"# {title}\n"
+            with path.open("a" if start else "w", encoding="utf-8", newline="\n") as f:
+                f.write(prefix + chunk)
+        else:
+            sep = "," if start and frags else ""
+            chunk = sep + "".join(
+                f"\n{frag}" if i == 0 else f",\n{frag}" for i, frag in enumerate(frags)
+            )
+            _append_json(path, self.session_id, chunk, fresh=not start)
+        # 미러가 같은 파일(하드링크)이면 이미 반영됐다
+        for outdir in outdirs[1:]:
+            if not _same_file(path, outdir / name):
+                _mirror(path, outdir / name)
+        hwm[fmt] = self._count
+        self._save_hwm(hwm)
+        return chunk
+
+    def _load_hwm(self) -> dict[str, int]:
+        if self._hwm is None:
+            try:
+                self._hwm = {k: int(v) for k, v in json.loads(self._hwm_path.read_text()).items()}
+            except (OSError, ValueError):
+                self._hwm = {}
+        return self._hwm
+
+    def _save_hwm(self, hwm: dict[str, int]) -> None:
+        self._hwm_path.parent.mkdir(parents=True, exist_ok=True)
+        self._hwm_path.write_text(json.dumps(hwm), encoding="utf-8")
+
+    # --- internal journal ------------------------------------------------------
+    def _append(self, kind: str, event: str, payload: dict[str, Any]) -> None:
+        # payload 는 한 번만 인코딩해 저널 줄과 tail 이 같은 bytes 를 공유한다
+        ts = _utcnow()
+        raw = _encode(payload).encode()
+        line = _LINE % (kind.encode(), raw, ts.isoformat().encode())
+        self._entries.append(kind, event, raw, _micros(ts))
+        self._count += 1
+        if self.background:
+            (self._writer or self._start_writer()).put(line)
+            return
+        fh = self._fh or self._open()
+        fh.write(line)
+        self._unsynced += 1
+        if self.fsync == "always" or (self.fsync == "batch" and self._unsynced >= self.batch_size):
+            self.flush()
+
+    def _open(self) -> IO[bytes]:
+        path = self.journal_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # close() 까지 append 에 계속 쓰는 핸들이라 with 로 감쌀 수 없다
+        self._fh = open(path, "ab", buffering=self._buffer_size)  # noqa: SIM115
+        return self._fh
+
+    def _start_writer(self) -> JournalWriter:
+        self._writer = JournalWriter(
+            self.journal_path,
+            fsync=self.fsync,
+            batch_size=self.batch_size,
+            buffer_size=self._buffer_size,
+            interval=self.flush_interval,
+            max_queue=self.queue_size,
+        )
+        return self._writer
+
+    def _recover(self) -> None:
+        # 기존 저널을 이어 쓰기 위해 사이드카 인덱스로 엔트리 수를 얻고 마지막 tail 줄만 파싱한다.
+        # 인덱스 이후에 덧붙은 부분만 스캔하므로 저널 길이와 무관하게 바로 열린다.
+        # 크래시로 마지막 줄이 잘렸으면(개행 없음) 그 부분을 잘라낸다.
+        path = self.journal_path
+        if not path.exists():
+            return
+        index = JournalReader(path)
+        if index.end != path.stat().st_size:
+            index.close()  # 매핑을 풀어야 자를 수 있는 플랫폼이 있다
+            with path.open("r+b") as f:
+                f.truncate(index.end)
+            index.refresh()
+        n = len(index)
+        self._count = n
+        for i in range(max(0, n - self._entries.capacity), n):
+            self._entries.append(*_parse_line(index.raw(i)))
+        index.save()
+        self._index = index
+
+    def _sync_index(self) -> JournalReader:
+        """버퍼를 파일로 내보내고 인덱스를 파일 끝까지 늘린다."""
+        self._flush_for_read()
+        if self._index is None:
+            self._index = JournalReader(self.journal_path)
+        else:
+            self._index.refresh()
+        return self._index
+
+    def _flush_for_read(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+        if self._fh is not None:
+            self._fh.flush()  # 읽기용이라 fsync 는 필요 없다
+
+    def _iter_disk_docs(self, start: int, stop: int) -> Iterator[dict[str, Any]]:
+        """
+        저널 start..stop-1 번째 줄을 _Entry 를 거치지 않고 바로 to_doc() 형태 dict 로.
+        - start > 0 이면 offset 인덱스로 그 줄까지 바로 seek (앞부분을 읽지 않는다)
+        - 처음부터 읽을 때는 인덱스를 만들지 않고 순차로 읽는다 (메모리 일정)
+        """
+        if start >= stop:
+            return
+        if start:
+            index = self._sync_index()
+            if start >= len(index):
+                return
+            offset = index.offset(start)
+        else:
+            self._flush_for_read()
+            offset = 0
+        with self.journal_path.open("rb") as f:
+            f.seek(offset)
+            for _, line in zip(range(stop - start), f, strict=False):
+                yield _decode(line.decode("utf-8"))
+
+
+def _row_doc(row: Row, *, with_ts: bool = True) -> dict[str, Any]:
+    # 마크다운 조각은 ts 를 쓰지 않으므로 datetime 복원을 건너뛸 수 있다
+    kind, _, payload, micros = row
+    doc = {"kind": kind, "payload": _decode(payload.decode("utf-8"))}
+    if with_ts:
+        doc["ts"] = (_EPOCH + micros * _MICRO).isoformat()
+    return doc
+
+
+def _parse_line(line: bytes) -> Row:
+    """저널 한 줄 -> EntryStore 행. payload 는 줄에 있던 bytes 를 그대로 잘라 쓴다."""
+    doc = _decode(line.decode("utf-8"))
+    kind, payload = doc["kind"], doc["payload"]
+    at = line.find(b'","payload":', _PAYLOAD_AT) + len(b'","payload":')
+    end = line.rfind(b',"ts":"')
+    raw = line[at:end] if at > _PAYLOAD_AT and end > at else _encode(payload).encode()
+    event = payload.get("event", "") if kind == "system" and isinstance(payload, dict) else ""
+    micros = _micros(datetime.fromisoformat(doc["ts"]))
+    return kind, event, raw, micros
+
+
+def _md_fragment(doc: dict[str, Any]) -> str:
+    payload = doc["payload"]
+    if doc["kind"] == "system":
+        event = payload.get("event", "")
+        data = payload.get("data", {})
+        if event == "dice":
+            actor = data.get("actor", "-")
+            formula = data.get("formula", "-")
+            total = data.get("total", "-")
+            return f"- 🎲 **{actor}** rolled `{formula}` → **{total}**"
+        return f"- system: {event} {data}"
+    text = payload.get("text", "")
+    return f"- {text}"
+
+
+def _json_fragment(doc: dict[str, Any]) -> str:
+    # entries 배열 안 항목 하나 (indent=2 문서의 깊이 2 들여쓰기)
+    return "    " + json.dumps(doc, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+
+
+_RENDER: dict[str, Callable[[dict[str, Any]], str]] = {"md": _md_fragment, "json": _json_fragment}
+
+
+# 전체 export 렌더링 -> 파일 쓰기 단위: (엔트리별 섹션 번호, 한 형식의 조각들)
+_Batch = tuple[list[int], list[str]]
+
+
+def _section(kind: str, event: str) -> int:
+    """_SECTIONS 번호: 주사위 굴림 / 내러티브 / 그 밖의 시스템 이벤트."""
+    if kind == "narrative":
+        return 1
+    return 0 if event == "dice" else 2
+
+
+def _write_md(f: IO[bytes], title: str, batches: Iterable[_Batch]) -> None:
+    """
+    ## Rolls / ## Narrative / ## System 섹션으로 나눈 마크다운.
+    - 엔트리를 한 번만 훑으며 섹션별로 나눈다. Rolls 는 맨 앞 섹션이라 바로 쓰고,
+      나머지는 섹션별 임시 spool 파일에 쌓았다가 끝에서 이어 붙인다 (메모리는 묶음 하나분)
+    - 빈 섹션은 제목도 쓰지 않는다
+    """
+    f.write(f"# {title}".encode())
+    with ExitStack() as stack:
+        outs: list[IO[bytes] | None] = [None] * len(_SECTIONS)
+        for sections, frags in batches:
+            buckets: list[list[str]] = [[] for _ in _SECTIONS]
+            for section, frag in zip(sections, frags, strict=True):
+                buckets[section].append(frag)
+            for section, bucket in enumerate(buckets):
+                if not bucket:
+                    continue
+                out = outs[section]
+                if out is None:
+                    if section == 0:
+                        out = f
+                        f.write(b"\n\n## " + _SECTIONS[0].encode())
+                    else:
+                        out = stack.enter_context(tempfile.TemporaryFile())
+                    outs[section] = out
+                out.write(("\n" + "\n".join(bucket)).encode())
+        for name, spool in zip(_SECTIONS[1:], outs[1:], strict=True):
+            if spool is not None:
+                f.write(b"\n\n## " + name.encode())
+                spool.seek(0)
+                shutil.copyfileobj(spool, f, 1024 * 1024)
+
+
+def _write_json(f: IO[bytes], head: str, batches: Iterable[_Batch]) -> None:
+    f.write(head.encode())
+    lead = "\n"  # 첫 항목 앞 ("[" 다음 줄), 그 뒤로는 ",\n"
+    for _, frags in batches:
+        if frags:
+            f.write((lead + ",\n".join(frags)).encode())
+            lead = ",\n"
+    f.write(b"\n  ]\n}" if lead != "\n" else b"]\n}")
+
+
+_WRITERS: dict[str, Callable[[IO[bytes], str, Iterable[_Batch]], None]] = {
+    "md": _write_md,
+    "json": _write_json,
+}
+
+
+def _write_export(
+    path: Path, fmt: str, head: str, batches: Iterable[_Batch], mirrors: list[Path]
+) -> None:
+    """fmt writer 로 path 에 쓰고 미러를 맞춘다."""
+    with path.open("wb") as f:
+        _WRITERS[fmt](f, head, batches)
+    # 환경변수 경로가 다르면 미러링 저장
+    for mirror in mirrors:
+        _mirror(path, mirror)
+
+
+def _export_worker(
+    path: Path, fmt: str, head: str, q: queue.Queue[_Batch | None], mirrors: list[Path]
+) -> None:
+    # 실패해도 큐를 끝(None)까지 비워 렌더링 쪽 put() 이 막히지 않게 한다
+    done = False
+
+    def batches() -> Iterator[_Batch]:
+        nonlocal done
+        while (batch := q.get()) is not None:
+            yield batch
+        done = True
+
+    try:
+        _write_export(path, fmt, head, batches(), mirrors)
+    finally:
+        while not done and q.get() is not None:
+            pass
+
+
+def _append_json(path: Path, session_id: str, chunk: str, *, fresh: bool) -> None:
+    """롤링 JSON export 에 항목 조각을 덧붙인다 (닫는 부분만 잘라내고 다시 씀)."""
+    if fresh:
+        head = json.dumps(session_id, ensure_ascii=False)
+        text = f'{{\n  "session_id": {head},\n  "entries": [{chunk}{_JSON_TRAILER}'
+        path.write_text(text, encoding="utf-8", newline="\n")
+        return
+    trailer = _JSON_TRAILER.encode("utf-8")
+    with path.open("r+b") as f:
+        f.seek(-len(trailer), os.SEEK_END)
+        if f.read() != trailer:
+            raise ValueError(f"Not a rolling export file: {path}")
+        f.seek(-len(trailer), os.SEEK_END)
+        f.write(chunk.encode("utf-8") + trailer)
+
+
+def _same_file(a: Path, b: Path) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def _mirror(src: Path, dst: Path) -> None:
+    """dst 를 src 의 하드링크로 (다른 파일시스템 등으로 안 되면 복사 한 번)."""
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
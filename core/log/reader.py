@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, Self
+
+__all__ = ["JournalReader", "index_path"]
+
+# 인덱스 파일 헤더: 매직, 엔트리 수, 색인된 바이트 수, 체크포인트 간격, 체크포인트 수
+_MAGIC = b"TRPGIDX1"
+_HEADER = struct.Struct("<8sQQII")
+_EPOCH = datetime(1970, 1, 1)
+_MICRO = timedelta(microseconds=1)
+_TS_KEY = b'"ts":"'
+
+
+def index_path(journal: Path) -> Path:
+    """저널 옆 사이드카 인덱스 경로 (<session>.jsonl -> <session>.idx)."""
+    return journal.with_suffix(".idx")
+
+
+def _micros(ts: datetime) -> int:
+    # 저널은 tz-naive UTC 로 기록한다. aware 값이 오면 UTC 로 맞춘다
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(UTC).replace(tzinfo=None)
+    return (ts - _EPOCH) // _MICRO
+
+
+def _line_micros(line: bytes) -> int:
+    # 저널 줄은 "ts" 가 마지막 필드라 뒤에서 찾으면 payload 를 디코드하지 않아도 된다
+    at = line.rfind(_TS_KEY)
+    if at < 0:
+        return _micros(datetime.fromisoformat(json.loads(line)["ts"]))
+    start = at + len(_TS_KEY)
+    return _micros(datetime.fromisoformat(line[start : line.index(b'"', start)].decode()))
+
+
+class JournalReader:
+    """
+    LogManager 저널(jsonl)을 mmap 으로 여는 읽기 전용 뷰.
+    - 사이드카 인덱스(<session>.idx)에 엔트리 번호 -> 바이트 offset 과
+      checkpoint_every 엔트리마다의 타임스탬프(epoch 마이크로초)를 둔다
+    - reader[i] / raw(i): 번호로 O(1) 접근 (그 줄만 디코드)
+    - span(since, until): 시간 범위 -> 번호 범위. 체크포인트 이진 탐색 후
+      양 끝 구간(최대 checkpoint_every 줄)의 타임스탬프만 읽으므로 O(log n)
+    - refresh(): 인덱스 이후에 덧붙은 부분만 스캔해 인덱스를 늘린다 (열 때 자동 호출)
+    - save(): 인덱스를 원자적으로(임시 파일 + replace) 기록
+    저널 타임스탬프는 append 순서대로 단조 증가한다고 가정한다.
+    끝에 개행 없이 잘린 줄은 색인하지 않는다 (end 가 온전한 줄의 끝 offset).
+    """
+
+    def __init__(self, path: Path, *, checkpoint_every: int = 256) -> None:
+        if checkpoint_every < 1:
+            raise ValueError(f"checkpoint_every must be positive: {checkpoint_every}")
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self._offsets = array("Q")  # 엔트리 i 의 시작 offset
+        self._end = 0  # 색인된 마지막 줄의 끝 offset
+        self._cp_entry = array("Q")  # 체크포인트 엔트리 번호 (오름차순)
+        self._cp_micros = array("q")  # 그 엔트리의 타임스탬프
+        self._saved = 0  # 마지막으로 save() 한 엔트리 수
+        self._mm: mmap.mmap | None = None
+        self._load()
+        self.refresh()
+
+    # ---- 조회 ----------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    @property
+    def end(self) -> int:
+        return self._end
+
+    def offset(self, i: int) -> int:
+        """i 번째 엔트리의 시작 바이트 offset (i == len(self) 이면 색인된 끝)."""
+        return self._offsets[i] if i < len(self._offsets) else self._end
+
+    def raw(self, i: int) -> bytes:
+        """i 번째 엔트리의 줄 (개행 포함)."""
+        n = len(self._offsets)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(f"entry {i} out of range ({n})")
+        stop = self._offsets[i + 1] if i + 1 < n else self._end
+        assert self._mm is not None
+        return self._mm[self._offsets[i] : stop]
+
+    def __getitem__(self, i: int) -> dict[str, Any]:
+        doc: dict[str, Any] = json.loads(self.raw(i))
+        return doc
+
+    def docs(self, start: int = 0, stop: int | None = None) -> Iterator[dict[str, Any]]:
+        """start..stop-1 번째 엔트리를 순서대로 디코드한다 (앞부분은 건너뛰지 않고 바로 seek)."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for i in range(max(start, 0), stop):
+            yield json.loads(self.raw(i))
+
+    def timestamp(self, i: int) -> datetime:
+        return _EPOCH + self._micros_at(i) * _MICRO
+
+    def span(self, since: datetime | None = None, until: datetime | None = None) -> range:
+        """since <= ts < until 인 엔트리 번호 범위 (None 은 열린 끝)."""
+        lo = 0 if since is None else self._first_at_or_after(_micros(since))
+        hi = len(self) if until is None else self._first_at_or_after(_micros(until))
+        return range(lo, max(lo, hi))
+
+    def between(
+        self, since: datetime | None = None, until: datetime | None = None
+    ) -> Iterator[dict[str, Any]]:
+        r = self.span(since, until)
+        return self.docs(r.start, r.stop)
+
+    # ---- 인덱스 유지 ---------------------------------------------------------
+    def refresh(self) -> int:
+        """인덱스 뒤에 덧붙은 온전한 줄을 색인한다. 반환값: 새로 색인한 엔트리 수"""
+        self._remap()
+        mm = self._mm
+        if mm is None:
+            return 0
+        size = len(mm)
+        pos, added = self._end, 0
+        offsets, every = self._offsets, self.checkpoint_every
+        while pos < size:
+            nl = mm.find(b"\n", pos)
+            if nl < 0:
+                break  # 쓰다 만 줄
+            i = len(offsets)
+            offsets.append(pos)
+            if i % every == 0:
+                self._cp_entry.append(i)
+                self._cp_micros.append(_line_micros(mm[pos:nl]))
+            pos = nl + 1
+            added += 1
+        self._end = pos
+        return added
+
+    def save(self) -> None:
+        if self._saved == len(self._offsets) and index_path(self.path).exists():
+            return
+        header = _HEADER.pack(
+            _MAGIC, len(self._offsets), self._end, self.checkpoint_every, len(self._cp_entry)
+        )
+        target = index_path(self.path)
+        tmp = target.with_name(f".{target.name}.tmp")
+        with tmp.open("wb") as f:
+            f.write(header)
+            self._offsets.tofile(f)
+            self._cp_entry.tofile(f)
+            self._cp_micros.tofile(f)
+        os.replace(tmp, target)
+        self._saved = len(self._offsets)
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ---- 내부 ----------------------------------------------------------------
+    def _load(self) -> None:
+        # 인덱스가 없거나 저널과 맞지 않으면(짧아졌거나 간격이 다름) 처음부터 다시 만든다
+        target = index_path(self.path)
+        try:
+            size = self.path.stat().st_size
+            with target.open("rb") as f:
+                magic, n, end, every, cps = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC or every != self.checkpoint_every or end > size:
+                    return
+                offsets, cp_entry, cp_micros = array("Q"), array("Q"), array("q")
+                offsets.fromfile(f, n)
+                cp_entry.fromfile(f, cps)
+                cp_micros.fromfile(f, cps)
+        except (OSError, EOFError, struct.error):
+            return
+        if n and not self._ends_line(end):
+            return
+        self._offsets, self._end = offsets, end
+        self._cp_entry, self._cp_micros = cp_entry, cp_micros
+        self._saved = n
+
+    def _ends_line(self, end: int) -> bool:
+        with self.path.open("rb") as f:
+            f.seek(end - 1)
+            return f.read(1) == b"\n"
+
+    def _remap(self) -> None:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if self._mm is not None and len(self._mm) == size:
+            return
+        self.close()
+        if size:
+            with self.path.open("rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _micros_at(self, i: int) -> int:
+        return _line_micros(self.raw(i))
+
+    def _first_at_or_after(self, micros: int) -> int:
+        # 체크포인트로 구간을 좁힌 뒤 그 구간 안에서만 이진 탐색
+        n = len(self)
+        if not n:
+            return 0
+        k = bisect_left(self._cp_micros, micros)
+        lo = 0 if k == 0 else self._cp_entry[k - 1]
+        hi = self._cp_entry[k] if k < len(self._cp_entry) else n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._micros_at(mid) < micros:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
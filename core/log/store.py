@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+
+__all__ = ["EntryStore"]
+
+# (kind, event, payload JSON bytes, epoch 마이크로초)
+Row = tuple[str, str, bytes, int]
+
+
+class EntryStore:
+    """
+    최근 capacity 개 엔트리를 열(column) 단위로 담는 링 버퍼.
+    - ts: int64 epoch 마이크로초 array
+    - kind / event: 이름 표의 번호 (같은 이름은 한 번만 저장)
+    - payload: 저널에 쓴 그대로의 JSON bytes (꺼낼 때까지 디코드하지 않는다)
+    엔트리마다 datetime/dict 객체를 두지 않으므로 tail 을 크게 잡아도 엔트리당 수십 바이트
+    + payload 길이 정도만 쓴다. 이름 표는 서로 다른 kind/event 수만큼만 자란다.
+    """
+
+    __slots__ = ("_event", "_ids", "_kind", "_names", "_payload", "_start", "_ts", "capacity")
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive: {capacity}")
+        self.capacity = capacity
+        self._ts = array("q")
+        self._kind = array("I")
+        self._event = array("I")
+        self._payload: list[bytes] = []
+        self._start = 0  # 가득 찬 뒤 가장 오래된 칸
+        self._names: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._payload)
+
+    def append(self, kind: str, event: str, payload: bytes, micros: int) -> None:
+        ids = self._ids
+        k = ids.get(kind)
+        if k is None:
+            k = self._intern(kind)
+        e = ids.get(event)
+        if e is None:
+            e = self._intern(event)
+        if len(self._payload) < self.capacity:
+            self._ts.append(micros)
+            self._kind.append(k)
+            self._event.append(e)
+            self._payload.append(payload)
+            return
+        # 가득 찼으면 가장 오래된 칸을 덮어쓴다
+        i = self._start
+        self._ts[i] = micros
+        self._kind[i] = k
+        self._event[i] = e
+        self._payload[i] = payload
+        self._start = (i + 1) % self.capacity
+
+    def row(self, i: int) -> Row:
+        """i 번째(오래된 것부터) 엔트리."""
+        n = len(self._payload)
+        if not 0 <= i < n:
+            raise IndexError(f"entry {i} out of range ({n})")
+        j = (self._start + i) % n
+        names = self._names
+        return names[self._kind[j]], names[self._event[j]], self._payload[j], self._ts[j]
+
+    def rows(self, start: int = 0) -> Iterator[Row]:
+        """start 번째(오래된 것부터)부터 끝까지."""
+        names, kinds, events, payloads, ts = (
+            self._names,
+            self._kind,
+            self._event,
+            self._payload,
+            self._ts,
+        )
+        n = len(payloads)
+        for i in range(max(start, 0), n):
+            j = (self._start + i) % n
+            yield names[kinds[j]], names[events[j]], payloads[j], ts[j]
+
+    def _intern(self, name: str) -> int:
+        i = self._ids[name] = len(self._names)
+        self._names.append(name)
+        return i
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Literal
+
+__all__ = ["JournalWriter"]
+
+
+class JournalWriter:
+    """
+    저널 append 를 백그라운드 스레드로 넘기는 배치 writer.
+    - put(): 호출 쪽은 인코딩된 줄을 큐에 넣기만 한다 (쓰기/fsync 는 writer 스레드가)
+    - writer 는 batch_size 개가 쌓이거나 interval 초가 지나면 모아서 한 번에 쓴다
+    - 큐가 max_queue 에 차면 put() 이 자리가 날 때까지 기다린다 (backpressure)
+    - flush(): 그때까지 넣은 엔트리가 파일에 쓰일 때까지 기다린다
+    - close(): 남은 엔트리를 모두 쓰고 스레드를 멈춘 뒤 파일을 닫는다
+      (close() 를 빼먹어도 인터프리터 종료 시 atexit 으로 닫는다)
+    fsync 는 "never" 가 아니면 배치마다 한 번 ("always" 도 배치 단위로 묶인다)
+    이므로 flush() 가 돌아오면 fsync 까지 끝나 있다.
+    writer 스레드에서 난 예외는 다음 put()/flush()/close() 에서 다시 올린다.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        fsync: Literal["always", "batch", "never"] = "batch",
+        batch_size: int = 4096,
+        interval: float = 0.05,
+        max_queue: int = 65_536,
+        buffer_size: int = 1024 * 1024,
+    ) -> None:
+        if batch_size < 1 or max_queue < batch_size or interval <= 0:
+            raise ValueError("need batch_size >= 1, max_queue >= batch_size and interval > 0")
+        self.path = path
+        self.fsync = fsync
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_queue = max_queue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # writer 스레드가 close() 까지 쥐고 쓰는 핸들이라 with 로 감쌀 수 없다
+        self._fh = open(path, "ab", buffering=buffer_size)  # noqa: SIM115
+        self._queue: deque[bytes] = deque()
+        self._wake = threading.Event()  # writer 깨우기 (배치가 찼거나 flush/close 요청)
+        self._done = threading.Condition()  # 쓰기 진행/큐 자리 알림
+        self._submitted = 0  # put() 된 수 (호출 스레드만 증가)
+        self._written = 0  # 파일에 쓴 수 (writer 만 증가)
+        self._closing = False
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name=f"journal:{path.name}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def closed(self) -> bool:
+        return self._closing
+
+    def put(self, line: bytes) -> None:
+        if self._error is not None:
+            raise RuntimeError("journal writer failed") from self._error
+        if self._closing:
+            raise RuntimeError("journal writer is closed")
+        queue = self._queue
+        if len(queue) >= self.max_queue:
+            self._wait_for_room()
+        queue.append(line)  # deque.append 는 스레드 안전
+        self._submitted += 1
+        if len(queue) >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> None:
+        """지금까지 put() 한 엔트리가 모두 쓰일 때까지 기다린다."""
+        target = self._submitted
+        with self._done:
+            self._wake.set()
+            while self._written < target and self._error is None:
+                self._done.wait()
+        if self._error is not None:
+            raise RuntimeError("journal writer failed") from self._error
+
+    def close(self) -> None:
+        if self._closing:
+            return
+        self._closing = True
+        atexit.unregister(self.close)
+        self._wake.set()
+        self._thread.join()
+        self._fh.close()
+        if self._error is not None:
+            raise RuntimeError("journal writer failed") from self._error
+
+    # ---- writer 스레드 -------------------------------------------------------
+    def _wait_for_room(self) -> None:
+        self._wake.set()
+        with self._done:
+            while len(self._queue) >= self.max_queue and self._error is None:
+                self._done.wait()
+
+    def _run(self) -> None:
+        queue, fh = self._queue, self._fh
+        try:
+            while True:
+                self._wake.wait(self.interval)
+                self._wake.clear()
+                closing = self._closing  # 먼저 읽어야 그 뒤에 들어온 것까지 비운다
+                n = len(queue)
+                if n:
+                    popleft = queue.popleft
+                    fh.write(b"".join([popleft() for _ in range(n)]))
+                    fh.flush()
+                    if self.fsync != "never":
+                        os.fsync(fh.fileno())
+                with self._done:
+                    self._written += n
+                    self._done.notify_all()
+                if closing and not queue:
+                    return
+        except BaseException as exc:  # noqa: BLE001
+            # 어떤 이유로 끝나든 기록해 둬야 flush()/put() 이 영원히 기다리지 않는다.
+            # 호출 쪽에서 다시 올린다
+            with self._done:
+                self._error = exc
+                self._done.notify_all()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import os
+from collections import Counter
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from core.dice import RngStream, compile_formula
+from core.initiative import InitiativeTracker
+
+__all__ = ["Combatant", "SimResult", "simulate"]
+
+# 작업 단위. 워커 수와 무관하게 고정해야 같은 seed 에서 같은 결과가 나온다
+_CHUNK_FIGHTS = 250
+
+
+@dataclass(frozen=True, slots=True)
+class Combatant:
+    """
+    전투 참가자 스펙.
+    - side: 진영 이름 (같은 진영끼리는 공격하지 않음)
+    - attack: 명중 보정 (1d20 + attack >= ac 이면 명중, 20 은 치명타, 1 은 실패)
+    - damage: 피해 공식 (치명타면 주사위를 두 번 굴림)
+    - init: 이니시 보정 (1d20 + init)
+    """
+
+    name: str
+    side: str
+    hp: int
+    ac: int
+    attack: int
+    damage: str
+    init: int = 0
+
+
+@dataclass(slots=True)
+class SimResult:
+    """
+    몬테카를로 전투 집계.
+    - wins: 진영별 승리 수 (max_rounds 안에 끝나지 않으면 draws)
+    - rounds: 전투 종료 라운드 히스토그램
+    - damage: 진영별 "한 전투에서 가한 총 피해" 히스토그램
+    """
+
+    fights: int = 0
+    draws: int = 0
+    wins: Counter[str] = field(default_factory=Counter)
+    rounds: Counter[int] = field(default_factory=Counter)
+    damage: dict[str, Counter[int]] = field(default_factory=dict)
+
+    def win_rate(self, side: str) -> float:
+        return self.wins[side] / self.fights if self.fights else 0.0
+
+    @property
+    def mean_rounds(self) -> float:
+        total = sum(self.rounds.values())
+        return sum(r * c for r, c in self.rounds.items()) / total if total else 0.0
+
+    def mean_damage(self, side: str) -> float:
+        hist = self.damage.get(side)
+        if not hist:
+            return 0.0
+        return sum(d * c for d, c in hist.items()) / sum(hist.values())
+
+    def merge(self, other: SimResult) -> None:
+        self.fights += other.fights
+        self.draws += other.draws
+        self.wins.update(other.wins)
+        self.rounds.update(other.rounds)
+        for side, hist in other.damage.items():
+            self.damage.setdefault(side, Counter()).update(hist)
+
+    def summary(self) -> dict[str, Any]:
+        sides = sorted(self.damage)
+        return {
+            "fights": self.fights,
+            "draws": self.draws,
+            "win_rate": {s: round(self.win_rate(s), 4) for s in sides},
+            "mean_rounds": round(self.mean_rounds, 2),
+            "mean_damage": {s: round(self.mean_damage(s), 2) for s in sides},
+        }
+
+
+def simulate(
+    combatants: Sequence[Combatant],
+    fights: int = 1000,
+    *,
+    workers: int | None = None,
+    seed: int | str | None = None,
+    max_rounds: int = 50,
+) -> SimResult:
+    """
+    combatants 로 fights 번 전투를 돌려 집계한다.
+    - 작업은 _CHUNK_FIGHTS 단위로 나눠 ProcessPoolExecutor 에 뿌린다 (workers=1 이면 인라인)
+    - 작업마다 seed 에서 파생된 독립 RNG 스트림을 쓰므로,
+      seed 가 같으면 워커 수와 무관하게 결과가 같다
+    """
+    sides = {c.side for c in combatants}
+    if len(sides) < 2:
+        raise ValueError("simulation needs at least two sides")
+    if fights < 0:
+        raise ValueError(f"fights must be >= 0, got {fights}")
+    base_seed: int | str | bytes = seed if seed is not None else os.urandom(16)
+    jobs = [
+        (tuple(combatants), min(_CHUNK_FIGHTS, fights - start), base_seed, i, max_rounds)
+        for i, start in enumerate(range(0, fights, _CHUNK_FIGHTS))
+    ]
+
+    result = SimResult(damage={side: Counter() for side in sides})
+    if not jobs:
+        return result  # fights == 0: 풀을 띄울 일이 없다
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        for job in jobs:
+            result.merge(_run_chunk(job))
+        return result
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        for part in pool.map(_run_chunk, jobs):
+            result.merge(part)
+    return result
+
+
+# ---- worker ------------------------------------------------------------------
+def _run_chunk(job: tuple[tuple[Combatant, ...], int, int | str | bytes, int, int]) -> SimResult:
+    combatants, fights, seed, index, max_rounds = job
+    rng = RngStream(seed, f"sim-{index}")
+    result = SimResult()
+    for side in {c.side for c in combatants}:
+        result.damage[side] = Counter()
+    for _ in range(fights):
+        _fight(combatants, rng, max_rounds, result)
+    return result
+
+
+def _fight(
+    combatants: tuple[Combatant, ...], rng: RngStream, max_rounds: int, result: SimResult
+) -> None:
+    by_name = {c.name: c for c in combatants}
+    hp = {c.name: c.hp for c in combatants}
+    alive: Counter[str] = Counter(c.side for c in combatants)
+    dealt: Counter[str] = Counter({side: 0 for side in alive})
+
+    # 이니시는 참가자 전원을 한 번에 굴린다
+    tracker = InitiativeTracker()
+    tracker.roll_all(((c.name, c.init) for c in combatants), rng=rng)
+
+    winner: str | None = None
+    actor = tracker.current()
+    while tracker.round <= max_rounds:
+        me = by_name[actor.name]
+        if hp[me.name] > 0:
+            target = next((c for c in combatants if c.side != me.side and hp[c.name] > 0), None)
+            if target is not None:
+                d20 = rng.faces(20, 1)[0]
+                if d20 == 20 or (d20 != 1 and d20 + me.attack >= target.ac):
+                    dmg = _damage(me.damage, rng, crit=d20 == 20)
+                    dealt[me.side] += min(dmg, hp[target.name])
+                    hp[target.name] -= dmg
+                    if hp[target.name] <= 0:
+                        alive[target.side] -= 1
+                        if sum(1 for n in alive.values() if n > 0) == 1:
+                            winner = me.side
+                            break
+        actor = tracker.next_turn()
+
+    if winner is None:
+        result.draws += 1
+    else:
+        result.wins[winner] += 1
+    result.fights += 1
+    result.rounds[tracker.round] += 1
+    for side, total in dealt.items():
+        result.damage[side][total] += 1
+
+
+def _damage(formula: str, rng: RngStream, *, crit: bool) -> int:
+    plan = compile_formula(formula)
+    if plan.evaluate is None:
+        n = plan.n * 2 if crit else plan.n
+        return max(0, sum(rng.faces(plan.sides, n)) + plan.modifier)
+    total, _ = plan.evaluate(rng.faces)
+    if crit:
+        extra, _ = plan.evaluate(rng.faces)
+        total += extra - plan.modifier
+    return max(0, total)
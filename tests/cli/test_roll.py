@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from cli.main import cli
+from core.dice import replay
+from core.log import LogManager
+
+
+def test_roll_is_logged_as_dice_event(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TRPG_HOME", str(tmp_path))
+    runner = CliRunner()
+    for _ in range(2):
+        r = runner.invoke(cli, ["roll", "1d20+5", "--as", "Rogue", "--session", "S1"])
+        assert r.exit_code == 0, r.output
+
+    lm = LogManager(session_id="S1")
+    lines = lm.journal_path.read_bytes().splitlines()
+    events = [json.loads(line)["payload"] for line in lines]
+    assert [e["event"] for e in events] == ["dice", "dice"]
+    data = events[1]["data"]
+    assert data["actor"] == "Rogue" and data["formula"] == "1d20+5"
+    # 기록한 스트림 위치로 같은 굴림을 재현할 수 있다
+    again = replay(data["formula"], data["stream_id"], data["offset"])
+    assert again.total == data["total"] and list(again.rolls) == data["rolls"]
+    assert "🎲 **Rogue** rolled `1d20+5`" in lm.export("md")
+    lm.close()
@@ -5,6 +5,18 @@ from pathlib import Path
 
 import pytest
 
+import core.dice.batch as dice_batch
+from core.dice import (
+    RngStream,
+    RollResult,
+    compile_formula,
+    distribution,
+    drop_stream,
+    replay,
+    roll,
+    roll_many,
+    stream_for,
+)
 from core.log import LogManager, append_markdown
 
 
@@ -57,3 +69,170 @@ def test_append_markdown(tmp_path: Path) -> None:
     assert p.exists()
     text = p.read_text(encoding="utf-8").splitlines()
     assert text == ["# title", "line"]
+
+
+def test_compile_formula_is_cached_and_immutable() -> None:
+    plan = compile_formula("2d6+3")
+    assert (plan.n, plan.sides, plan.modifier) == (2, 6, 3)
+    assert plan.crit is None and plan.fumble is None
+    assert compile_formula("2d6+3") is plan
+    with pytest.raises(AttributeError):
+        plan.n = 3  # type: ignore[misc]
+
+    d20 = compile_formula("1d20 - 2")
+    assert (d20.modifier, d20.crit, d20.fumble) == (-2, 20, 1)
+
+
+def test_roll_uses_compiled_plan() -> None:
+    r = roll("3d4-1")
+    assert len(r.rolls) == 3
+    assert all(1 <= d <= 4 for d in r.rolls)
+    assert r.total == sum(r.rolls) - 1
+    with pytest.raises(ValueError):
+        compile_formula("d20")
+
+
+@pytest.mark.parametrize("numpy_backend", [True, False])
+def test_roll_many_matches_roll_semantics(
+    numpy_backend: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if not numpy_backend:
+        monkeypatch.setattr(dice_batch, "_np", None)
+    elif dice_batch._np is None:
+        pytest.skip("numpy not installed")
+
+    batch = roll_many("3d6+2", 200, seed=7)
+    assert len(batch) == 200 and len(batch.dice) == 600
+    for i in range(200):
+        detail = batch.detail(i)
+        assert all(1 <= d <= 6 for d in detail)
+        assert batch.totals[i] == sum(detail) + 2
+        assert not batch.is_crit(i) and not batch.is_fumble(i)
+
+    d20 = roll_many("1d20", 500, seed=7)
+    for i in range(500):
+        face = d20.detail(i)[0]
+        assert d20.is_crit(i) == (face == 20)
+        assert d20.is_fumble(i) == (face == 1)
+
+    again = roll_many("1d20", 500, seed=7)
+    assert list(again.totals) == list(d20.totals)
+
+
+def test_distribution_exact_small_pool() -> None:
+    d = distribution("3d6+4")
+    assert (d.low, d.high) == (7, 22)
+    assert sum(d.counts) == d.outcomes == 6**3
+    assert d.probability(7) == pytest.approx(1 / 216)
+    assert d.prob_at_least(15) == pytest.approx(0.5)
+    assert d.prob_at_least(0) == 1.0 and d.prob_at_least(23) == 0.0
+    assert d.mean == pytest.approx(14.5)
+    assert d.variance == pytest.approx(8.75)
+    assert d.percentile(0.5) == 14
+    assert distribution("3d6+4") is d
+
+
+def test_distribution_large_pool_matches_moments() -> None:
+    d = distribution("100d6")
+    assert sum(d.counts) == d.outcomes
+    mean = sum((d.low + k) * c for k, c in enumerate(d.counts)) / d.outcomes
+    assert mean == pytest.approx(d.mean) == pytest.approx(350)
+    assert d.percentile(0.5) == 350
+
+
+def test_roll_result_is_slotted_mapping() -> None:
+    r = roll("2d6+3")
+    assert not hasattr(r, "__dict__")
+    assert isinstance(r.rolls, tuple)
+    assert r["total"] == r.total and r["detail"] is r.rolls
+    assert dict(r).keys() == {"formula", "total", "detail", "rolls", "crit", "fumble"}
+    with pytest.raises(KeyError):
+        r["missing"]
+    with pytest.raises(AttributeError):
+        r.total = 0  # type: ignore[misc]
+
+    # dict 가 아니므로 직렬화/수정은 to_dict() 로 (예전 dict 결과와 같은 모양)
+    plain = r.to_dict()
+    assert json.loads(json.dumps(plain)) == plain and plain["rolls"] == list(r.rolls)
+    plain["rolls"].append(99)  # 돌려준 dict 는 매번 새 사본
+    assert r.to_dict()["rolls"] == list(r.rolls)
+
+    legacy = RollResult(formula="1d4", total=3, detail=[3])
+    assert legacy.rolls == (3,) and legacy["crit"] is False
+
+
+def test_rng_stream_is_deterministic_and_seekable() -> None:
+    a = RngStream(42, "S1")
+    first = [roll("2d6", rng=a).rolls for _ in range(3)]
+    batch = roll_many("1d20", 2000, rng=a)
+    assert a.offset == 6 + 2000
+
+    b = RngStream.from_id(a.stream_id)
+    assert [roll("2d6", rng=b).rolls for _ in range(3)] == first
+    assert list(roll_many("1d20", 2000, rng=b).totals) == list(batch.totals)
+
+    c = RngStream.from_id(a.stream_id, offset=6 + 1500)
+    assert c.faces(20, 3) == [batch.detail(i)[0] for i in range(1500, 1503)]
+    assert RngStream(42, "S2").faces(6, 8) != RngStream(42, "S1").faces(6, 8)
+
+
+def test_stream_for_reuses_session_stream() -> None:
+    s = stream_for("test-session", seed=1)
+    assert stream_for("test-session") is s
+    drop_stream("test-session")
+    assert stream_for("test-session", seed=1) is not s
+    drop_stream("test-session")
+
+
+def test_replay_rederives_roll_from_stream_offset() -> None:
+    stream = RngStream(7, "S1")
+    logged = []
+    for formula in ("20d6", "1d20+3", "2d8"):
+        offset = stream.offset
+        logged.append((formula, offset, roll(formula, rng=stream)))
+
+    for formula, offset, original in logged:
+        again = replay(formula, stream.stream_id, offset)
+        assert again.rolls == original.rolls and again.total == original.total
+
+
+def test_extended_grammar_terms_and_modifiers() -> None:
+    plan = compile_formula("2d6+1d4-1d3+3")
+    assert not plan.simple and plan.modifier == 3
+    assert [(t.n, t.sides, t.sign) for t in plan.terms] == [(2, 6, 1), (1, 4, 1), (1, 3, -1)]
+
+    stream = RngStream(3, "grammar")
+    for _ in range(200):
+        r = roll("4d6kh3", rng=stream)
+        assert len(r.rolls) == 3 and r.total == sum(r.rolls)
+        r = roll("4d6dl1+2", rng=stream)
+        assert len(r.rolls) == 3 and r.total == sum(r.rolls) + 2
+        r = roll("2d6r2", rng=stream)
+        assert len(r.rolls) == 2
+        r = roll("1d6!", rng=stream)
+        assert all(d == 6 for d in r.rolls[:-1]) and r.rolls[-1] != 6
+
+    adv = compile_formula("2d20kh1+5")
+    assert (adv.crit, adv.fumble) == (20, 1)
+    assert compile_formula("1d20+1d4").crit == 20
+    assert compile_formula("2d20").crit is None
+
+    for bad in ("2d6 3", "2d6k", "1d1!", "2d6r6", "5"):
+        with pytest.raises(ValueError):
+            compile_formula(bad)
+    with pytest.raises(ValueError):
+        roll_many("4d6kh3", 10)
+
+
+def test_distribution_of_extended_formulas() -> None:
+    d = distribution("4d6kh3")
+    assert (d.low, d.high) == (3, 18)
+    assert d.mean == pytest.approx(15869 / 1296)
+
+    diff = distribution("1d6-1d4")
+    assert (diff.low, diff.high) == (-3, 5)
+    assert diff.mean == pytest.approx(1.0)
+
+    assert distribution("2d6r2").mean == pytest.approx(2 * (4 / 6 * 4.5 + 2 / 6 * 3.5))
+    with pytest.raises(ValueError):
+        distribution("3d6!")
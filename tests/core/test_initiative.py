@@ -1,4 +1,11 @@
-from core.initiative import InitiativeTracker
+import copy
+import pickle
+from dataclasses import asdict
+
+import pytest
+
+from core.dice import RngStream
+from core.initiative import Actor, InitiativeTracker, TrackerHistory
 
 
 def test_round_progress_and_stable_ties() -> None:
@@ -52,3 +59,262 @@ def test_reentry_ordering_policy() -> None:
     t.return_from_delay("A")  # 정책상 재배치
     names = [s.name for s in t.order]
     assert "A" in names
+
+
+def test_delay_current_hands_turn_to_successor() -> None:
+    t = InitiativeTracker()
+    for name, init in (("A", 20), ("B", 15), ("C", 10), ("D", 5)):
+        t.add(name, init)
+    t.start_encounter()
+    t.next_turn()  # B
+    t.delay("B")
+    assert t.current().name == "C"
+    assert [a.name for a in t.order] == ["A", "C", "D", "B"]
+    assert t.order[-1].delayed
+    t.return_from_delay("B")
+    assert not t.order[-1].delayed
+
+
+def test_delay_current_last_actor_advances_to_next_round() -> None:
+    t = InitiativeTracker()
+    for name, init in (("A", 20), ("B", 15), ("C", 10)):
+        t.add(name, init)
+    t.start_encounter()
+    t.next_turn()
+    t.next_turn()  # C (순서상 마지막)
+    t.delay("C")
+    assert t.current().name == "A" and t.round == 2
+    assert [a.name for a in t.order] == ["A", "B", "C"] and t.order[-1].delayed
+
+
+def test_reinsert_policy_and_legacy_wrapper() -> None:
+    from core.initiative import init as legacy
+
+    with pytest.raises(ValueError):
+        InitiativeTracker(delay_policy="front")  # type: ignore[arg-type]
+
+    for t in (InitiativeTracker(delay_policy="reinsert"), legacy.InitiativeTracker()):
+        for name, init in (("A", 20), ("B", 15), ("C", 10), ("D", 5)):
+            t.add(name, init)
+        t.start_encounter()
+        a = t.current()
+        t.delay("A")  # 표시만, 자리는 그대로
+        assert [x.name for x in t.order] == ["A", "B", "C", "D"] and a.delayed
+        t.next_turn()
+        t.next_turn()  # C
+        t.return_from_delay("A")  # 현재 차례 바로 뒤로
+        assert [x.name for x in t.order] == ["B", "C", "A", "D"]
+        assert t.order[2] is a and not a.delayed  # Actor 를 새로 만들지 않는다
+
+    # 예전 init.py 동작: 시작 전 진행/없는 이름은 무시, next_turn() 은 None, round 대입 가능
+    w = legacy.InitiativeTracker()
+    w.add("X", 1)
+    assert w.next_turn() is None
+    w.delay("nobody")
+    w.return_from_delay("nobody")
+    w.start_encounter()
+    w.round = 7
+    w.next()
+    assert (w.round, w.current().name) == (8, "X")
+
+
+def test_remove_and_index_lookup() -> None:
+    t = InitiativeTracker()
+    t.add("A", 20)
+    t.add("B", 15)
+    t.add("C", 10)
+    t.start_encounter()
+    with pytest.raises(ValueError):
+        t.add("A", 1)
+    with pytest.raises(ValueError):
+        t.delay("nobody")
+
+    t.next_turn()
+    t.next_turn()  # C (마지막)
+    t.remove("C")  # 현재 차례가 빠지면 다음 라운드 첫 액터로
+    assert (t.round, t.current().name) == (2, "A")
+    assert "C" not in t and len(t) == 2
+    t.remove("B")
+    t.remove("A")
+    with pytest.raises(RuntimeError):
+        t.current()
+
+
+def test_group_takes_one_slot_and_splits_on_delay() -> None:
+    t = InitiativeTracker()
+    t.add("Hero", 15)
+    g = t.add_group("Goblin", 12, 200, hp=7)
+    t.add("Ogre", 8)
+    t.start_encounter()
+
+    assert [a.name for a in t.order] == ["Hero", "Goblin", "Ogre"]
+    assert g.count == 200 and g.member_hp[199] == 7
+    assert "Goblin 150" in t and "Goblin 201" not in t
+
+    t.next_turn()
+    assert t.current() is g
+    t.delay("Goblin 3")  # 멤버만 떼어 보류, 묶음은 여전히 현재 차례
+    assert t.current() is g and g.count == 199
+    assert [a.name for a in t.order] == ["Hero", "Goblin", "Ogre", "Goblin 3"]
+    split = t.order[-1]
+    assert split.delayed and split.hp == 7 and split.init == 12
+    t.return_from_delay("Goblin 3")
+    assert not split.delayed
+
+    t.remove("Goblin 4")
+    assert g.count == 198 and "Goblin 4" not in t
+    with pytest.raises(ValueError):
+        t.delay("Goblin 4")
+
+
+def test_group_emptied_by_split_leaves_order() -> None:
+    t = InitiativeTracker()
+    t.add_group("Rat", 10, 1, hp=[3])
+    t.add("Cat", 5)
+    t.start_encounter()
+    t.delay("Rat 1")
+    assert [a.name for a in t.order] == ["Cat", "Rat 1"]
+    assert t.current().name == "Cat"
+    with pytest.raises(ValueError):
+        t.add_group("Bat", 1, 2, hp=[1])
+
+
+def test_order_snapshot_is_cached_until_mutation() -> None:
+    t = InitiativeTracker()
+    t.add("A", 20)
+    t.add("B", 10)
+    t.start_encounter()
+
+    snap, version = t.order, t.version
+    assert isinstance(snap, tuple)
+    t.next_turn()  # 턴 진행은 순서를 바꾸지 않는다
+    assert t.order is snap and t.version == version
+
+    t.delay("B")
+    assert t.version > version and t.order is not snap
+    version = t.version
+    t.return_from_delay("B")
+    assert t.version > version
+
+
+def _state(t: InitiativeTracker) -> tuple[object, ...]:
+    return (t.round, t.current().name, [(a.name, a.delayed) for a in t.order])
+
+
+def test_history_undo_redo_round_trip() -> None:
+    h = TrackerHistory(snapshot_every=4)
+    for name, init in (("Rogue", 18), ("Mage", 14), ("Orc", 10)):
+        h.add(name, init)
+    h.start_encounter()
+    states = [_state(h.tracker)]
+    for step in (
+        lambda: h.next_turn(),
+        lambda: h.delay("Mage"),
+        lambda: h.next_turn(),
+        lambda: h.return_from_delay("Mage"),
+        lambda: h.remove("Rogue"),
+        lambda: h.next_turn(),
+    ):
+        step()
+        states.append(_state(h.tracker))
+
+    for expected in reversed(states[:-1]):
+        assert h.undo()
+        assert _state(h.tracker) == expected
+    for expected in states[1:]:
+        assert h.redo()
+        assert _state(h.tracker) == expected
+    assert not h.redo()
+
+    h.undo()
+    h.next_turn()  # 새 연산은 redo 꼬리를 버린다
+    assert not h.can_redo
+
+
+def test_history_serializes_compactly_and_rebuilds() -> None:
+    h = TrackerHistory(snapshot_every=8)
+    for i in range(5):
+        h.add(f"A{i}", i)
+    h.start_encounter()
+    h.delay("A2")
+    for _ in range(30):
+        h.next_turn()
+
+    text = h.dumps()
+    assert '["n",30]' in text  # 연속 next 는 하나로 묶임
+    loaded = TrackerHistory.loads(text, snapshot_every=8)
+    assert _state(loaded.tracker) == _state(h.tracker)
+    assert loaded.position == h.position
+    assert loaded.dumps() == text
+    while loaded.undo():
+        pass
+    assert loaded.position == 32  # 마지막 스냅샷 이전으로는 되돌릴 수 없다
+
+
+def test_roll_all_batches_and_sorts() -> None:
+    specs = [(f"Goblin {i}", 2) for i in range(1, 501)] + [("Rogue", 5)]
+    t = InitiativeTracker()
+    rolled = t.roll_all(specs, rng=RngStream(7, "init"))
+
+    assert len(t) == 501 and t.round == 1
+    assert all(3 <= rolled[f"Goblin {i}"] <= 22 for i in range(1, 501))
+    keys = [(-a.init, a.name) for a in t.order]
+    assert keys == sorted(keys)
+    assert t.current() is t.order[0]
+
+    again = InitiativeTracker()
+    assert again.roll_all(specs, rng=RngStream(7, "init")) == rolled
+    with pytest.raises(ValueError):
+        t.roll_all([("Rogue", 1)])
+
+
+def test_actor_copies_carry_fields_not_links() -> None:
+    t = InitiativeTracker()
+    for i in range(5000):
+        t.add(f"A{i}", i % 30)
+    t.start_encounter()
+    actor = t.current()
+
+    expected = {"name": actor.name, "init": actor.init, "delayed": False, "hp": None}
+    assert asdict(actor) == expected
+    assert asdict(Actor("Fresh", 3)) == {"name": "Fresh", "init": 3, "delayed": False, "hp": None}
+    for clone in (pickle.loads(pickle.dumps(actor)), copy.deepcopy(actor), copy.copy(actor)):
+        assert clone == actor and clone is not actor
+        assert not hasattr(clone, "_next")  # 인카운터를 끌고 오지 않는다
+    assert t.current() is actor and len(t) == 5000
+
+    group = t.add_group("Goblin", 12, 3, hp=7)
+    clone = copy.deepcopy(group)
+    assert clone == group and clone.member_hp is not group.member_hp
+
+
+def test_removing_the_only_current_actor_keeps_the_round() -> None:
+    t = InitiativeTracker()
+    t.add("Solo", 10)
+    t.start_encounter()
+    t.remove("Solo")
+    assert t.round == 1 and len(t) == 0 and t.order == ()
+    with pytest.raises(RuntimeError):
+        t.current()
+
+
+def test_state_round_trip_keeps_delay_policy() -> None:
+    t = InitiativeTracker(delay_policy="reinsert")
+    for name, init in (("A", 20), ("B", 15), ("C", 10)):
+        t.add(name, init)
+    t.start_encounter()
+    t.next_turn()
+    t.delay("A")
+
+    state = t.to_state()
+    assert state == ([("A", 20, True), ("B", 15, False), ("C", 10, False)], "B", 1, "reinsert")
+    loaded = InitiativeTracker.from_state(*state)
+    assert loaded.delay_policy == "reinsert" and loaded.to_state() == state
+    for tracker in (t, loaded):
+        tracker.delay("B")  # reinsert: 표시만, 자리는 그대로
+        assert [a.name for a in tracker.order] == ["A", "B", "C"]
+        assert tracker.current().name == "B"
+
+    t.add_group("Goblin", 12, 2)
+    with pytest.raises(TypeError):
+        t.to_state()
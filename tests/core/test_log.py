@@ -1,9 +1,12 @@
 import json
+import os
+import tracemalloc
 from pathlib import Path
 
 import pytest
 
 from core.log import LogManager, append_markdown
+from core.log.reader import JournalReader, index_path
 
 
 def test_append_and_export_md_json(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -38,3 +41,226 @@ def test_append_markdown(tmp_path: Path) -> None:
     assert p.exists()
     text = p.read_text(encoding="utf-8").splitlines()
     assert text == ["# title", "line"]
+
+
+def test_journal_keeps_bounded_tail_and_exports_everything(tmp_path: Path) -> None:
+    lm = LogManager(base=tmp_path, session_id="J", tail=4, batch_size=3)
+    for i in range(10):
+        lm.append_narrative(f"line {i}")
+
+    assert len(lm) == 10
+    assert [e.payload["text"] for e in lm.tail] == ["line 6", "line 7", "line 8", "line 9"]
+    # batch_size=3 이므로 마지막 한 줄만 버퍼에 남아 있다
+    assert len(lm.journal_path.read_bytes().splitlines()) == 9
+
+    md = lm.export("md")
+    assert md.splitlines()[1:] == ["", "## Narrative"] + [f"- line {i}" for i in range(10)]
+    entries = json.loads(lm.export("json"))["entries"]
+    assert [e["payload"]["text"] for e in entries] == [f"line {i}" for i in range(10)]
+    lm.close()
+    assert len(lm.journal_path.read_bytes().splitlines()) == 10
+
+
+def test_journal_reopen_resumes_and_drops_torn_line(tmp_path: Path) -> None:
+    with LogManager(base=tmp_path, session_id="R", fsync="always") as lm:
+        lm.append_system("dice", {"actor": "Rogue", "formula": "1d20", "total": 11})
+        lm.append_narrative("before crash")
+        assert len(lm.journal_path.read_bytes().splitlines()) == 2  # 엔트리마다 fsync
+    with lm.journal_path.open("ab") as f:
+        f.write(b'{"kind":"narrative","payl')  # 쓰다 만 줄
+
+    lm = LogManager(base=tmp_path, session_id="R", tail=1)
+    assert len(lm) == 2 and lm.tail[0].payload["text"] == "before crash"
+    lm.append_narrative("after restart")
+    lm.close()
+    lines = lm.journal_path.read_bytes().splitlines()
+    assert [json.loads(line)["kind"] for line in lines] == ["system", "narrative", "narrative"]
+
+    with pytest.raises(ValueError):
+        LogManager(base=tmp_path, fsync="sometimes")  # type: ignore[arg-type]
+
+
+def test_reader_indexes_by_number_and_time(tmp_path: Path) -> None:
+    with LogManager(base=tmp_path, session_id="I") as lm:
+        for i in range(1000):
+            lm.append_system("dice", {"i": i})
+    assert index_path(lm.journal_path).exists()  # close() 가 인덱스를 저장한다
+
+    with JournalReader(lm.journal_path, checkpoint_every=64) as r:
+        assert len(r) == 1000 and r[0]["payload"]["data"] == {"i": 0}
+        assert r[-1]["payload"]["data"] == {"i": 999}
+        stamps = [r.timestamp(i) for i in range(len(r))]
+        since, until = stamps[300], stamps[700]
+        expected = [i for i, ts in enumerate(stamps) if since <= ts < until]
+        span = r.span(since, until)
+        assert list(span) == expected
+        assert [d["payload"]["data"]["i"] for d in r.between(since, until)] == expected
+        assert r.span(until=stamps[0]) == range(0)
+        with pytest.raises(IndexError):
+            r.raw(1000)
+
+    lm = LogManager(base=tmp_path, session_id="I", tail=4)  # 인덱스로 재개
+    assert len(lm) == 1000 and lm.tail[-1].payload["data"] == {"i": 999}
+    lm.append_narrative("more")
+    with lm.reader() as r:
+        assert len(r) == 1001 and r[1000]["payload"]["text"] == "more"
+        assert r.refresh() == 0
+    lm.close()
+
+    # 저널이 인덱스보다 짧아지면(다른 파일로 바뀜) 인덱스를 버리고 다시 만든다
+    lm.journal_path.write_bytes(lm.journal_path.read_bytes().splitlines(keepends=True)[0])
+    assert len(LogManager(base=tmp_path, session_id="I")) == 1
+
+
+def test_incremental_export_appends_only_new_entries(tmp_path: Path) -> None:
+    lm = LogManager(base=tmp_path, session_id="I", tail=2)
+    lm.append_narrative("a")
+    lm.append_narrative("b")
+    lm.append_narrative("c")
+
+    assert lm.export("md", incremental=True) == "- a\n- b\n- c\n"
+    assert lm.export("md", incremental=True) == ""  # 새 엔트리 없음
+    lm.export("json", incremental=True)
+    lm.append_system("dice", {"actor": "Rogue", "formula": "1d20", "total": 9})
+    assert lm.export("md", incremental=True) == "- 🎲 **Rogue** rolled `1d20` → **9**\n"
+    lm.export("json", incremental=True)
+    lm.close()
+
+    md = tmp_path / "exports" / "I.md"
+    assert md.read_text(encoding="utf-8").splitlines()[:2] == ["# Session I", "- a"]
+    rolling = json.loads((tmp_path / "exports" / "I.json").read_text(encoding="utf-8"))
+    assert [e["kind"] for e in rolling["entries"]] == ["narrative"] * 3 + ["system"]
+    # 전체 재-export 도 그대로 가능하고 같은 내용
+    assert json.loads(lm.export("json")) == rolling
+
+    # high-water mark 는 재시작 후에도 유지된다
+    lm = LogManager(base=tmp_path, session_id="I")
+    lm.append_narrative("d")
+    assert lm.export("md", incremental=True) == "- d\n"
+    assert md.read_text(encoding="utf-8").count("- a") == 1
+
+
+def test_export_file_streams_with_flat_memory(tmp_path: Path) -> None:
+    def peak(n: int) -> int:
+        lm = LogManager(base=tmp_path, session_id=f"M{n}", fsync="never", tail=64)
+        for i in range(n):
+            lm.append_system("dice", {"actor": "Rogue", "formula": "1d20", "total": i % 20})
+        lm.flush()
+        tracemalloc.start()
+        try:
+            path = lm.export_file("json")
+            _, top = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert len(json.loads(path.read_text(encoding="utf-8"))["entries"]) == n
+        # TRPG_HOME 미러는 같은 내용 (가능하면 하드링크)
+        mirror = Path(os.environ["TRPG_HOME"]) / "exports" / path.name
+        assert mirror.read_bytes() == path.read_bytes()
+        return top
+
+    small, large = peak(500), peak(5_000)
+    assert large < small * 1.5  # 엔트리 10배에도 최대 메모리는 거의 그대로
+
+
+def test_md_export_groups_entries_into_sections(tmp_path: Path) -> None:
+    lm = LogManager(base=tmp_path, session_id="G", tail=3)  # 일부는 저널, 일부는 tail 에서
+    lm.append_narrative("scene opens")
+    lm.append_system("dice", {"actor": "Rogue", "formula": "1d20", "total": 11})
+    lm.append_system("init", {"order": ["Rogue"]})
+    lm.append_narrative("goblins attack")
+    lm.append_system("dice", {"actor": "Goblin", "formula": "1d6", "total": 4})
+
+    assert lm.export("md").split("\n") == [
+        "# Session G",
+        "",
+        "## Rolls",
+        "- 🎲 **Rogue** rolled `1d20` → **11**",
+        "- 🎲 **Goblin** rolled `1d6` → **4**",
+        "",
+        "## Narrative",
+        "- scene opens",
+        "- goblins attack",
+        "",
+        "## System",
+        "- system: init {'order': ['Rogue']}",
+    ]
+    lm.close()
+
+    only_rolls = LogManager(base=tmp_path, session_id="G2")
+    only_rolls.append_system("dice", {"actor": "Mage", "formula": "2d4", "total": 5})
+    assert "## Narrative" not in only_rolls.export("md")  # 빈 섹션은 생략
+    assert LogManager(base=tmp_path, session_id="G3").export("md") == "# Session G3"
+
+
+def test_export_many_writes_every_format_from_one_pass(tmp_path: Path) -> None:
+    lm = LogManager(base=tmp_path / "base", session_id="X", tail=8)
+    empty = lm.export_many(["json"])
+    assert json.loads(empty["json"].read_text(encoding="utf-8")) == {
+        "session_id": "X",
+        "entries": [],
+    }
+    for i in range(700):  # tail 밖(저널) + tail 안, 묶음 여러 개
+        lm.append_system("dice", {"actor": "Rogue", "formula": "1d20", "total": i % 20})
+        lm.append_narrative(f"line {i}")
+
+    paths = lm.export_many(["md", "json", "md"], display_title="Both")
+    assert list(paths) == ["md", "json"]
+    assert paths["md"].stem == paths["json"].stem  # 같은 타임스탬프
+    assert paths["md"].read_bytes() == lm.export_file("md", display_title="Both").read_bytes()
+    assert paths["json"].read_bytes() == lm.export_file("json").read_bytes()
+    mirror = Path(os.environ["TRPG_HOME"]) / "exports" / paths["json"].name
+    assert mirror.read_bytes() == paths["json"].read_bytes()
+    with pytest.raises(ValueError):
+        lm.export_many(["md", "pdf"])  # type: ignore[list-item]
+    lm.close()
+
+
+def test_tail_entries_stay_within_memory_budget(tmp_path: Path) -> None:
+    n = 20_000
+    lm = LogManager(base=tmp_path, session_id="T", fsync="never", tail=n)
+    lm.append_narrative("warm up")  # 파일 버퍼/이름 표 같은 고정 비용은 빼고 잰다
+    payload = {"event": "dice", "data": {"actor": "Rogue", "formula": "1d20+5", "total": 11}}
+    encoded = len(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for i in range(n):
+            lm.append_system("dice", {"actor": "Rogue", "formula": "1d20+5", "total": i % 20})
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    per_entry = (after - before) / n
+    # 인코딩된 payload + bytes 헤더/열 몇 칸. dict + datetime 으로 들고 있으면 수백 바이트
+    assert per_entry < encoded + 96, per_entry
+
+    tail = lm.tail
+    assert len(tail) == n and tail[-1].payload["data"]["total"] == 19
+    assert tail[-1].kind == "system" and tail[0].ts <= tail[-1].ts
+    lm.close()
+
+
+def test_background_writer_loses_nothing_under_backpressure(tmp_path: Path) -> None:
+    lm = LogManager(
+        base=tmp_path,
+        session_id="B",
+        background=True,
+        batch_size=8,
+        queue_size=16,  # 작게 잡아 put() 이 writer 를 기다리게 한다
+        flush_interval=0.01,
+        tail=32,
+    )
+    for i in range(500):
+        lm.append_narrative(f"line {i}")
+    # export 는 writer 를 flush 한 뒤 저널을 읽는다
+    assert json.loads(lm.export("json"))["entries"][0]["payload"]["text"] == "line 0"
+    for i in range(500, 1000):
+        lm.append_narrative(f"line {i}")
+    lm.close()
+
+    lines = lm.journal_path.read_bytes().splitlines()
+    assert [json.loads(line)["payload"]["text"] for line in lines] == [
+        f"line {i}" for i in range(1000)
+    ]
+    lm.append_narrative("after close")  # 다시 append 하면 writer 를 새로 띄운다
+    lm.close()
+    assert len(LogManager(base=tmp_path, session_id="B")) == 1001
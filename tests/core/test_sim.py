@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import pytest
+
+from core.sim import Combatant, simulate
+
+PARTY = [
+    Combatant("Fighter", "party", hp=30, ac=17, attack=6, damage="1d8+4", init=1),
+    Combatant("Rogue", "party", hp=22, ac=15, attack=7, damage="1d6+4+2d6", init=4),
+]
+GOBLINS = [
+    Combatant(f"Goblin{i}", "goblins", hp=7, ac=15, attack=4, damage="1d6+2", init=2)
+    for i in range(4)
+]
+
+
+def test_simulate_aggregates_and_is_reproducible() -> None:
+    r = simulate(PARTY + GOBLINS, 600, workers=1, seed=11)
+    assert r.fights == 600
+    assert sum(r.wins.values()) + r.draws == 600
+    assert sum(r.rounds.values()) == 600
+    assert 0.0 < r.win_rate("party") <= 1.0
+    assert r.mean_damage("party") > 0
+
+    again = simulate(PARTY + GOBLINS, 600, workers=2, seed=11)
+    assert again.summary() == r.summary()
+    assert again.rounds == r.rounds
+
+
+def test_simulate_requires_two_sides() -> None:
+    with pytest.raises(ValueError):
+        simulate(PARTY, 10, workers=1)
+
+
+def test_simulate_zero_fights_and_rejects_negative() -> None:
+    r = simulate(PARTY + GOBLINS, 0, workers=4)
+    assert r.fights == 0 and r.summary()["win_rate"] == {"goblins": 0.0, "party": 0.0}
+    with pytest.raises(ValueError, match="fights must be >= 0"):
+        simulate(PARTY + GOBLINS, -1, workers=4)